@@ -1,14 +1,33 @@
 import os, json
+from utils.profiling import startup_profiler  # 이후 import되는 모듈의 시간을 측정하려면 가장 먼저 불러와야 함
+from typing import TYPE_CHECKING
 import discord
 from discord.ext import commands
 from dotenv import load_dotenv
-from notion_client import Client, AsyncClient
 
-from utils.notion import search_members_in_database, format_notion_member_info
+if TYPE_CHECKING:
+    from notion_client import AsyncClient  # 타입 표기용 (실제 import는 클라이언트 생성 시점)
+
+from utils.notion import create_notion_client, search_members_in_database, format_notion_member_info
+from utils.notion import retrieve_page
 from utils.notion import search_schedules_in_database, format_notion_schedule_info
-from utils.notion import extract_titles_from_pages, page_ids_to_titles, safe_extract, extract_properties_from_page_id, extract_relation_ids_from_response
+from utils.notion import MEMBER_LOOKUP_PROPERTIES, MEMBER_LIST_PROPERTIES, SCHEDULE_LIST_PROPERTIES
+from utils.notion import page_ids_to_titles, title_cache
+from utils.mirror import MemberMirror, ScheduleMirror
+from utils.records import Schedule
+from utils.relation_writer import relation_writer
+from utils.attendance import reconcile_absentees
+from utils.store import AttendanceStore, MirrorStore
+from utils.backend import create_backend
+from utils.scheduler import scheduler, current_priority, Priority
+from utils.metrics import metrics
+from utils.tracing import tracer
+from utils.reaction_queue import ReactionQueue, ADD as REACTION_ADD
+from utils.dm import dm_sender
 from pprint import pprint
-import json, asyncio
+import json, asyncio, time
+
+startup_profiler.mark("imports")
 
 # .env 파일에서 환경 변수 로드
 load_dotenv()
@@ -18,21 +37,163 @@ DISCORD_TOKEN = os.getenv("DISCORD_TOKEN")
 NOTION_API_KEY = os.getenv("NOTION_API_KEY")
 NOTION_MEMBER_DB_ID = os.getenv("NOTION_MEMBER_DB_ID")
 NOTION_SCHEDULE_DB_ID = os.getenv("NOTION_SCHEDULE_DB_ID")
+NOTION_MIRROR_REFRESH_SECONDS = float(os.getenv("NOTION_MIRROR_REFRESH_SECONDS", "15"))
+NOTION_MIRROR_RECONCILE_SECONDS = float(os.getenv("NOTION_MIRROR_RECONCILE_SECONDS", "3600"))
+MIRROR_DB_PATH = os.getenv("MIRROR_DB_PATH", "data/mirror.db")
+NOTION_POOL_SIZE = int(os.getenv("NOTION_POOL_SIZE", "10"))
+NOTION_KEEPALIVE_SECONDS = float(os.getenv("NOTION_KEEPALIVE_SECONDS", "60"))
+NOTION_RATE_LIMIT = float(os.getenv("NOTION_RATE_LIMIT", "3"))
+NOTION_RATE_BURST = float(os.getenv("NOTION_RATE_BURST", "3"))
+RELATION_FLUSH_SECONDS = float(os.getenv("RELATION_FLUSH_SECONDS", "1"))
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))  # 0이면 지표 HTTP 서버를 켜지 않음
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+REACTION_WORKERS = int(os.getenv("REACTION_WORKERS", "4"))
+REACTION_QUEUE_SIZE = int(os.getenv("REACTION_QUEUE_SIZE", "1000"))
+DM_DEBOUNCE_SECONDS = float(os.getenv("DM_DEBOUNCE_SECONDS", "3"))
+DM_RATE_LIMIT = float(os.getenv("DM_RATE_LIMIT", "2"))
+SHARD_COUNT = int(os.getenv("SHARD_COUNT", "0"))  # 0이면 샤딩하지 않음
+SHARD_IDS = [int(shard_id) for shard_id in os.getenv("SHARD_IDS", "").split(",") if shard_id.strip()]
+STATE_DB_PATH = os.getenv("STATE_DB_PATH", "")  # 비어 있으면 이 프로세스 안에서만 상태 공유
+SLOW_COMMAND_SECONDS = float(os.getenv("SLOW_COMMAND_SECONDS", "5"))
+SLOW_COMMAND_LOG_PATH = os.getenv("SLOW_COMMAND_LOG_PATH", "logs/slow_commands.log")
+
+# 모든 Notion 요청이 거쳐가는 스케줄러의 초당 요청 수 설정
+scheduler.configure(rate=NOTION_RATE_LIMIT, burst=NOTION_RATE_BURST)
+# 출석/등록 relation 변경을 모으는 시간
+relation_writer.window = RELATION_FLUSH_SECONDS
+# 같은 일정에 대한 DM 안내를 모으는 시간과 초당 DM 발송 수
+dm_sender.debounce = DM_DEBOUNCE_SECONDS
+dm_sender.bucket.rate = DM_RATE_LIMIT
+# 기준 시간보다 오래 걸린 명령어/이벤트의 구간 트리를 남길 로그 파일
+tracer.configure(threshold=SLOW_COMMAND_SECONDS, log_path=SLOW_COMMAND_LOG_PATH)
+
+ATTENDANCE_DB_PATH = os.getenv("ATTENDANCE_DB_PATH", "data/attendance.db")
+
+# 여러 프로세스(샤드, 복제본)가 함께 쓰는 상태 저장소 (lease, 공유 캐시)
+state_backend = create_backend(STATE_DB_PATH)
+if STATE_DB_PATH:
+    # 같은 relation을 여러 프로세스가 동시에 고치지 않도록 lease를 얻은 뒤 쓰기
+    relation_writer.backend = state_backend
+    # 페이지 제목은 다른 프로세스가 가져온 것도 재사용
+    title_cache.backend, title_cache.namespace = state_backend, "titles"
+REGISTRATION_TTL_DAYS = float(os.getenv("REGISTRATION_TTL_DAYS", "30"))
+ATTENDANCE_EXPIRE_SECONDS = float(os.getenv("ATTENDANCE_EXPIRE_SECONDS", "600"))
+ATTENDANCE_GRACE_SECONDS = 24 * 60 * 60
+
+# 출석/등록 공지 저장소 (SQLite + 메모리 캐시)
+attendance_message_store = AttendanceStore(ATTENDANCE_DB_PATH, shared=bool(STATE_DB_PATH))
+# 출석 공지 마감 타이머 (메시지 ID -> 태스크)
+attendance_timers = dict()
+# 미러 스냅샷 저장소 (재시작 후 변경분만 다시 가져옴)
+mirror_store = MirrorStore(MIRROR_DB_PATH)
+# 멤버 데이터베이스 미러 (Discord ID / 페이지 ID / 이름으로 조회)
+member_mirror = MemberMirror(NOTION_MEMBER_DB_ID, refresh_interval=NOTION_MIRROR_REFRESH_SECONDS,
+                             store=mirror_store, reconcile_interval=NOTION_MIRROR_RECONCILE_SECONDS)
+# 일정 데이터베이스 미러 (!일정 검색을 API 호출 없이 처리)
+schedule_mirror = ScheduleMirror(NOTION_SCHEDULE_DB_ID, refresh_interval=NOTION_MIRROR_REFRESH_SECONDS,
+                                 store=mirror_store, reconcile_interval=NOTION_MIRROR_RECONCILE_SECONDS)
+
+class NotionBot(commands.AutoShardedBot if SHARD_COUNT else commands.Bot):
+    """
+    봇 전체가 공유하는 Notion 클라이언트를 가진 봇.
+    클라이언트는 시작 시 한 번 생성되어 연결을 재사용하고, 종료 시 닫힙니다.
+    SHARD_COUNT가 설정되면 AutoShardedBot으로 실행되어, SHARD_IDS의 샤드만 이 프로세스에서 연결합니다.
+    """
+    notion: "AsyncClient"
+
+    async def setup_hook(self):
+        # 재시작 전의 공지 정보 불러오기, 이후 만료된 공지는 주기적으로 제거
+        attendance_message_store.load()
+        attendance_message_store.start(ATTENDANCE_EXPIRE_SECONDS)
+        # Notion API 클라이언트 초기화 (연결 풀 공유)
+        self.notion = create_notion_client(NOTION_API_KEY, pool_size=NOTION_POOL_SIZE, keepalive_expiry=NOTION_KEEPALIVE_SECONDS)
+        # Discord API 요청 시간 기록 (명령어가 Notion, dateparser, Discord 중 어디서 느린지 구분하기 위함)
+        self.http.request = self._timed_discord_request(self.http.request)
+        # Prometheus 형식 지표 서버 (선택)
+        self.metrics_runner = await metrics.start_server(METRICS_HOST, METRICS_PORT) if METRICS_PORT else None
+        startup_profiler.mark("setup_hook")
+
+    @staticmethod
+    def _timed_discord_request(request):
+        async def timed_request(route, **kwargs):
+            with metrics.timer("discord_request_duration_seconds", component="discord", method=route.method, route=route.path), \
+                    tracer.span(f"discord {route.method} {route.path}"):
+                return await request(route, **kwargs)
+        return timed_request
+
+    async def close(self):
+        # 큐에 남은 반응(출석/등록 표시)을 처리한 뒤 워커를 멈춤
+        try:
+            await asyncio.wait_for(reaction_queue.join(), 10)
+        except asyncio.TimeoutError:
+            pprint(f"Error in NotionBot.close: 반응 {reaction_queue.depth}개를 시간 안에 처리하지 못했습니다.")
+        reaction_queue.stop()
+        # 모으는 중인 relation 변경을 Notion 클라이언트를 닫기 전에 반영
+        if hasattr(self, 'notion'):
+            try:
+                await asyncio.wait_for(relation_writer.flush_all(self.notion), 10)
+            except asyncio.TimeoutError:
+                pprint("Error in NotionBot.close: relation 변경을 시간 안에 반영하지 못했습니다.")
+        # 모아 둔 DM 안내를 보낸 뒤 종료 (Discord 연결이 끊기기 전에)
+        try:
+            await asyncio.wait_for(dm_sender.flush(), 5)
+        except asyncio.TimeoutError:
+            pprint("Error in NotionBot.close: DM 발송이 시간 안에 끝나지 않았습니다.")
+        dm_sender.stop()
+        member_mirror.stop()
+        schedule_mirror.stop()
+        if getattr(self, 'metrics_runner', None) is not None:
+            await self.metrics_runner.cleanup()
+        await super().close()
+        if hasattr(self, 'notion'):
+            await self.notion.aclose()
+        attendance_message_store.close()
+        mirror_store.close()
+        state_backend.close()
 
-attendance_message_store = dict()
-# Notion API 클라이언트 초기화
-notion = Client(auth=NOTION_API_KEY)
 
 # Discord 봇 명령어 프리픽스 설정
 intents = discord.Intents.default()
 intents.members = True  # 서버 멤버 정보를 가져오려면 이 권한이 필요합니다
 intents.message_content = True
-bot = commands.Bot(command_prefix='!', intents=intents)
+# 샤딩하는 경우 프로세스마다 SHARD_IDS를 나누어 실행 (예: SHARD_COUNT=4, SHARD_IDS=0,1 / SHARD_IDS=2,3)
+shard_options = dict(shard_count=SHARD_COUNT, shard_ids=SHARD_IDS or None) if SHARD_COUNT else {}
+bot = NotionBot(command_prefix='!', intents=intents, **shard_options)
+
+# 명령어 처리 시간과 구성 요소별 시간 기록, 느린 명령어 추적
+@bot.before_invoke
+async def start_command_timer(ctx):
+    ctx.metrics_started = time.perf_counter()
+    ctx.metrics_breakdown = metrics.begin_breakdown()
+    ctx.trace_span = tracer.start(f"!{ctx.command.qualified_name}", user=ctx.author.id, message=ctx.message.content[:100])
+
+
+@bot.after_invoke
+async def record_command_timer(ctx):
+    command = ctx.command.qualified_name
+    tracer.finish(ctx.trace_span)
+    metrics.observe("bot_command_duration_seconds", time.perf_counter() - ctx.metrics_started, command=command)
+    metrics.inc("bot_commands_total", command=command, status="error" if ctx.command_failed else "ok")
+    for component, seconds in ctx.metrics_breakdown.items():
+        metrics.observe("bot_command_component_seconds", seconds, command=command, component=component)
+
 
 # 봇이 시작될 때 실행되는 이벤트
 @bot.event
+@metrics.timed("bot_event_duration_seconds", event="on_ready")
+@tracer.traced_root()
 async def on_ready():
     print(f'{bot.user} has connected to Discord!')
+    if startup_profiler.installed:
+        # 첫 on_ready에서만 시작 프로파일 출력
+        startup_profiler.mark("on_ready")
+        startup_profiler.uninstall()
+        print(startup_profiler.report())
+    # 멤버/일정 미러 로드 및 백그라운드 증분 갱신 시작
+    member_mirror.start(bot.notion)
+    schedule_mirror.start(bot.notion)
+    # 열려 있던 출석 공지의 마감 타이머 복구
+    await restore_attendance_windows()
 
 bot.remove_command('help')
 
@@ -87,22 +248,31 @@ async def help_command(ctx):
         pprint(f"Error in help_command: {str(e)}")
 
 
+async def full_page(notion_client, mirror, record):
+    """
+    목록 조회는 필요한 속성만 가져오므로, 자세히 보여줄 페이지는 미러 또는 Notion에서 전체 속성을 가져오는 함수.
+
+    :param notion_client: Notion 비동기 API 클라이언트
+    :param mirror: 페이지가 속한 데이터베이스의 미러
+    :param record: 목록 조회 결과의 레코드
+    :return: 전체 속성으로 만든 레코드
+    """
+    return mirror.get(record.id) or mirror.record_type.from_page(await retrieve_page(notion_client, record.id))
+
+
 # 사용자 자신의 정보를 요청할 때 실행되는 명령어
 @bot.command(name='내정보', help='Notion에서 자신의 정보를 가져옵니다.')
 async def myinfo(ctx):
     try:
         user_id = ctx.author.id  # Discord 사용자 ID
-        conditions = [{'discord_id': user_id}]
-        database_id = NOTION_MEMBER_DB_ID
 
         # 검색 결과 가져오기 (Notion에서 사용자 정보 검색)
         try:
-            notion_client = AsyncClient(auth=NOTION_API_KEY)
-            result = await search_members_in_database(notion_client, database_id, conditions)
+            notion_client = ctx.bot.notion
+            member_info = await member_mirror.lookup_discord_id(notion_client, user_id)
 
             # 검색된 결과 출력
-            if result and len(result) > 0:
-                member_info = result[0][0]
+            if member_info:
                 formatted_info = format_notion_member_info(member_info, prefix="-")  # 결과 포맷팅
                 
                 # Embed 메시지 생성
@@ -161,9 +331,11 @@ async def search_schedule(ctx, *, query: str = None):
         return
 
     try:
-        # Notion 클라이언트 생성
-        notion_client = AsyncClient(auth=NOTION_API_KEY)
-        result = await search_schedules_in_database(notion_client, database_id, conditions)
+        # 공유 Notion 클라이언트 사용
+        notion_client = ctx.bot.notion
+        # 선택지로 표시하는 25개까지만, 목록에 필요한 속성만 가져옴
+        result = await search_schedules_in_database(notion_client, database_id, conditions, mirror=schedule_mirror,
+                                                    limit=25, properties=SCHEDULE_LIST_PROPERTIES)
 
         # 검색 결과가 있는지 확인
         if not result or not result[0]:
@@ -173,14 +345,11 @@ async def search_schedule(ctx, *, query: str = None):
 
         # 검색 결과가 여러 개일 경우 처리
         if len(result[0]) > 1:
-            names = extract_titles_from_pages(result[0])
-            locations = [schedule.get("properties", {}).get("장소", {}).get("rich_text", [{}])[0].get("plain_text", "N/A")
-                         if schedule.get("properties", {}).get("장소", {}).get("rich_text") else "N/A"
-                         for schedule in result[0]]
-            
-            dates = [schedule.get("properties", {}).get("날짜", {}).get("date", {}).get("start", "N/A")
-                     if schedule.get("properties", {}).get("날짜", {}).get("date") else "N/A"
-                     for schedule in result[0]]
+            # 표시되는 25개만 가공
+            shown = result[0][:25]
+            names = [schedule.name for schedule in shown]
+            locations = [schedule.location or "N/A" for schedule in shown]
+            dates = [schedule.date or "N/A" for schedule in shown]
 
             # 표 형식으로 출력
             embed = discord.Embed(
@@ -205,11 +374,11 @@ async def search_schedule(ctx, *, query: str = None):
             try:
                 msg = await bot.wait_for('message', timeout=30.0, check=check)
                 selected_index = int(msg.content) - 1
-                selected_schedule = result[0][selected_index]
+                selected_schedule = await full_page(notion_client, schedule_mirror, result[0][selected_index])
                 formatted_info = format_notion_schedule_info(selected_schedule, prefix="-", return_notion_id=True)
                     
                 embed = discord.Embed(title="선택된 정보", description=f"{formatted_info}", color=0x00ff00)
-                embed.set_footer(text=f"출석/등록을 받기 위해서는 아래의 명령어를 실행하세요:\n!공지생성 {selected_schedule.get('id')} 출석\n!공지생성 {selected_schedule.get('id')} 등록")
+                embed.set_footer(text=f"출석/등록을 받기 위해서는 아래의 명령어를 실행하세요:\n!공지생성 {selected_schedule.id} 출석\n!공지생성 {selected_schedule.id} 등록")
                 await ctx.send(embed=embed)
                 if not isinstance(msg.channel, discord.DMChannel):
                     await msg.delete()
@@ -219,7 +388,7 @@ async def search_schedule(ctx, *, query: str = None):
                 await ctx.send(embed=embed,delete_after=30)
 
         elif len(result[0]) == 1:
-            schedule_info = result[0][0]
+            schedule_info = await full_page(notion_client, schedule_mirror, result[0][0])
             formatted_info = format_notion_schedule_info(schedule_info, prefix="-", return_notion_id=True)
             embed = discord.Embed(title="검색된 정보", description=f"{formatted_info}", color=0x00ff00)
             await ctx.send(embed=embed)
@@ -261,15 +430,15 @@ async def search_member(ctx, query: str=None):
         database_id = NOTION_MEMBER_DB_ID
 
         # 검색 결과 가져오기
-        notion_client = AsyncClient(auth=NOTION_API_KEY)
-        result = await search_members_in_database(notion_client, database_id, conditions)
+        notion_client = ctx.bot.notion
+        # 선택지로 표시하는 25개까지만, 목록에 필요한 속성(이름, 활동 분야)만 가져옴
+        result = await search_members_in_database(notion_client, database_id, conditions, mirror=member_mirror,
+                                                  limit=25, properties=MEMBER_LIST_PROPERTIES)
         
         # 검색 결과가 여러 개일 경우 처리
         if result and len(result[0]) > 1:
-            names = extract_titles_from_pages(result[0])
-            roles = [', '.join([tag.get("name", "") for tag in person.get("properties", {}).get("활동 분야", {}).get("multi_select", [])])
-                        if person.get("properties", {}).get("활동 분야", {}).get("multi_select", []) else "N/A"
-                        for person in result[0]]
+            names = [person.name for person in result[0]]
+            roles = [', '.join(person.roles) if person.roles else "N/A" for person in result[0]]
     
             embed = discord.Embed(title="검색 결과 / 자세히 볼 멤버의 **번호를 선택해주세요.**", description=f"최대 25개까지 표시됩니다.:", color=0x00ff00)
             
@@ -289,7 +458,7 @@ async def search_member(ctx, query: str=None):
             try:
                 msg = await bot.wait_for('message', timeout=30.0, check=check)
                 selected_index = int(msg.content) - 1
-                selected_member = result[0][selected_index]
+                selected_member = await full_page(notion_client, member_mirror, result[0][selected_index])
                 formatted_info = format_notion_member_info(selected_member, prefix="-")
                 
                 embed = discord.Embed(title="선택된 정보", description=f"{formatted_info}", color=0x00ff00)
@@ -302,7 +471,7 @@ async def search_member(ctx, query: str=None):
                 embed = discord.Embed(title="시간 초과", description="시간이 초과되었습니다. 다시 시도해주세요.", color=0xff0000)
                 await ctx.send(embed=embed, delete_after=30)
         elif result and len(result[0]) == 1:
-            member_info = result[0][0]
+            member_info = await full_page(notion_client, member_mirror, result[0][0])
             formatted_info = format_notion_member_info(member_info, prefix="-")
             
             embed = discord.Embed(title="검색된 정보", description=f"{formatted_info}", color=0x00ff00)
@@ -341,12 +510,12 @@ async def create_notice(ctx, notion_page_id: str, notice_type: str =None, emoji:
 
     try:
         # Notion API를 통해 페이지 정보 가져오기
-        notion_client = AsyncClient(auth=NOTION_API_KEY)
-        schedule_info = await notion_client.pages.retrieve(page_id=notion_page_id)
+        notion_client = ctx.bot.notion
+        schedule_info = Schedule.from_page(await retrieve_page(notion_client, notion_page_id))
 
         # 일정 정보를 formatting
         formatted_info = format_notion_schedule_info(schedule_info, return_notion_id=False)
-        schedule_name = extract_titles_from_pages(schedule_info)[0]
+        schedule_name = schedule_info.name
 
         # 제목에 따라 이모지 변경
         if "branch" in schedule_name:
@@ -373,32 +542,79 @@ async def create_notice(ctx, notion_page_id: str, notice_type: str =None, emoji:
         # 이모지 추가 (체크마크)
         await bot_message.add_reaction("✅")
 
-        # 출석 또는 등록에 대한 처리
-        attendance_message_store[bot_message.id] = {
-            "notion_page_id": notion_page_id,
-            "notice_type": notice_type,
-            "emoji": "✅"
-        }
-
-        await ctx.message.delete()
+        duration = 10
 
+        # 출석 또는 등록에 대한 처리 (재시작 후에도 유지되도록 저장)
+        if notice_type == "출석":
+            # 마감 처리가 끝나기 전에 재시작되어도 복구할 수 있도록 여유 시간을 두고 보관
+            attendance_message_store.add(bot_message.id, notion_page_id, notice_type, "✅",
+                                         ttl=duration + ATTENDANCE_GRACE_SECONDS, duration=duration,
+                                         channel_id=ctx.channel.id, author_id=ctx.author.id)
+        else:
+            attendance_message_store.add(bot_message.id, notion_page_id, notice_type, "✅",
+                                         ttl=REGISTRATION_TTL_DAYS * 24 * 60 * 60,
+                                         channel_id=ctx.channel.id, author_id=ctx.author.id)
 
-        duration = 10
+        await ctx.message.delete()
 
         # 출석 제한 시간이 설정된 경우
         if notice_type == "출석" and duration:
-            await asyncio.sleep(duration)
-            await ctx.send(f"출석 확인 시간이 종료되었습니다.")
-            del attendance_message_store[bot_message.id]
-
-            # 출석 확인 시간이 종료되면 결석자 업데이트 및 DM 전송
-            await update_absentees_and_send_dm(ctx, notion_page_id)
+            attendance_timers[bot_message.id] = asyncio.current_task()
+            await close_attendance(ctx.channel, ctx.author, bot_message.id, notion_page_id, duration)
 
     except Exception as e:
         embed = discord.Embed(title="오류 발생", description=f"공지 생성 중 오류가 발생했습니다: {str(e)}", color=0xff0000)
         await ctx.send(embed=embed)
         pprint(f"Error in 공지생성: {str(e)}")
 
+async def close_attendance(channel, author, message_id: int, notion_page_id: str, delay: float):
+    """
+    출석 확인 시간이 지나면 공지를 마감하고, 결석자 업데이트 및 결과 DM을 전송하는 함수.
+
+    :param channel: 마감 메시지를 보낼 채널 (None이면 생략)
+    :param author: 결과를 DM으로 받을 공지 생성자
+    :param message_id: 출석 공지 메시지 ID
+    :param notion_page_id: 노션 페이지 ID (행사 정보가 포함된 페이지)
+    :param delay: 마감까지 남은 시간 (초)
+    """
+    with tracer.span("attendance_window", idle=True, delay=round(delay, 1)):
+        await asyncio.sleep(max(0, delay))
+
+    # 여러 프로세스가 같은 공지를 복구한 경우 lease를 얻은 한 곳에서만 마감 처리
+    async with state_backend.lease(f"attendance:{message_id}", ttl=60, wait=0) as acquired:
+        if not acquired or attendance_message_store.reload(message_id) is None:
+            attendance_timers.pop(message_id, None)
+            return  # 다른 프로세스가 마감 처리 중이거나 이미 마감함
+        if channel:
+            await channel.send(f"출석 확인 시간이 종료되었습니다.")
+        del attendance_message_store[message_id]
+        attendance_timers.pop(message_id, None)
+
+        # 출석 확인 시간이 종료되면 결석자 업데이트 및 DM 전송
+        await send_attendance_report(author, bot.notion, notion_page_id)
+
+
+async def restore_attendance_windows():
+    """
+    재시작 전에 열려 있던 출석 공지의 마감 타이머를 복구하는 함수.
+    재시작 중에 마감 시간이 지난 공지는 바로 마감 처리합니다.
+    """
+    for entry in attendance_message_store.open_windows():
+        message_id = entry["message_id"]
+        if message_id in attendance_timers:
+            continue
+        try:
+            channel = bot.get_channel(entry["channel_id"]) if entry["channel_id"] else None
+            if SHARD_COUNT and channel is None:
+                continue  # 다른 프로세스가 연결한 샤드의 공지
+            author = await bot.fetch_user(entry["author_id"])
+            delay = entry["closes_at"] - time.time()
+            attendance_timers[message_id] = asyncio.create_task(tracer.traced_root()(close_attendance)(
+                channel, author, message_id, entry["notion_page_id"], delay))
+        except Exception as e:
+            pprint(f"Error in restore_attendance_windows: {str(e)}")
+
+
 # 노션 페이지 관계를 업데이트하는 함수
 async def update_notion_page_relation(user, notion_client, page_id: str, property_name: str, related_page_id: str):
     """
@@ -411,31 +627,16 @@ async def update_notion_page_relation(user, notion_client, page_id: str, propert
     :param related_page_id: relation으로 추가할 페이지 ID
     """
     try:
-        # 기존 관계 가져오기
-        page_data = await notion_client.pages.retrieve(page_id=page_id)
-        existing_relations = page_data['properties'][property_name]['relation']
-        
-        # 기존 관계에 새로운 관계 추가 (중복되지 않도록 확인)
-        if not any(relation['id'] == related_page_id for relation in existing_relations):
-            updated_relations = existing_relations + [{"id": related_page_id}]
-        else:
-            updated_relations = existing_relations
-
-        await notion_client.pages.update(
-            page_id=page_id,
-            properties={
-                property_name: {
-                    "relation": [{"id": related_page_id}]
-                }
-            }
-        )
+        # 같은 페이지에 대한 변경을 모아서 한 번에 반영 (동시 반응끼리 덮어쓰지 않음)
+        await relation_writer.add(notion_client, page_id, property_name, related_page_id)
         schedule_name, member_name = await page_ids_to_titles(notion_client, [page_id, related_page_id])
         embed = discord.Embed(title=f"등록 완료", description=f"{schedule_name}의 '{property_name}'에 '{member_name}'가 추가되었습니다.", color=0x00ff00)
-        await user.send(embed=embed)  # 사용자에게 DM으로 전송
+        # 사용자에게 DM으로 전송 (추가/제거를 반복해도 최종 상태 하나만 안내)
+        dm_sender.send(user, key=(page_id, property_name), embed=embed)
 
     except Exception as e:
         embed = discord.Embed(title="오류 발생", description=f"노션 페이지 업데이트 중 오류 발생: {str(e)}", color=0xff0000)
-        await user.send(embed=embed)
+        dm_sender.send(user, key=(page_id, property_name), embed=embed)
         pprint(f"Error in update_notion_page_relation: {str(e)}")
 
 
@@ -451,178 +652,153 @@ async def remove_notion_page_relation(user, notion_client, page_id: str, propert
     :param related_page_id: relation에서 제거할 페이지 ID
     """
     try:
-        # 기존 관계를 가져옴
-        page_data = await notion_client.pages.retrieve(page_id=page_id)
-        relations = page_data['properties'][property_name]['relation']
-        
-        # 제거할 관계 필터링
-        updated_relations = [r for r in relations if r['id'] != related_page_id]
-        
-        # 관계 업데이트
-        await notion_client.pages.update(
-            page_id=page_id,
-            properties={
-                property_name: {
-                    "relation": updated_relations
-                }
-            }
-        )
+        # 같은 페이지에 대한 변경을 모아서 한 번에 반영 (동시 반응끼리 덮어쓰지 않음)
+        await relation_writer.remove(notion_client, page_id, property_name, related_page_id)
         schedule_name, member_name = await page_ids_to_titles(notion_client, [page_id, related_page_id])
 
         embed = discord.Embed(title="제거 완료", description=f"페이지 {schedule_name}의 '{property_name}'에 '{member_name}'가 제거되었습니다.", color=0x00ff00)
-        await user.send(embed=embed)  # 사용자에게 DM으로 전송
+        # 사용자에게 DM으로 전송 (추가/제거를 반복해도 최종 상태 하나만 안내)
+        dm_sender.send(user, key=(page_id, property_name), embed=embed)
 
     except Exception as e:
         embed = discord.Embed(title="오류 발생", description=f"노션 페이지 관계 제거 중 오류 발생: {str(e)}", color=0xff0000)
-        await user.send(embed=embed)
+        dm_sender.send(user, key=(page_id, property_name), embed=embed)
         pprint(f"Error in remove_notion_page_relation: {str(e)}")
 
 
-# 이모지 추가 시 노션 페이지와 관계를 업데이트하는 이벤트 핸들러
-@bot.event
-async def on_raw_reaction_add(payload):
+# 큐에서 꺼낸 이모지 반응을 처리하는 함수 (워커에서 (메시지, 사용자)별로 순서대로 실행)
+@metrics.timed("bot_event_duration_seconds", event="reaction")
+@tracer.traced_root()
+async def process_reaction(payload):
     """
-    사용자가 특정 메시지에 이모지를 추가할 때 발생하는 이벤트 처리.
-    
+    사용자가 특정 메시지에 이모지를 추가/제거한 이벤트를 처리하는 함수.
+    추가는 노션 페이지의 relation에 사용자를 넣고, 제거는 relation에서 사용자를 뺍니다.
+
     :param payload: 이모지 반응 관련 정보
     """
+    # 반응 워커 태스크의 Notion 요청에만 반응 레인이 적용됨
+    current_priority.set(Priority.REACTION)
+    added = payload.event_type == REACTION_ADD
     try:
-        if payload.message_id not in attendance_message_store:
-            return  # 저장된 출석 또는 등록 메시지가 아닌 경우 처리하지 않음
+        message_data = attendance_message_store.active(payload.message_id)
+        if message_data is None:
+            return  # 큐에서 기다리는 동안 마감된 경우 처리하지 않음
 
         user = bot.get_user(payload.user_id)
         if not user:
             return
 
-        notion_client = AsyncClient(auth=NOTION_API_KEY)
-        message_data = attendance_message_store[payload.message_id]
+        notion_client = bot.notion
         notion_page_id = message_data["notion_page_id"]
         notice_type = message_data["notice_type"]
 
-        # 사용자 정보 찾기
-        conditions = [{'discord_id': str(payload.user_id)}]
-        result = await search_members_in_database(notion_client, NOTION_MEMBER_DB_ID, conditions)
+        # 사용자 정보 찾기 (미러 우선, 없으면 Notion 조회)
+        member_info = await member_mirror.lookup_discord_id(notion_client, payload.user_id, properties=MEMBER_LOOKUP_PROPERTIES)
 
-        if result and len(result[0]) > 0:
-            member_info = result[0][0]
-            member_page_id = member_info['id']
+        if member_info:
+            member_page_id = member_info.id
 
-            # 노션 페이지에 사용자 추가
+            # 노션 페이지에 사용자 추가 또는 제거
             property_name = "출석자 (인정 결석 포함)" if notice_type == "출석" else "등록자"
-            await update_notion_page_relation(user, notion_client, notion_page_id, property_name, member_page_id)
+            if added:
+                await update_notion_page_relation(user, notion_client, notion_page_id, property_name, member_page_id)
+            else:
+                await remove_notion_page_relation(user, notion_client, notion_page_id, property_name, member_page_id)
         else:
             embed = discord.Embed(title="오류", description=f"노션에서 해당 사용자 {payload.user_id}를 찾을 수 없습니다.", color=0xff0000)
-            await user.send(embed=embed)
+            dm_sender.send(user, key=("member_not_found",), embed=embed)
 
     except Exception as e:
         user = bot.get_user(payload.user_id)
-        embed = discord.Embed(title="오류 발생", description=f"이모지 처리 중 오류가 발생했습니다: {str(e)}", color=0xff0000)
+        action = "처리" if added else "제거 처리"
+        embed = discord.Embed(title="오류 발생", description=f"이모지 {action} 중 오류가 발생했습니다: {str(e)}", color=0xff0000)
         if user:
-            await user.send(embed=embed)
-        pprint(f"Error in on_raw_reaction_add: {str(e)}")
+            dm_sender.send(user, key=("reaction_error", payload.message_id), embed=embed)
+        pprint(f"Error in process_reaction: {str(e)}")
 
 
-# 이모지 제거 시 노션 페이지에서 관계를 제거하는 이벤트 핸들러
+# 반응 작업 큐 (대량 출석 체크 시 Notion 요청이 한꺼번에 몰리지 않도록 워커 수를 제한)
+reaction_queue = ReactionQueue(process_reaction, workers=REACTION_WORKERS, maxsize=REACTION_QUEUE_SIZE)
+
+
+def is_notice_reaction(payload) -> bool:
+    # 저장된 출석 또는 등록 메시지에 다른 사용자가 남긴 반응만 처리 (봇이 붙인 ✅는 제외)
+    if bot.user is not None and payload.user_id == bot.user.id:
+        return False
+    return attendance_message_store.active(payload.message_id) is not None
+
+
+# 이모지 추가 시 노션 페이지와 관계를 업데이트하는 이벤트 핸들러
 @bot.event
-async def on_raw_reaction_remove(payload):
+async def on_raw_reaction_add(payload):
     """
-    사용자가 특정 메시지에서 이모지를 제거할 때 발생하는 이벤트 처리.
-    
+    사용자가 특정 메시지에 이모지를 추가할 때 발생하는 이벤트 처리. 실제 처리는 반응 큐의 워커가 합니다.
+
     :param payload: 이모지 반응 관련 정보
     """
-    try:
-        if payload.message_id not in attendance_message_store:
-            return  # 저장된 출석 또는 등록 메시지가 아닌 경우 처리하지 않음
+    if is_notice_reaction(payload):
+        await reaction_queue.put(payload)
 
-        user = bot.get_user(payload.user_id)
-        if not user:
-            return
 
-        notion_client = AsyncClient(auth=NOTION_API_KEY)
-        message_data = attendance_message_store[payload.message_id]
-        notion_page_id = message_data["notion_page_id"]
-        notice_type = message_data["notice_type"]
+# 이모지 제거 시 노션 페이지에서 관계를 제거하는 이벤트 핸들러
+@bot.event
+async def on_raw_reaction_remove(payload):
+    """
+    사용자가 특정 메시지에서 이모지를 제거할 때 발생하는 이벤트 처리. 실제 처리는 반응 큐의 워커가 합니다.
 
-        # 사용자 정보 찾기
-        conditions = [{'discord_id': str(payload.user_id)}]
-        result = await search_members_in_database(notion_client, NOTION_MEMBER_DB_ID, conditions)
+    :param payload: 이모지 반응 관련 정보
+    """
+    if is_notice_reaction(payload):
+        await reaction_queue.put(payload)
 
-        if result and len(result[0]) > 0:
-            member_info = result[0][0]
-            member_page_id = member_info['id']
-
-            # 노션 페이지에서 사용자 제거
-            property_name = "출석자 (인정 결석 포함)" if notice_type == "출석" else "등록자"
-            await remove_notion_page_relation(user, notion_client, notion_page_id, property_name, member_page_id)
-        else:
-            embed = discord.Embed(title="오류", description=f"노션에서 해당 사용자 {payload.user_id}를 찾을 수 없습니다.", color=0xff0000)
-            await user.send(embed=embed)
 
+@bot.command(name='stats', help='봇의 명령어 처리 시간, Notion 요청 수, 캐시 적중률을 보여줍니다. (관리자 전용)')
+@commands.has_permissions(administrator=True)
+async def stats_command(ctx):
+    """
+    `!stats`로 지표 요약을 보여주는 명령어. 서버 관리자만 사용할 수 있습니다.
+    """
+    try:
+        report = metrics.report()
+        if len(report) > 4000:
+            report = report[:4000] + "\n…"
+        embed = discord.Embed(title="📈 봇 지표", description=report, color=0x3498db)
+        await ctx.send(embed=embed)
     except Exception as e:
-        user = bot.get_user(payload.user_id)
-        embed = discord.Embed(title="오류 발생", description=f"이모지 제거 처리 중 오류가 발생했습니다: {str(e)}", color=0xff0000)
-        if user:
-            await user.send(embed=embed)
-        pprint(f"Error in on_raw_reaction_remove: {str(e)}")
+        embed = discord.Embed(title="오류 발생", description=f"지표를 불러오는 동안 오류가 발생했습니다: {str(e)}", color=0xff0000)
+        await ctx.send(embed=embed)
+        pprint(f"Error in stats_command: {str(e)}")
 
 
 @bot.command(name='test', help='노션 일정에 대한 공지를 작성하고 출석/등록을 처리합니다.')
 async def update_absentees_and_send_dm(ctx, notion_page_id: str):
+    """
+    `!test [노션 페이지 ID]`로 출석 확인을 수동 실행하는 명령어.
+
+    :param notion_page_id: 노션 페이지 ID (행사 정보가 포함된 페이지)
+    """
+    await send_attendance_report(ctx.author, ctx.bot.notion, notion_page_id)
+
+
+async def send_attendance_report(author, notion_client, notion_page_id: str):
     """
     등록자 목록과 출석자 목록을 비교하여, 등록자는 있지만 출석하지 않은 사람을 결석자 목록에 추가하고,
     공지 생성자에게 등록자, 출석자, 결석자 목록을 DM으로 전송하는 함수.
 
+    :param author: 공지 생성 명령어를 실행한 사용자 (DM 전송 대상)
     :param notion_client: Notion 비동기 API 클라이언트
     :param notion_page_id: 노션 페이지 ID (행사 정보가 포함된 페이지)
-    :param author: 공지 생성 명령어를 실행한 사용자 (DM 전송 대상)
     """
-    author = ctx.author
-    notion_client = AsyncClient(auth=NOTION_API_KEY)
     # try:
-    # 페이지 정보 가져오기
-    page_data = await notion_client.pages.retrieve(page_id=notion_page_id)
-
-    registrant_id = page_data['properties'].get('등록자', {}).get('id', "")
-    attendee_id = page_data['properties'].get('출석자 (인정 결석 포함)', {}).get('id', "")
-
+    # 등록자 - 출석자 - 기존 결석자를 한 번에 계산하고, 새 결석자만 추가
+    result = await reconcile_absentees(notion_client, notion_page_id)
 
-    res = await extract_properties_from_page_id(
-                notion_client, 
-                page_id=notion_page_id, 
-                property_ids=[registrant_id, attendee_id])
+    registrant_names = result.names_of(result.registrants)
+    attendee_names = result.names_of(result.attendees)
+    absentee_names = result.names_of(result.absentees)
 
-    # relation ID들을 리스트로 추출
-    relation_ids_list = extract_relation_ids_from_response(res)
-
-    # 각 리스트를 개별 변수에 저장
-    registrants_ids, attendees_ids = relation_ids_list
-
-    # 등록자에는 있지만 출석하지 않은 사람 찾기
-    absentees_ids = [r_id for r_id in registrants_ids if r_id not in attendees_ids]
-
-    registrant_names = await page_ids_to_titles(notion_client, registrants_ids)  # 등록자 이름 가져오기
-    attendee_names = await page_ids_to_titles(notion_client, attendees_ids)  # 출석자 이름 가져오기
-    absentee_names = await page_ids_to_titles(notion_client, absentees_ids)  # 결석자 이름 가져오기
-
-    # 결석자 목록에 추가
-    absentees = page_data['properties'].get('결석자', {}).get('relation', [])
-    absentee_ids_existing = [a['id'] for a in absentees]  # 기존 결석자의 노션 페이지 ID 리스트
-    # 새로운 결석자 추가 (중복되지 않도록 처리)
-    new_absentees = [r_id for r_id in absentees_ids if r_id not in absentee_ids_existing]
-    
-    if new_absentees:
-        updated_absentees = absentees + [{"id": absentee_id} for absentee_id in new_absentees]
-
-        # 결석자 목록 업데이트
-        await notion_client.pages.update(
-            page_id=notion_page_id,
-            properties={
-                "결석자": {
-                    "relation": updated_absentees
-                }
-            }
-        )
-        print(f"새로운 결석자가 추가되었습니다: {absentee_names}")
+    if result.new_absentees:
+        print(f"새로운 결석자가 추가되었습니다: {result.names_of(result.new_absentees)}")
 
     # DM으로 등록자, 출석자, 결석자 목록 전송
     message = (
@@ -638,4 +814,5 @@ async def update_absentees_and_send_dm(ctx, notion_page_id: str):
     #     await author.send(f"결석자 목록 업데이트 중 오류 발생: {str(e)}")
 
 # 봇 실행
-bot.run(DISCORD_TOKEN)
+if __name__ == "__main__":
+    bot.run(DISCORD_TOKEN)
@@ -0,0 +1,95 @@
+import asyncio
+import os, sys
+import sqlite3
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+
+from utils.backend import SQLiteBackend
+from utils.cache import TTLCache
+from utils.store import AttendanceStore
+
+
+def test_lease_is_exclusive_until_released_or_expired(tmp_path):
+    path = str(tmp_path / "state.db")
+    first, second = SQLiteBackend(path), SQLiteBackend(path)
+
+    assert first.try_acquire("attendance:1", "a", ttl=30)
+    assert not second.try_acquire("attendance:1", "b", ttl=30)
+    assert second.holder("attendance:1") == "a"
+    assert first.try_acquire("attendance:1", "a", ttl=30)  # 연장
+
+    first.release("attendance:1", "a")
+    assert second.try_acquire("attendance:1", "b", ttl=0.01)
+    time.sleep(0.02)
+    assert first.try_acquire("attendance:1", "a", ttl=30)  # 만료된 lease는 가져갈 수 있음
+    first.close(), second.close()
+
+
+def test_lease_serializes_writers(tmp_path):
+    path = str(tmp_path / "state.db")
+    backends = [SQLiteBackend(path), SQLiteBackend(path)]
+    events = []
+
+    async def write(backend, owner):
+        async with backend.lease("relation:page:출석자", ttl=5, owner=owner, poll=0.01):
+            events.append(("start", owner))
+            await asyncio.sleep(0.05)
+            events.append(("end", owner))
+
+    async def run():
+        await asyncio.gather(write(backends[0], "a"), write(backends[1], "b"))
+        async with backends[0].lease("relation:page:출석자", owner="a"):
+            async with backends[1].lease("relation:page:출석자", owner="b", wait=0) as acquired:
+                return acquired
+
+    assert asyncio.run(run()) is False
+    assert [kind for kind, _ in events] == ["start", "end", "start", "end"]
+    for backend in backends:
+        backend.close()
+
+
+def test_cache_and_notices_are_visible_across_processes(tmp_path):
+    backends = [SQLiteBackend(str(tmp_path / "state.db")) for _ in range(2)]
+    caches = [TTLCache(backend=backend, namespace="titles") for backend in backends]
+    caches[0].set("page", "GDSC 세미나")
+    assert caches[1].get("page") == "GDSC 세미나"
+    assert caches[1].stats()["hits"] == 1
+
+    stores = [AttendanceStore(str(tmp_path / "attendance.db"), shared=True) for _ in range(2)]
+    for store in stores:
+        store.load()
+    stores[0].add(1, "page", "출석", "✅", ttl=60, duration=10)
+    assert stores[1].active(1)["notion_page_id"] == "page"
+    assert [entry["message_id"] for entry in stores[1].open_windows()] == [1]
+
+    stores[0].remove(1)
+    assert stores[1].reload(1) is None
+    for closeable in backends + stores:
+        closeable.close()
+
+
+def test_contended_writes_do_not_block_or_raise(tmp_path):
+    path = str(tmp_path / "state.db")
+    backend = SQLiteBackend(path)
+    cache = TTLCache(backend=backend, namespace="titles")
+    cache.set("page", "GDSC 세미나")
+
+    # 다른 프로세스가 쓰기 잠금을 오래 잡고 있는 상황
+    other = sqlite3.connect(path, isolation_level=None)
+    other.execute("BEGIN IMMEDIATE")
+    try:
+        started = time.monotonic()
+        assert backend.set("titles:other", "스터디") is False
+        cache.set("next", "해커톤")  # 저장소에 쓰지 못해도 예외 없이 메모리에 저장
+        backend.delete("titles:page")
+        assert not backend.try_acquire("relation:page:출석자", "a", ttl=30)
+        assert time.monotonic() - started < 0.5
+        # WAL 모드에서 읽기는 쓰기 잠금을 기다리지 않음
+        assert backend.get("titles:page") == "GDSC 세미나"
+        assert cache.get("next") == "해커톤"
+    finally:
+        other.execute("ROLLBACK")
+        other.close()
+    assert backend.set("titles:other", "스터디") is True
+    backend.close()
@@ -0,0 +1,260 @@
+"""
+로컬 가짜 Notion 서버를 상대로 utils/notion.py와 봇 명령어 처리기의 성능을 측정하는 벤치마크.
+
+    python test/benchmark.py --sizes 100,1000 --iterations 200 --concurrency 4 --latency-ms 50
+
+각 작업의 처리량(ops/s), p50/p95/p99 지연 시간, 작업당 API 요청 수, 429 응답 수를 출력합니다.
+"""
+
+import argparse
+import asyncio
+import json
+import shutil
+import tempfile
+import time
+from typing import List, Dict, Any, Callable, Awaitable, Optional
+import os, sys
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+
+from fake_notion_server import Dataset, FakeNotionServer
+
+
+class FakeUser:
+    def __init__(self, user_id: int):
+        self.id = user_id
+        self.sent: List[Any] = []
+
+    async def send(self, content: Optional[str] = None, embed: Any = None, **kwargs) -> None:
+        self.sent.append(embed or content)
+
+
+class FakeMessage:
+    def __init__(self, content: str = "", author: Optional[FakeUser] = None):
+        self.id = 0
+        self.content = content
+        self.author = author
+        self.channel = None
+
+    async def delete(self) -> None:
+        pass
+
+
+class FakeContext:
+    """
+    명령어 처리기에 넘길 최소한의 discord `Context` 대용품. 보낸 embed를 기록합니다.
+    """
+
+    def __init__(self, bot, author_id: int):
+        self.bot = bot
+        self.author = FakeUser(author_id)
+        self.message = FakeMessage(author=self.author)
+        self.sent: List[Any] = []
+
+    async def send(self, content: Optional[str] = None, embed: Any = None, **kwargs) -> FakeMessage:
+        self.sent.append(embed or content)
+        return FakeMessage()
+
+    def failed(self) -> bool:
+        # 처리기는 예외를 삼키고 '오류 발생' embed를 보내므로 이를 실패로 집계
+        return any(getattr(embed, "title", None) == "오류 발생" for embed in self.sent + self.author.sent)
+
+
+def percentile(samples: List[float], p: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(p / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+async def run_operation(server: FakeNotionServer, name: str, size: str, fn: Callable[[int], Awaitable[Any]],
+                        iterations: int, concurrency: int) -> Dict[str, Any]:
+    """
+    fn(i)를 iterations번, 동시에 concurrency개씩 실행하여 지연 시간 분포와 처리량을 측정하는 함수.
+    """
+    latencies: List[float] = []
+    errors = 0
+    indexes = iter(range(iterations))
+
+    async def worker():
+        nonlocal errors
+        for i in indexes:
+            start = time.perf_counter()
+            try:
+                await fn(i)
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    server.reset_counters()
+    start = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    elapsed = time.perf_counter() - start
+
+    return {
+        "operation": name,
+        "size": size,
+        "iterations": iterations,
+        "throughput": iterations / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "requests_per_op": sum(server.requests.values()) / iterations,
+        "rate_limited": server.rate_limited,
+        "errors": errors,
+    }
+
+
+def print_report(results: List[Dict[str, Any]]) -> None:
+    header = f"{'operation':<38}{'size':>11}{'ops/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/op':>8}{'429':>6}{'err':>5}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(f"{r['operation']:<38}{r['size']:>11}{r['throughput']:>10.1f}{r['p50_ms']:>10.2f}{r['p95_ms']:>10.2f}"
+              f"{r['p99_ms']:>10.2f}{r['requests_per_op']:>8.1f}{r['rate_limited']:>6}{r['errors']:>5}")
+
+
+async def benchmark(sizes: List[int], events: Optional[int], iterations: int, concurrency: int,
+                    latency: float, jitter: float, page_size: int, rate_limit_ratio: float, retry_after: float,
+                    rate: float) -> List[Dict[str, Any]]:
+    # 데이터셋 ID는 시드로 정해지므로 봇 모듈을 불러오기 전에 환경 변수로 넘김
+    # (같은 프로세스에서 도는 테스트에 영향이 없도록 끝나면 환경 변수와 임시 디렉터리를 되돌림)
+    probe = Dataset(0, 0)
+    environ = dict(os.environ)
+    data_dir = tempfile.mkdtemp()
+    try:
+        os.environ.setdefault("NOTION_API_KEY", "secret_benchmark")
+        os.environ["NOTION_MEMBER_DB_ID"] = probe.member_db_id
+        os.environ["NOTION_SCHEDULE_DB_ID"] = probe.schedule_db_id
+        os.environ["RELATION_FLUSH_SECONDS"] = "0"
+        os.environ["ATTENDANCE_DB_PATH"] = os.path.join(data_dir, "attendance.db")
+        os.environ["MIRROR_DB_PATH"] = os.path.join(data_dir, "mirror.db")
+        return await _benchmark(probe, sizes, events, iterations, concurrency, latency, jitter, page_size,
+                                rate_limit_ratio, retry_after, rate)
+    finally:
+        os.environ.clear()
+        os.environ.update(environ)
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+async def _benchmark(probe: Dataset, sizes: List[int], events: Optional[int], iterations: int, concurrency: int,
+                     latency: float, jitter: float, page_size: int, rate_limit_ratio: float, retry_after: float,
+                     rate: float) -> List[Dict[str, Any]]:
+    import bot as bot_module
+    from utils.notion import (create_notion_client, search_members_in_database, search_schedules_in_database,
+                              retrieve_page, page_ids_to_titles, title_cache)
+    from utils.attendance import reconcile_absentees, ATTENDEE_PROPERTY
+    from utils.relation_writer import relation_writer
+    from utils.scheduler import scheduler
+    from utils.schema import schema_registry
+
+    scheduler.configure(rate=rate, burst=rate)
+    bot = bot_module.bot
+    member_db, schedule_db = probe.member_db_id, probe.schedule_db_id
+
+    async def wait_for(event, check=None, timeout=None):
+        # 목록에서 첫 번째 항목을 고른 것으로 처리
+        return FakeMessage(content="1")
+    bot.wait_for = wait_for
+
+    results = []
+    for size in sizes:
+        dataset = Dataset(size, events or size)
+        server = FakeNotionServer(dataset, latency=latency, jitter=jitter, page_size=page_size,
+                                  rate_limit_ratio=rate_limit_ratio, retry_after=retry_after)
+        base_url = server.start_in_thread()
+        notion = create_notion_client(os.environ["NOTION_API_KEY"], base_url=base_url)
+        bot.notion = notion
+        schema_registry.invalidate()
+        relation_writer.invalidate()
+        title_cache.clear()
+        label = f"{size}/{events or size}"
+
+        members, events_ids = dataset.discord_ids, dataset.event_ids
+        names = dataset.names
+
+        async def command(name: str, *args, author_id: int = 0, **kwargs) -> None:
+            ctx = FakeContext(bot, author_id)
+            await bot.get_command(name).callback(ctx, *args, **kwargs)
+            if ctx.failed():
+                raise RuntimeError(f"!{name} failed")
+
+        async def cold_titles(i: int):
+            title_cache.clear()
+            page = dataset.pages[events_ids[i % len(events_ids)]]
+            ids = [relation["id"] for relation in page["properties"]["등록자"]["relation"]]
+            return await page_ids_to_titles(notion, ids)
+
+        api_operations = [
+            ("members.query discord_id", lambda i: search_members_in_database(
+                notion, member_db, [{'discord_id': members[i % len(members)]}])),
+            ("members.query name", lambda i: search_members_in_database(
+                notion, member_db, [{'name': names[i % len(names)][:2]}])),
+            ("schedules.query date:this week", lambda i: search_schedules_in_database(
+                notion, schedule_db, [{'date': 'this week'}])),
+            ("pages.retrieve", lambda i: retrieve_page(notion, events_ids[i % len(events_ids)])),
+            ("page_ids_to_titles (cold)", cold_titles),
+            ("reconcile_absentees (read only)", lambda i: reconcile_absentees(
+                notion, events_ids[i % len(events_ids)], write=False)),
+            ("relation_writer.add", lambda i: relation_writer.add(
+                notion, events_ids[i % len(events_ids)], ATTENDEE_PROPERTY, dataset.member_ids[i % len(members)])),
+        ]
+        for name, fn in api_operations:
+            results.append(await run_operation(server, name, label, fn, iterations, concurrency))
+
+        # 미러를 불러온 뒤 (on_ready 이후 상태) 로컬 검색과 명령어 처리기 측정
+        await bot_module.member_mirror.load(notion)
+        await bot_module.schedule_mirror.load(notion)
+        mirror_operations = [
+            ("members.query name (mirror)", lambda i: search_members_in_database(
+                notion, member_db, [{'name': names[i % len(names)][:2]}], mirror=bot_module.member_mirror)),
+            ("schedules.query this week (mirror)", lambda i: search_schedules_in_database(
+                notion, schedule_db, [{'date': 'this week'}], mirror=bot_module.schedule_mirror)),
+            ("!내정보", lambda i: command('내정보', author_id=int(members[i % len(members)]))),
+            ("!멤버 <name>", lambda i: command('멤버', names[i % len(names)][:2])),
+            ("!일정 date:this week", lambda i: command('일정', query="date:this week")),
+        ]
+        for name, fn in mirror_operations:
+            results.append(await run_operation(server, name, label, fn, iterations, concurrency))
+
+        bot_module.member_mirror.clear()
+        bot_module.schedule_mirror.clear()
+        await notion.aclose()
+        server.stop_thread()
+
+    bot_module.attendance_message_store.close()
+    bot_module.mirror_store.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="가짜 Notion 서버를 이용한 봇 성능 벤치마크")
+    parser.add_argument("--sizes", default="100,1000", help="멤버 수 목록 (쉼표 구분)")
+    parser.add_argument("--events", type=int, default=None, help="일정 수 (기본값: 멤버 수와 동일)")
+    parser.add_argument("--iterations", type=int, default=100, help="작업당 반복 횟수")
+    parser.add_argument("--concurrency", type=int, default=4, help="동시 실행 수")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="서버 응답 지연 (ms)")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="서버 응답 지연에 더할 무작위 값 최댓값 (ms)")
+    parser.add_argument("--page-size", type=int, default=100, help="서버가 한 번에 반환할 최대 결과 수")
+    parser.add_argument("--rate-limit-ratio", type=float, default=0.0, help="429 응답 비율 (0~1)")
+    parser.add_argument("--retry-after", type=float, default=0.05, help="429 응답의 Retry-After (초)")
+    parser.add_argument("--rate", type=float, default=1000.0,
+                        help="클라이언트 초당 요청 수 (실제 Notion 한도는 3, 코드 자체 비용을 보려면 크게)")
+    parser.add_argument("--json", default=None, help="결과를 저장할 JSON 파일 경로")
+    args = parser.parse_args()
+
+    results = asyncio.run(benchmark(
+        sizes=[int(size) for size in args.sizes.split(",")], events=args.events,
+        iterations=args.iterations, concurrency=args.concurrency,
+        latency=args.latency_ms / 1000, jitter=args.jitter_ms / 1000, page_size=args.page_size,
+        rate_limit_ratio=args.rate_limit_ratio, retry_after=args.retry_after, rate=args.rate,
+    ))
+    print_report(results)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+import os, sys
+import asyncio
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+
+from benchmark import benchmark
+
+
+def test_benchmark_smoke():
+    # 작은 데이터셋으로 가짜 서버, 429 재시도, 명령어 처리기 경로가 모두 동작하는지 확인
+    environ = dict(os.environ)
+    results = asyncio.run(benchmark(
+        sizes=[30], events=10, iterations=4, concurrency=2, latency=0.0, jitter=0.0,
+        page_size=10, rate_limit_ratio=0.2, retry_after=0.01, rate=1000.0,
+    ))
+    operations = {result["operation"] for result in results}
+    assert {"members.query discord_id", "pages.retrieve", "!멤버 <name>", "!일정 date:this week"} <= operations
+    assert all(result["errors"] == 0 for result in results), results
+    assert all(result["p50_ms"] <= result["p95_ms"] <= result["p99_ms"] for result in results)
+    # 다른 테스트가 실행 순서에 영향을 받지 않도록 환경 변수를 되돌림
+    assert dict(os.environ) == environ
@@ -0,0 +1,101 @@
+import asyncio
+import os, sys
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+
+from utils.coalesce import SingleFlight, coalesced_request, read_flight
+from utils.scheduler import Priority, current_priority, use_priority
+
+
+class SlowEndpoint:
+    """
+    호출될 때의 우선순위 레인을 기록하고 잠시 기다린 뒤 응답하는 가짜 Notion 메서드.
+    """
+
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.lanes = []
+
+    async def __call__(self, **kwargs):
+        self.lanes.append(current_priority.get())
+        await asyncio.sleep(self.delay)
+        return {"object": "page", **kwargs}
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"value": len(calls)}
+
+    async def run():
+        results = await asyncio.gather(*[flight.do("key", fetch) for _ in range(5)])
+        assert all(result is results[0] for result in results)
+        assert flight.inflight == 0
+        # 끝난 요청은 다시 실행됨
+        await flight.do("key", fetch)
+
+    asyncio.run(run())
+    assert len(calls) == 2
+    assert flight.stats() == {"hits": 4, "misses": 2, "inflight": 0}
+
+
+def test_same_lane_requests_are_coalesced():
+    endpoint = SlowEndpoint()
+
+    async def run():
+        return await asyncio.gather(*[coalesced_request(endpoint, page_id="a") for _ in range(3)])
+
+    results = asyncio.run(run())
+    assert endpoint.lanes == [Priority.INTERACTIVE]
+    assert results[0] is results[1] is results[2]
+
+
+def test_interactive_read_does_not_wait_behind_background_read():
+    endpoint = SlowEndpoint()
+
+    async def background():
+        with use_priority(Priority.BACKGROUND):
+            return await coalesced_request(endpoint, page_id="a")
+
+    async def run():
+        task = asyncio.ensure_future(background())
+        await asyncio.sleep(0.01)
+        assert read_flight.inflight == 1
+        # 같은 요청이 BACKGROUND 레인에서 진행 중이어도 명령어는 자기 레인에서 따로 요청함
+        interactive = await coalesced_request(endpoint, page_id="a")
+        return interactive, await task
+
+    interactive, background_result = asyncio.run(run())
+    assert endpoint.lanes == [Priority.BACKGROUND, Priority.INTERACTIVE]
+    assert interactive == background_result and interactive is not background_result
+
+
+class FakePages:
+    """
+    클라이언트마다 다른 응답을 주는 가짜 `notion.pages` 엔드포인트.
+    """
+
+    def __init__(self, workspace: str):
+        self.parent = object()  # 엔드포인트가 속한 클라이언트
+        self.workspace = workspace
+
+    async def retrieve(self, **kwargs):
+        await asyncio.sleep(0.02)
+        return {"workspace": self.workspace, **kwargs}
+
+
+def test_requests_from_different_clients_are_not_coalesced():
+    real, fake = FakePages("real"), FakePages("fake")
+
+    async def run():
+        return await asyncio.gather(coalesced_request(real.retrieve, page_id="a"),
+                                    coalesced_request(fake.retrieve, page_id="a"),
+                                    coalesced_request(real.retrieve, page_id="a"))
+
+    results = asyncio.run(run())
+    assert [result["workspace"] for result in results] == ["real", "fake", "real"]
+    assert results[0] is results[2]
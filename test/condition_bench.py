@@ -0,0 +1,55 @@
+import os, sys
+import time
+from datetime import date
+from statistics import median
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+
+from utils.condition import resolve_natural_language_time, _resolve_fast, _resolve_fallback
+
+# !일정 date: 에서 실제로 쓰이는 표현들
+EXPRESSIONS = [
+    "today", "> yesterday", "<= 2024-09-12", "24.09.08", "24-09-09",
+    "this week", "next week", "last month", "오늘", "이번 주", "다음 달",
+]
+
+
+def measure(fn, expression: str, repeat: int) -> float:
+    """
+    fn(expression)을 repeat번 실행하여 1회당 중앙값 지연 시간(마이크로초)을 반환합니다.
+    """
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(expression)
+        samples.append((time.perf_counter() - start) * 1e6)
+    return median(samples)
+
+
+def main(repeat: int = 200):
+    import dateparser
+
+    # dateparser 첫 호출 비용 (import 이후 정규식 준비)
+    start = time.perf_counter()
+    dateparser.parse("2024-01-01")
+    print(f"dateparser warm-up: {(time.perf_counter() - start) * 1000:.1f} ms\n")
+
+    def before(expression):
+        # 기존 경로: 고정 영어 키워드 외에는 모두 dateparser
+        return dateparser.parse(expression, settings={'DATE_ORDER': 'YMD'})
+
+    def after_uncached(expression):
+        # 새 경로에서 캐시를 비운 상태 (하루의 첫 호출)
+        _resolve_fast.cache_clear()
+        return _resolve_fast(expression, date.today()) or _resolve_fallback(expression, date.today())
+
+    print(f"{'expression':<16}{'before (us)':>14}{'after, cold (us)':>18}{'after, memo (us)':>18}")
+    for expression in EXPRESSIONS:
+        b = measure(before, expression, repeat)
+        c = measure(after_uncached, expression, repeat)
+        m = measure(resolve_natural_language_time, expression, repeat)
+        print(f"{expression:<16}{b:>14.1f}{c:>18.1f}{m:>18.2f}")
+
+
+if __name__ == "__main__":
+    main()
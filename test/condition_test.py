@@ -0,0 +1,75 @@
+import os, sys
+from datetime import date
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+
+from utils.condition import Condition, _resolve_fast
+
+# 2024-09-11 (수요일) 기준
+TODAY = date(2024, 9, 11)
+
+
+def test_resolve_fast_dates():
+    assert _resolve_fast("2024-09-12", TODAY) == ("2024-09-12", "2024-09-12")
+    assert _resolve_fast("<= 2024-09-12", TODAY) == ("2024-09-12", "2024-09-12")
+    assert _resolve_fast("24.09.08", TODAY) == ("2024-09-08", "2024-09-08")
+    assert _resolve_fast("24-09-09", TODAY) == ("2024-09-09", "2024-09-09")
+    assert _resolve_fast("2021-05-10T12:00:00", TODAY) == ("2021-05-10", "2021-05-10T12:00:00")
+    assert _resolve_fast("24.13.01", TODAY) is None
+
+
+def test_resolve_fast_relative():
+    assert _resolve_fast("> yesterday", TODAY) == ("2024-09-10", "2024-09-10")
+    assert _resolve_fast("오늘", TODAY) == ("2024-09-11", "2024-09-11")
+    assert _resolve_fast("this week", TODAY) == ("2024-09-09", "2024-09-15")
+    assert _resolve_fast("이번 주", TODAY) == ("2024-09-09", "2024-09-15")
+    assert _resolve_fast("지난주", TODAY) == ("2024-09-02", "2024-09-08")
+    assert _resolve_fast("다음 달", TODAY) == ("2024-10-01", "2024-10-31")
+    assert _resolve_fast("last month", date(2024, 1, 15)) == ("2023-12-01", "2023-12-31")
+    assert _resolve_fast("next month", date(2024, 12, 31)) == ("2025-01-01", "2025-01-31")
+
+
+def test_resolve_fast_unknown_falls_through():
+    assert _resolve_fast("2 weeks ago", TODAY) is None
+
+
+def test_date_condition_filters():
+    condition = Condition({'날짜': {'id': 'Bmou', 'type': 'date'}})
+    assert condition({'날짜': '<= 2024-09-12'}).get_filters() == {
+        'and': [{'property': '날짜', 'date': {'on_or_before': '2024-09-12'}}]
+    }
+    assert condition({'날짜': '24.09.08'}).get_filters() == {
+        'and': [
+            {'property': '날짜', 'date': {'on_or_after': '2024-09-08'}},
+            {'property': '날짜', 'date': {'on_or_before': '2024-09-08'}},
+        ]
+    }
+
+
+def test_operator_longest_match():
+    condition = Condition({'기수': {'id': 'a', 'type': 'number'}, '이름': {'id': 'b', 'type': 'rich_text'}})
+    assert condition({'기수': '<= 3'}).get_filters() == {
+        'and': [{'property': '기수', 'number': {'less_than_or_equal_to': '3'}}]
+    }
+    assert condition({'이름': 'not empty'}).get_filters() == {
+        'and': [{'property': '이름', 'rich_text': {'is_not_empty': True}}]
+    }
+
+
+def test_filter_plans_are_cached_and_refreshed_daily():
+    condition = Condition({'Discord ID': {'id': 'c', 'type': 'rich_text'}, '날짜': {'id': 'd', 'type': 'date'}})
+    first = condition({'Discord ID': '1234'}).get_filters()
+    plan = condition.plan('Discord ID', '1234')
+    assert condition.plan('Discord ID', '1234') is plan
+    # 값만 다른 조건은 필터 모양(템플릿)을 공유
+    assert condition.plan('Discord ID', '5678').templates is plan.templates
+    assert condition({'Discord ID': '1234'}).get_filters() == first
+    # 반환된 필터를 바꿔도 캐시된 계획에는 영향이 없음
+    first['and'][0]['rich_text']['equals'] = 'changed'
+    assert condition({'Discord ID': '1234'}).get_filters()['and'][0]['rich_text']['equals'] == '1234'
+
+    assert condition.plan('날짜', '2024-09-12').day is None
+    relative = condition.plan('날짜', 'today')
+    assert relative.day == date.today()
+    condition._plans.set(('날짜', 'today'), relative._replace(day=date(2000, 1, 1)))
+    assert condition.plan('날짜', 'today').day == date.today()
@@ -0,0 +1,95 @@
+import os, sys
+import json
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+
+import pytest
+
+from utils.condition import Condition
+from utils.date_index import DateIndex, date_bounds
+from utils.evaluator import query_pages
+from utils.mirror import ScheduleMirror
+
+FIXTURE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "notion_filter_fixtures.json")
+
+with open(FIXTURE_PATH, encoding="utf-8") as f:
+    FIXTURES = json.load(f)
+
+SCHEDULE_QUERIES = [q for q in FIXTURES["queries"] if q["database"] == "schedules"]
+
+
+def make_index() -> DateIndex:
+    index = DateIndex()
+    index.add("ot", "2024-09-02")
+    index.add("seminar", "2024-09-08")
+    index.add("session", "2024-09-10", "2024-09-11")
+    index.add("study", "2024-09-12T19:00:00.000+09:00")
+    index.add("camp", "2024-09-05", "2024-09-09")
+    index.add("undated", None)
+    return index
+
+
+def test_between_and_upcoming():
+    index = make_index()
+    assert index.between("2024-09-08", "2024-09-12") == ["seminar", "session", "study"]
+    assert index.between(None, "2024-09-05") == ["ot", "camp"]
+    assert index.upcoming("2024-09-09", k=2) == ["session", "study"]
+    assert "undated" not in index and len(index) == 5
+
+
+def test_overlapping_includes_ongoing_events():
+    index = make_index()
+    assert index.overlapping("2024-09-09", "2024-09-10") == ["camp", "session"]
+    assert index.overlapping("2024-09-11", "2024-09-11") == ["session"]
+
+
+def test_incremental_update():
+    index = make_index()
+    index.add("seminar", "2024-10-01")
+    assert index.between("2024-09-08", "2024-09-08") == []
+    assert index.upcoming("2024-09-30") == ["seminar"]
+    index.remove("seminar")
+    assert index.upcoming("2024-09-30") == []
+
+
+def test_same_day_events_follow_start_time():
+    index = DateIndex()
+    index.add("b-evening", "2024-09-12T19:00:00.000+09:00")
+    index.add("a-morning", "2024-09-12T09:00:00.000+09:00")
+    index.add("c-all-day", "2024-09-12")
+    index.add("next-day", "2024-09-13T08:00:00.000+09:00")
+    assert index.between("2024-09-12", "2024-09-12") == ["c-all-day", "a-morning", "b-evening"]
+    assert index.upcoming("2024-09-12", k=4) == ["c-all-day", "a-morning", "b-evening", "next-day"]
+    index.add("a-morning", "2024-09-12T21:00:00.000+09:00")
+    assert index.between("2024-09-12", "2024-09-12") == ["c-all-day", "b-evening", "a-morning"]
+
+    # 색인 순서를 그대로 쓰는 미러 조회도 `날짜` 오름차순 정렬과 같은 결과
+    mirror = ScheduleMirror("schedules")
+    mirror.apply([{"id": item_id, "last_edited_time": "2024-09-01T00:00:00.000Z",
+                   "properties": {"날짜": {"type": "date", "date": {"start": start, "end": None}}}}
+                  for item_id, start in [("b", "2024-09-12T19:00:00.000+09:00"), ("a", "2024-09-12T09:00:00.000+09:00")]])
+    filters = {"property": "날짜", "date": {"equals": "2024-09-12"}}
+    sorts = [{"property": "날짜", "direction": "ascending"}]
+    assert [page.id for page in mirror.query(filters, sorts)] == \
+           [page.id for page in query_pages(mirror.pages.values(), filters, sorts)] == ["a", "b"]
+
+
+def test_date_bounds():
+    filters = {"and": [
+        {"property": "날짜", "date": {"after": "2024-09-08"}},
+        {"property": "날짜", "date": {"on_or_before": "2024-09-12"}},
+        {"property": "이름", "title": {"contains": "세"}},
+    ]}
+    assert date_bounds(filters, "날짜") == ("2024-09-09", "2024-09-12", [filters["and"][2]])
+    # 시각이 포함된 조건은 색인으로 처리하지 않음
+    assert date_bounds({"property": "날짜", "date": {"on_or_before": "2024-09-12T12:00:00"}}, "날짜") is None
+
+
+@pytest.mark.parametrize("query", SCHEDULE_QUERIES, ids=[q["name"] for q in SCHEDULE_QUERIES])
+def test_schedule_mirror_matches_filter_spec(query):
+    database = FIXTURES["databases"]["schedules"]
+    mirror = ScheduleMirror(database["id"])
+    mirror.apply(database["pages"])
+
+    filters = Condition(database["properties"])(query["conditions"]).get_filters()
+    assert [page.id for page in mirror.query(filters, query["sorts"])] == query["result_ids"]
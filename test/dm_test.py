@@ -0,0 +1,61 @@
+import asyncio
+import os, sys
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+
+from utils.dm import DirectMessenger
+
+
+class FakeUser:
+    def __init__(self, user_id: int, delay: float = 0.0):
+        self.id = user_id
+        self.delay = delay
+        self.sent = []
+
+    async def send(self, **kwargs):
+        await asyncio.sleep(self.delay)
+        self.sent.append(kwargs["content"])
+
+
+def test_debounce_sends_only_final_state():
+    async def run():
+        messenger = DirectMessenger(debounce=0.05, rate=1000, burst=1000)
+        user = FakeUser(1)
+        for content in ("추가", "제거", "추가"):
+            messenger.send(user, key="일정", content=content)
+        messenger.send(user, key="다른 일정", content="제거")
+        assert user.sent == []
+
+        await asyncio.sleep(0.15)
+        await messenger.flush()
+        messenger.stop()
+        return user.sent
+
+    assert sorted(asyncio.run(run())) == ["제거", "추가"]
+
+
+def test_send_returns_without_waiting_for_delivery():
+    async def run():
+        messenger = DirectMessenger(rate=1000, burst=1000, concurrency=2)
+        users = [FakeUser(i, delay=0.05) for i in range(4)]
+        for user in users:
+            messenger.send(user, content="안내")
+        assert all(not user.sent for user in users)
+
+        await messenger.flush()
+        messenger.stop()
+        return users
+
+    assert all(user.sent == ["안내"] for user in asyncio.run(run()))
+
+
+def test_flush_sends_pending_messages_immediately():
+    async def run():
+        messenger = DirectMessenger(debounce=60, rate=1000, burst=1000)
+        user = FakeUser(1)
+        messenger.send(user, key="일정", content="추가")
+        await asyncio.wait_for(messenger.flush(), 1)
+        messenger.stop()
+        return user.sent, messenger.pending
+
+    assert asyncio.run(run()) == (["추가"], 0)
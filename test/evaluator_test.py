@@ -0,0 +1,46 @@
+import os, sys
+import json
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+
+import pytest
+
+from utils.condition import Condition
+from utils.evaluator import evaluate_filter, query_pages, UnsupportedFilter
+
+# 평가기의 명세 fixture (손으로 작성한 기대값, test/record_filter_fixtures.py로 실제 API 응답을 기록할 수 있음)
+FIXTURE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "notion_filter_fixtures.json")
+
+with open(FIXTURE_PATH, encoding="utf-8") as f:
+    FIXTURES = json.load(f)
+
+
+@pytest.mark.parametrize("query", FIXTURES["queries"], ids=[q["name"] for q in FIXTURES["queries"]])
+def test_local_query_matches_filter_spec(query):
+    database = FIXTURES["databases"][query["database"]]
+    filters = Condition(database["properties"])(query["conditions"]).get_filters()
+
+    result = [page["id"] for page in query_pages(database["pages"], filters, query["sorts"])]
+    if query["sorts"]:
+        assert result == query["result_ids"]
+    else:
+        # 정렬 조건이 없으면 API의 반환 순서는 보장되지 않음
+        assert sorted(result) == sorted(query["result_ids"])
+
+
+def test_or_and_timestamp_filters():
+    pages = FIXTURES["databases"]["schedules"]["pages"]
+    filters = {"or": [
+        {"property": "태그", "multi_select": {"contains": "행사"}},
+        {"timestamp": "last_edited_time", "last_edited_time": {"on_or_after": "2024-09-14T00:00:00.000Z"}},
+    ]}
+    assert [page["properties"]["이름"]["title"][0]["plain_text"] for page in query_pages(pages, filters)] == \
+        ["해커톤", "회고", "OT"]
+
+
+def test_unsupported_filter_raises():
+    page = FIXTURES["databases"]["members"]["pages"][0]
+    with pytest.raises(UnsupportedFilter):
+        evaluate_filter({"property": "이름", "title": {"matches_regex": ".*"}}, page)
+    with pytest.raises(UnsupportedFilter):
+        evaluate_filter({"property": "없는 속성", "title": {"equals": "x"}}, page)
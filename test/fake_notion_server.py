@@ -0,0 +1,363 @@
+import asyncio
+import copy
+import random
+import threading
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Dict, Any, Optional, Tuple
+import os, sys
+
+from aiohttp import web
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+
+from utils.evaluator import query_pages, UnsupportedFilter
+
+# Notion의 relation은 pages.retrieve 응답에 25개까지만 포함되고, 속성 API는 25개씩 페이지네이션됨
+RELATION_PAGE_LIMIT = 25
+
+_SURNAMES = "김이박최정강조윤장임한오서신권황안송류전홍고문양손배백허유남심노하곽성차주우구민진나지엄변채원천방공현함염여추도소석선설마길연위표명기반왕금옥육인맹제모탁국어은편용예봉경"
+_GIVEN = "민서지현수준영우진하은도윤예성훈재원호유연주승희태동혜정경아인채상소다나가"
+_TIERS = ["🌱 Junior", "👥 Member", "🔥 Core Member"]
+_ROLES = ["🖥️ SWE (Software Engineer)", "💝 DevRel (Developer Relations)", "🎨 Designer"]
+_EVENT_WORDS = ["정기 세션", "세미나", "스터디", "해커톤", "네트워킹", "OT", "회고", "워크숍", "밋업", "데모데이"]
+_TAGS = ["세션", "세미나", "스터디", "행사"]
+
+
+def _title(text: str) -> Dict[str, Any]:
+    return {"id": "title", "type": "title",
+            "title": [{"type": "text", "text": {"content": text, "link": None}, "plain_text": text, "href": None}]}
+
+
+def _rich_text(prop_id: str, text: str) -> Dict[str, Any]:
+    parts = [{"type": "text", "text": {"content": text, "link": None}, "plain_text": text, "href": None}] if text else []
+    return {"id": prop_id, "type": "rich_text", "rich_text": parts}
+
+
+def _multi_select(prop_id: str, names: List[str]) -> Dict[str, Any]:
+    return {"id": prop_id, "type": "multi_select",
+            "multi_select": [{"id": f"opt-{name}", "name": name, "color": "default"} for name in names]}
+
+
+def _relation(prop_id: str, ids: List[str]) -> Dict[str, Any]:
+    return {"id": prop_id, "type": "relation", "relation": [{"id": page_id} for page_id in ids], "has_more": False}
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def _page(page_id: str, database_id: str, properties: Dict[str, Any]) -> Dict[str, Any]:
+    now = _now()
+    return {"object": "page", "id": page_id, "created_time": now, "last_edited_time": now, "archived": False,
+            "parent": {"type": "database_id", "database_id": database_id}, "properties": properties,
+            "url": f"https://www.notion.so/{page_id.replace('-', '')}"}
+
+
+MEMBER_SCHEMA = {
+    "이름": {"id": "title", "name": "이름", "type": "title"},
+    "Discord ID": {"id": "dcid", "name": "Discord ID", "type": "rich_text"},
+    "티어 (SWE)": {"id": "tier", "name": "티어 (SWE)", "type": "multi_select"},
+    "활동 분야": {"id": "role", "name": "활동 분야", "type": "multi_select"},
+}
+
+SCHEDULE_SCHEMA = {
+    "이름": {"id": "title", "name": "이름", "type": "title"},
+    "날짜": {"id": "Bmou", "name": "날짜", "type": "date"},
+    "태그": {"id": "tags", "name": "태그", "type": "multi_select"},
+    "장소": {"id": "loca", "name": "장소", "type": "rich_text"},
+    "등록자": {"id": "regs", "name": "등록자", "type": "relation"},
+    "출석자 (인정 결석 포함)": {"id": "atts", "name": "출석자 (인정 결석 포함)", "type": "relation"},
+    "결석자": {"id": "abss", "name": "결석자", "type": "relation"},
+}
+
+
+class Dataset:
+    """
+    벤치마크용 가상의 멤버/일정 데이터베이스.
+    """
+
+    def __init__(self, members: int, events: int, registrants: int = 40, seed: int = 0):
+        """
+        :param members: 멤버 수
+        :param events: 일정 수
+        :param registrants: 일정마다 등록자 수 (출석자는 그중 약 2/3)
+        :param seed: 난수 시드
+        """
+        rng = random.Random(seed)
+        self.member_db_id = str(uuid.UUID(int=rng.getrandbits(128)))
+        self.schedule_db_id = str(uuid.UUID(int=rng.getrandbits(128)))
+        self.pages: Dict[str, Dict[str, Any]] = {}
+        self.discord_ids: List[str] = []
+        self.names: List[str] = []
+
+        member_ids = []
+        for _ in range(members):
+            name = rng.choice(_SURNAMES) + rng.choice(_GIVEN) + rng.choice(_GIVEN)
+            discord_id = str(rng.randrange(10 ** 17, 10 ** 18))
+            page = _page(str(uuid.UUID(int=rng.getrandbits(128))), self.member_db_id, {
+                "이름": _title(name),
+                "Discord ID": _rich_text("dcid", discord_id),
+                "티어 (SWE)": _multi_select("tier", [rng.choice(_TIERS)]),
+                "활동 분야": _multi_select("role", rng.sample(_ROLES, rng.randint(1, 2))),
+            })
+            self.pages[page["id"]] = page
+            member_ids.append(page["id"])
+            self.discord_ids.append(discord_id)
+            self.names.append(name)
+
+        self.event_ids = []
+        today = date.today()
+        for i in range(events):
+            start = today + timedelta(days=rng.randint(-180, 180))
+            end = start + timedelta(days=rng.choice([0, 0, 0, 1, 2]))
+            registered = rng.sample(member_ids, min(registrants, len(member_ids)))
+            attended = registered[:len(registered) * 2 // 3]
+            page = _page(str(uuid.UUID(int=rng.getrandbits(128))), self.schedule_db_id, {
+                "이름": _title(f"{rng.choice(_EVENT_WORDS)} {i + 1}"),
+                "날짜": {"id": "Bmou", "type": "date",
+                         "date": {"start": start.isoformat(), "end": end.isoformat() if end != start else None, "time_zone": None}},
+                "태그": _multi_select("tags", [rng.choice(_TAGS)]),
+                "장소": _rich_text("loca", rng.choice(["애기능 학생회관", "하나스퀘어", "온라인"])),
+                "등록자": _relation("regs", registered),
+                "출석자 (인정 결석 포함)": _relation("atts", attended),
+                "결석자": _relation("abss", []),
+            })
+            self.pages[page["id"]] = page
+            self.event_ids.append(page["id"])
+
+        self.member_ids = member_ids
+        self.databases = {
+            self.member_db_id: {"schema": MEMBER_SCHEMA, "title": "멤버"},
+            self.schedule_db_id: {"schema": SCHEDULE_SCHEMA, "title": "일정"},
+        }
+
+
+class FakeNotionServer:
+    """
+    봇이 사용하는 Notion API 엔드포인트를 흉내 내는 로컬 HTTP 서버.
+    databases.retrieve/query, search, pages.retrieve/update, pages.properties.retrieve를 지원하며,
+    응답 지연, 페이지 크기, 429(rate_limited) 응답 비율을 설정할 수 있습니다.
+    필터는 `utils.evaluator`로 평가하므로, 이 서버를 쓰는 벤치마크는 평가기의 정확성을 검증하지 않습니다.
+    """
+
+    def __init__(self, dataset: Dataset, latency: float = 0.0, jitter: float = 0.0, page_size: int = 100,
+                 rate_limit_ratio: float = 0.0, retry_after: float = 0.05, seed: int = 0):
+        """
+        :param dataset: 제공할 데이터셋
+        :param latency: 응답마다 추가할 지연 시간 (초)
+        :param jitter: 지연 시간에 더할 무작위 값의 최댓값 (초)
+        :param page_size: 한 번에 반환할 최대 결과 수 (Notion 최대값은 100)
+        :param rate_limit_ratio: 429 응답을 돌려줄 확률 (0~1)
+        :param retry_after: 429 응답의 Retry-After 값 (초)
+        """
+        self.dataset = dataset
+        self.latency = latency
+        self.jitter = jitter
+        self.page_size = page_size
+        self.rate_limit_ratio = rate_limit_ratio
+        self.retry_after = retry_after
+        self.requests: Dict[str, int] = {}
+        self.rate_limited = 0
+        self._rng = random.Random(seed)
+        self._runner: Optional[web.AppRunner] = None
+        self.base_url: Optional[str] = None
+
+        self.app = web.Application(middlewares=[self._middleware])
+        self.app.add_routes([
+            web.get("/v1/databases/{database_id}", self.retrieve_database),
+            web.post("/v1/databases/{database_id}/query", self.query_database),
+            web.post("/v1/search", self.search),
+            web.get("/v1/pages/{page_id}", self.retrieve_page),
+            web.patch("/v1/pages/{page_id}", self.update_page),
+            web.get("/v1/pages/{page_id}/properties/{property_id}", self.retrieve_property),
+        ])
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """
+        서버를 시작하고 base URL을 반환하는 함수. (port=0이면 빈 포트 사용)
+        """
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://{host}:{port}"
+        return self.base_url
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def start_in_thread(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """
+        별도 스레드의 이벤트 루프에서 서버를 시작하는 함수.
+        측정 대상(봇 코드)과 같은 루프를 쓰지 않으므로 서버 처리 시간이 클라이언트 지연에 섞이지 않습니다.
+        """
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+        return asyncio.run_coroutine_threadsafe(self.start(host, port), self._loop).result()
+
+    def stop_thread(self) -> None:
+        asyncio.run_coroutine_threadsafe(self.stop(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    def reset_counters(self) -> None:
+        self.requests.clear()
+        self.rate_limited = 0
+
+    @staticmethod
+    def _error(status: int, code: str, message: str, headers: Optional[Dict[str, str]] = None) -> web.Response:
+        body = {"object": "error", "status": status, "code": code, "message": message}
+        return web.json_response(body, status=status, headers=headers)
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler):
+        route = request.match_info.route.resource.canonical if request.match_info.route.resource else request.path
+        key = f"{request.method} {route}"
+        self.requests[key] = self.requests.get(key, 0) + 1
+
+        if self.latency or self.jitter:
+            await asyncio.sleep(self.latency + self._rng.random() * self.jitter)
+        if self.rate_limit_ratio and self._rng.random() < self.rate_limit_ratio:
+            self.rate_limited += 1
+            return self._error(429, "rate_limited", "You have been rate limited.",
+                               headers={"Retry-After": str(self.retry_after)})
+        return await handler(request)
+
+    def _paginate(self, items: List[Any], start_cursor: Optional[str], page_size: Optional[int]) -> Tuple[List[Any], Optional[str]]:
+        offset = int(start_cursor) if start_cursor else 0
+        size = min(int(page_size or self.page_size), self.page_size)
+        chunk = items[offset:offset + size]
+        next_offset = offset + size
+        return chunk, (str(next_offset) if next_offset < len(items) else None)
+
+    def _public_page(self, page: Dict[str, Any], property_ids: Optional[List[str]] = None) -> Dict[str, Any]:
+        # pages.retrieve/databases.query 응답처럼 relation은 25개까지만 포함
+        page = copy.deepcopy(page)
+        properties = page["properties"]
+        if property_ids:
+            properties = {name: prop for name, prop in properties.items() if prop["id"] in property_ids}
+            page["properties"] = properties
+        for prop in properties.values():
+            if prop["type"] == "relation" and len(prop["relation"]) > RELATION_PAGE_LIMIT:
+                prop["relation"] = prop["relation"][:RELATION_PAGE_LIMIT]
+                prop["has_more"] = True
+        return page
+
+    async def retrieve_database(self, request: web.Request) -> web.Response:
+        database_id = str(uuid.UUID(request.match_info["database_id"]))
+        database = self.dataset.databases.get(database_id)
+        if database is None:
+            return self._error(404, "object_not_found", f"Could not find database with ID: {database_id}.")
+        return web.json_response({
+            "object": "database", "id": database_id, "last_edited_time": _now(),
+            "title": [{"type": "text", "plain_text": database["title"]}],
+            "properties": database["schema"],
+        })
+
+    async def query_database(self, request: web.Request) -> web.Response:
+        database_id = str(uuid.UUID(request.match_info["database_id"]))
+        if database_id not in self.dataset.databases:
+            return self._error(404, "object_not_found", f"Could not find database with ID: {database_id}.")
+        body = await request.json() if request.can_read_body else {}
+
+        pages = [page for page in self.dataset.pages.values()
+                 if page["parent"]["database_id"] == database_id and not page["archived"]]
+        try:
+            results = query_pages(pages, body.get("filter"), body.get("sorts"))
+        except UnsupportedFilter as e:
+            return self._error(400, "validation_error", str(e))
+
+        chunk, next_cursor = self._paginate(results, body.get("start_cursor"), body.get("page_size"))
+        property_ids = request.query.getall("filter_properties", None)
+        return web.json_response({
+            "object": "list", "results": [self._public_page(page, property_ids) for page in chunk],
+            "next_cursor": next_cursor, "has_more": next_cursor is not None, "type": "page_or_database", "page_or_database": {},
+        })
+
+    async def search(self, request: web.Request) -> web.Response:
+        body = await request.json() if request.can_read_body else {}
+        query = (body.get("query") or "").lower()
+        results = [page for page in self.dataset.pages.values()
+                   if query in "".join(part["plain_text"] for part in page["properties"]["이름"]["title"]).lower()]
+        chunk, next_cursor = self._paginate(results, body.get("start_cursor"), body.get("page_size"))
+        return web.json_response({
+            "object": "list", "results": [self._public_page(page) for page in chunk],
+            "next_cursor": next_cursor, "has_more": next_cursor is not None, "type": "page_or_database", "page_or_database": {},
+        })
+
+    def _find_page(self, page_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            return self.dataset.pages.get(str(uuid.UUID(page_id)))
+        except ValueError:
+            return None
+
+    async def retrieve_page(self, request: web.Request) -> web.Response:
+        page = self._find_page(request.match_info["page_id"])
+        if page is None:
+            return self._error(404, "object_not_found", f"Could not find page with ID: {request.match_info['page_id']}.")
+        return web.json_response(self._public_page(page, request.query.getall("filter_properties", None)))
+
+    async def update_page(self, request: web.Request) -> web.Response:
+        page = self._find_page(request.match_info["page_id"])
+        if page is None:
+            return self._error(404, "object_not_found", f"Could not find page with ID: {request.match_info['page_id']}.")
+        body = await request.json()
+        for name, value in body.get("properties", {}).items():
+            prop = page["properties"].get(name)
+            if prop is None:
+                return self._error(400, "validation_error", f"{name} is not a property that exists.")
+            if prop["type"] == "relation":
+                prop["relation"] = [{"id": related["id"]} for related in value.get("relation", [])]
+                prop["has_more"] = False
+            else:
+                prop[prop["type"]] = value.get(prop["type"])
+        page["last_edited_time"] = _now()
+        return web.json_response(self._public_page(page))
+
+    async def retrieve_property(self, request: web.Request) -> web.Response:
+        page = self._find_page(request.match_info["page_id"])
+        if page is None:
+            return self._error(404, "object_not_found", f"Could not find page with ID: {request.match_info['page_id']}.")
+        property_id = request.match_info["property_id"]
+        prop = next((prop for prop in page["properties"].values() if prop["id"] == property_id), None)
+        if prop is None:
+            return self._error(404, "object_not_found", f"Could not find property with ID: {property_id}.")
+
+        if prop["type"] not in ("relation", "title", "rich_text"):
+            return web.json_response({"object": "property_item", "id": property_id, "type": prop["type"],
+                                      prop["type"]: prop[prop["type"]]})
+
+        items = [{"object": "property_item", "id": property_id, "type": prop["type"], prop["type"]: value}
+                 for value in prop[prop["type"]]]
+        page_size = min(int(request.query.get("page_size", RELATION_PAGE_LIMIT)), RELATION_PAGE_LIMIT)
+        chunk, next_cursor = self._paginate(items, request.query.get("start_cursor"), page_size)
+        return web.json_response({
+            "object": "list", "results": chunk, "next_cursor": next_cursor, "has_more": next_cursor is not None,
+            "type": "property_item", "property_item": {"id": property_id, "next_url": None, "type": prop["type"], prop["type"]: {}},
+        })
+
+
+async def serve(members: int = 200, events: int = 100, port: int = 8765, **options) -> None:
+    """
+    데이터셋을 만들어 서버를 계속 실행하는 함수. (수동 테스트용)
+    """
+    dataset = Dataset(members, events)
+    server = FakeNotionServer(dataset, **options)
+    base_url = await server.start(port=port)
+    print(f"Fake Notion server: {base_url}")
+    print(f"NOTION_MEMBER_DB_ID={dataset.member_db_id}")
+    print(f"NOTION_SCHEDULE_DB_ID={dataset.schedule_db_id}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(serve())
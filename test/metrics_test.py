@@ -0,0 +1,55 @@
+import asyncio
+import os, sys
+
+import httpx
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+
+from utils.metrics import MetricsRegistry, metrics
+from utils.scheduler import NotionScheduler
+
+
+def test_render_prometheus_text():
+    registry = MetricsRegistry()
+    registry.describe("requests_total", "counter", "요청 수")
+    registry.inc("requests_total", endpoint="pages.retrieve", status="200")
+    registry.inc("requests_total", endpoint="pages.retrieve", status="200")
+    registry.observe("latency_seconds", 0.03, command="일정")
+    registry.register_cache("titles", lambda: {"hits": 3, "misses": 1, "size": 4})
+
+    text = registry.render()
+    assert "# TYPE requests_total counter" in text
+    assert 'requests_total{endpoint="pages.retrieve",status="200"} 2' in text
+    assert 'latency_seconds_bucket{command="일정",le="0.025"} 0' in text
+    assert 'latency_seconds_bucket{command="일정",le="0.05"} 1' in text
+    assert 'latency_seconds_bucket{command="일정",le="+Inf"} 1' in text
+    assert 'latency_seconds_count{command="일정"} 1' in text
+    assert 'cache_hit_ratio{cache="titles"} 0.75' in text
+
+
+class PagesEndpoint:
+    def __init__(self, failures: int):
+        self.failures = failures
+
+    async def retrieve(self, **kwargs):
+        from notion_client import APIResponseError
+
+        if self.failures:
+            self.failures -= 1
+            response = httpx.Response(429, headers={"retry-after": "0"}, request=httpx.Request("GET", "http://test"))
+            raise APIResponseError(response, "rate limited", "rate_limited")
+        return {"id": kwargs["page_id"]}
+
+
+def test_scheduler_counts_statuses_and_retries():
+    metrics.reset()
+    scheduler = NotionScheduler(rate=1000, burst=1000)
+    result = asyncio.run(scheduler.request(PagesEndpoint(failures=2).retrieve, page_id="a"))
+
+    assert result == {"id": "a"}
+    counts = {dict(labels)["status"]: value for labels, value in metrics.counter_values("notion_requests_total").items()
+              if dict(labels)["endpoint"] == "pages.retrieve"}
+    assert counts == {"429": 2, "200": 1}
+    assert sum(metrics.counter_values("notion_retries_total").values()) == 2
+    assert metrics.gauge_values("notion_requests_in_flight")[()] == 0
+    assert "`pages.retrieve` 200: 1, 429: 2 (재시도 2)" in metrics.report()
@@ -0,0 +1,96 @@
+import asyncio
+import os, sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+
+from fake_notion_server import Dataset, FakeNotionServer
+from utils.mirror import MemberMirror
+from utils.notion import create_notion_client, normalize_page_id
+from utils.store import MirrorStore
+
+LATER = "2999-01-01T00:00:00.000Z"
+
+
+def test_incremental_sync_snapshot_and_reconcile(tmp_path):
+    dataset = Dataset(members=30, events=5)
+    server = FakeNotionServer(dataset, page_size=10)
+    base_url = server.start_in_thread()
+    store = MirrorStore(str(tmp_path / "mirror.db"))
+    edited, deleted = dataset.member_ids[0], dataset.member_ids[1]
+    # Notion처럼 페이지마다 다른 (분 단위) 수정 시각
+    for minute, page in enumerate(dataset.pages.values()):
+        page["last_edited_time"] = f"2024-01-01T{minute // 60:02d}:{minute % 60:02d}:00.000Z"
+
+    async def scenario():
+        notion = create_notion_client("secret_test", base_url=base_url)
+        mirror = MemberMirror(dataset.member_db_id, store=store)
+
+        await mirror.refresh(notion)  # 처음에는 전체 로드 (30개 / 10개씩)
+        assert len(mirror.pages) == 30 and server.requests["POST /v1/databases/{database_id}/query"] == 3
+
+        # 수정된 페이지만 가져옴
+        server.reset_counters()
+        dataset.pages[edited]["last_edited_time"] = LATER
+        dataset.pages[edited]["properties"]["이름"]["title"][0]["plain_text"] = "새이름"
+        # high-water mark와 같은 분에 수정된 페이지는 겹쳐서 다시 받지만, 바뀌지 않았으므로 반영하지 않음
+        assert await mirror.refresh(notion) == 1
+        assert sum(server.requests.values()) == 1
+        assert mirror.get(edited).name == "새이름"
+        # 변경이 없으면 조회 한 번 외에는 아무 것도 하지 않음
+        assert await mirror.refresh(notion) == 0
+
+        # 수정 시각 변화 없이 사라진 페이지는 전체 대조에서 제거
+        dataset.pages[deleted]["archived"] = True
+        await mirror.refresh(notion)
+        assert mirror.get(deleted) is not None
+        assert await mirror.reconcile(notion) == 1
+        assert mirror.get(deleted) is None
+
+        # 재시작: 스냅샷에서 복구한 뒤 변경분만 조회
+        server.reset_counters()
+        restarted = MemberMirror(dataset.member_db_id, store=store)
+        await restarted.refresh(notion)
+        assert sum(server.requests.values()) == 1
+        assert set(restarted.pages) == set(mirror.pages)
+        assert restarted.high_water_mark == LATER
+        assert normalize_page_id(deleted) not in restarted.pages
+        assert restarted.by_discord_id == mirror.by_discord_id
+        await notion.aclose()
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        store.close()
+        server.stop_thread()
+
+
+def test_lookup_fallback_does_not_advance_high_water_mark():
+    dataset = Dataset(members=5, events=1)
+    server = FakeNotionServer(dataset)
+    base_url = server.start_in_thread()
+    for page in dataset.pages.values():
+        page["last_edited_time"] = "2024-01-01T00:00:00.000Z"
+    looked_up, other = dataset.member_ids[0], dataset.member_ids[1]
+
+    async def scenario():
+        notion = create_notion_client("secret_test", base_url=base_url)
+        mirror = MemberMirror(dataset.member_db_id)
+        await mirror.load(notion)
+
+        # 다음 갱신 전에 두 페이지가 수정됨 (한 페이지는 반응 처리에서 먼저 조회)
+        dataset.pages[other]["last_edited_time"] = "2024-06-01T00:00:00.000Z"
+        dataset.pages[other]["properties"]["이름"]["title"][0]["plain_text"] = "새이름"
+        dataset.pages[looked_up]["last_edited_time"] = LATER
+        dataset.pages[looked_up]["properties"]["Discord ID"]["rich_text"][0]["plain_text"] = "42"
+        assert (await mirror.lookup_discord_id(notion, 42)).id == looked_up
+        assert mirror.high_water_mark == "2024-01-01T00:00:00.000Z"
+
+        await mirror.refresh(notion)
+        assert mirror.get(other).name == "새이름"
+        await notion.aclose()
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        server.stop_thread()
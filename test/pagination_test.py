@@ -0,0 +1,81 @@
+import asyncio
+import os, sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+
+from fake_notion_server import Dataset, FakeNotionServer
+from utils.notion import create_notion_client, paginate, search_members_in_database
+from utils.notion import MEMBER_LIST_PROPERTIES, MEMBER_LOOKUP_PROPERTIES
+from utils.records import Member
+from utils.schema import schema_registry
+
+QUERY = "POST /v1/databases/{database_id}/query"
+
+
+def test_limit_controls_page_size_and_stops_early():
+    dataset = Dataset(members=30, events=1)
+    server = FakeNotionServer(dataset, page_size=10)
+    base_url = server.start_in_thread()
+
+    async def scenario():
+        notion = create_notion_client("secret_test", base_url=base_url)
+        query = notion.databases.query
+
+        pages = [page async for page in paginate(query, database_id=dataset.member_db_id)]
+        assert len(pages) == 30 and server.requests[QUERY] == 3
+
+        # 남은 수만큼만 요청 (10개, 5개)
+        server.reset_counters()
+        pages = [page async for page in paginate(query, 15, database_id=dataset.member_db_id)]
+        assert len(pages) == 15 and server.requests[QUERY] == 2
+
+        # 소비하는 쪽이 멈추면 다음 페이지를 요청하지 않음
+        server.reset_counters()
+        async for page in paginate(query, database_id=dataset.member_db_id):
+            break
+        assert server.requests[QUERY] == 1
+
+        # 한 명만 찾는 조회는 요청 한 번
+        server.reset_counters()
+        result = await search_members_in_database(notion, dataset.member_db_id,
+                                                  [{'discord_id': dataset.discord_ids[3]}], limit=1)
+        assert [member.id for member in result[0]] == [dataset.member_ids[3]]
+        assert server.requests[QUERY] == 1
+        await notion.aclose()
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        server.stop_thread()
+
+
+def test_projection_requests_only_named_properties():
+    dataset = Dataset(members=5, events=1)
+    server = FakeNotionServer(dataset)
+    base_url = server.start_in_thread()
+
+    async def scenario():
+        notion = create_notion_client("secret_test", base_url=base_url)
+        schema_registry.invalidate()
+        conditions = [{'discord_id': dataset.discord_ids[0]}]
+
+        full = await search_members_in_database(notion, dataset.member_db_id, conditions)
+        listed = await search_members_in_database(notion, dataset.member_db_id, conditions, properties=MEMBER_LIST_PROPERTIES)
+        lookup = await search_members_in_database(notion, dataset.member_db_id, conditions, properties=MEMBER_LOOKUP_PROPERTIES)
+        # 스키마에 없는 이름이 있으면 전체 속성을 요청
+        unknown = await search_members_in_database(notion, dataset.member_db_id, conditions, properties=("없는 속성",))
+
+        # 가져오지 않은 속성은 레코드에서 None
+        present = lambda result: {name for name, slot in Member.FIELDS.items() if getattr(result[0][0], slot) is not None}
+        assert present(full) == set(dataset.databases[dataset.member_db_id]["schema"])
+        assert present(listed) == set(MEMBER_LIST_PROPERTIES)
+        assert present(lookup) == set(MEMBER_LOOKUP_PROPERTIES)
+        assert lookup[0][0].id == dataset.member_ids[0]
+        assert present(unknown) == present(full)
+        await notion.aclose()
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        server.stop_thread()
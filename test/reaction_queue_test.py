@@ -0,0 +1,69 @@
+import asyncio
+import os, sys
+from types import SimpleNamespace
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+
+from utils.reaction_queue import ReactionQueue, ADD, REMOVE
+
+
+def reaction(user_id: int, event_type: str, message_id: int = 1, emoji: str = "✅"):
+    return SimpleNamespace(message_id=message_id, user_id=user_id, emoji=emoji, event_type=event_type)
+
+
+def test_partitions_keep_order_and_collapse_pending_pairs():
+    processed = []
+    running = set()
+
+    async def handler(event):
+        key = (event.message_id, event.user_id)
+        assert key not in running  # 같은 사용자의 이벤트는 동시에 처리되지 않음
+        running.add(key)
+        await asyncio.sleep(0.01)
+        running.discard(key)
+        processed.append((event.user_id, event.event_type))
+
+    async def scenario():
+        queue = ReactionQueue(handler, workers=4)
+        outcomes = [await queue.put(reaction(1, ADD))]
+        await asyncio.sleep(0)  # 워커가 1의 추가를 꺼내 처리를 시작함
+        outcomes += [
+            await queue.put(reaction(2, ADD)),
+            await queue.put(reaction(2, ADD)),      # 대기 중인 같은 이벤트와 중복
+            await queue.put(reaction(1, REMOVE)),   # 1의 추가는 이미 처리 중이므로 상쇄하지 않음
+            await queue.put(reaction(1, ADD)),      # 대기 중인 제거와 상쇄
+            await queue.put(reaction(3, ADD)),
+            await queue.put(reaction(3, REMOVE)),   # 대기 중인 추가와 상쇄
+        ]
+        await queue.join()
+        queue.stop()
+        return outcomes
+
+    outcomes = asyncio.run(scenario())
+    assert outcomes == ["queued", "queued", "duplicate", "queued", "collapsed", "queued", "collapsed"]
+    assert sorted(processed) == [(1, ADD), (2, ADD)]
+
+
+def test_full_queue_applies_backpressure():
+    async def scenario():
+        gate = asyncio.Event()
+        handled = []
+
+        async def handler(event):
+            await gate.wait()
+            handled.append(event.user_id)
+
+        queue = ReactionQueue(handler, workers=1, maxsize=2)
+        await queue.put(reaction(1, ADD))
+        await queue.put(reaction(2, ADD))
+        blocked = asyncio.ensure_future(queue.put(reaction(3, ADD)))
+        await asyncio.sleep(0.01)
+        assert not blocked.done() and queue.depth == 2
+
+        gate.set()
+        assert await blocked == "queued"
+        await queue.join()
+        queue.stop()
+        return handled
+
+    assert asyncio.run(scenario()) == [1, 2, 3]
@@ -0,0 +1,59 @@
+import asyncio
+from notion_client import AsyncClient
+from dotenv import load_dotenv
+import os, sys
+import json
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+
+from utils.condition import Condition
+
+FIXTURE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "notion_filter_fixtures.json")
+
+
+async def query_all(notion: AsyncClient, database_id: str, **kwargs):
+    results, start_cursor, has_more = [], None, True
+    while has_more:
+        response = await notion.databases.query(database_id=database_id, start_cursor=start_cursor, **kwargs)
+        results.extend(response["results"])
+        has_more = response.get("has_more", False)
+        start_cursor = response.get("next_cursor")
+    return results
+
+
+async def main():
+    """
+    fixture의 조건들을 실제 Notion API로 다시 질의하여 페이지와 결과 ID를 기록합니다.
+    저장소의 fixture는 손으로 작성한 명세이므로, 이 스크립트로 기록해야 evaluator_test.py가 실제 API와의 비교가 됩니다.
+    """
+    notion = AsyncClient(auth=NOTION_API_KEY)
+    with open(FIXTURE_PATH, encoding="utf-8") as f:
+        fixtures = json.load(f)
+
+    database_ids = {"members": NOTION_MEMBER_DB_ID, "schedules": NOTION_SCHEDULE_DB_ID}
+    for name, database in fixtures["databases"].items():
+        metadata = await notion.databases.retrieve(database_id=database_ids[name])
+        database.update(id=metadata["id"], properties=metadata["properties"],
+                        pages=await query_all(notion, database_ids[name]))
+
+    for query in fixtures["queries"]:
+        database = fixtures["databases"][query["database"]]
+        filters = Condition(database["properties"])(query["conditions"]).get_filters()
+        kwargs = {"filter": filters}
+        if query["sorts"]:
+            kwargs["sorts"] = query["sorts"]
+        query["result_ids"] = [page["id"] for page in await query_all(notion, database["id"], **kwargs)]
+        print(f"{query['name']}: {len(query['result_ids'])}개")
+
+    with open(FIXTURE_PATH, "w", encoding="utf-8") as f:
+        json.dump(fixtures, f, ensure_ascii=False, indent=2)
+    await notion.aclose()
+
+
+if __name__ == "__main__":
+    load_dotenv()
+    NOTION_API_KEY = os.getenv("NOTION_API_KEY")
+    NOTION_MEMBER_DB_ID = os.getenv("NOTION_MEMBER_DB_ID")
+    NOTION_SCHEDULE_DB_ID = os.getenv("NOTION_SCHEDULE_DB_ID")
+
+    asyncio.run(main())
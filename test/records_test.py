@@ -0,0 +1,55 @@
+import json
+import os, sys
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+
+from fake_notion_server import Dataset
+from utils.evaluator import query_pages
+from utils.records import Member, Schedule, ROLES, TIER
+
+
+def test_pages_are_decoded_once_into_shared_values():
+    dataset = Dataset(members=20, events=3, registrants=5)
+    # 실제 응답처럼 페이지마다 따로 만들어진 문자열로 해석
+    members = [Member.from_page(json.loads(json.dumps(dataset.pages[page_id]))) for page_id in dataset.member_ids]
+
+    assert members[0].id == dataset.member_ids[0] and members[0].name == dataset.names[0]
+    assert members[0].discord_id == dataset.discord_ids[0] and members[0].email is None
+    assert all(isinstance(role, ROLES) for member in members for role in member.roles)
+    juniors = [member.tier_swe[0] for member in members if member.tier_swe == (TIER.JUNIOR,)]
+    assert juniors and all(tier is TIER.JUNIOR for tier in juniors)
+
+    event = dataset.pages[dataset.event_ids[0]]
+    schedule = Schedule.from_page(event)
+    assert schedule.date == event["properties"]["날짜"]["date"]["start"]
+    assert schedule.date_end == event["properties"]["날짜"]["date"]["end"]
+    assert schedule.registrants == tuple(relation["id"] for relation in event["properties"]["등록자"]["relation"])
+    assert schedule.absentees == ()
+
+    # 레코드도 페이지 딕셔너리와 같은 필터/정렬로 조회됨
+    filter = {"and": [{"property": "활동 분야", "multi_select": {"contains": ROLES.SWE.value}},
+                      {"property": "티어 (SWE)", "multi_select": {"is_not_empty": True}}]}
+    sorts = [{"property": "이름", "direction": "descending"}]
+    pages = [dataset.pages[page_id] for page_id in dataset.member_ids]
+    assert [member.id for member in query_pages(members, filter, sorts)] == \
+           [page["id"] for page in query_pages(pages, filter, sorts)]
+
+
+def test_records_use_a_fraction_of_raw_page_memory():
+    dataset = Dataset(members=300, events=1)
+    payload = json.dumps([dataset.pages[page_id] for page_id in dataset.member_ids])
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        pages = json.loads(payload)
+        raw = tracemalloc.get_traced_memory()[0] - before
+        records = [Member.from_page(page) for page in pages]
+        del pages
+        decoded = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    assert len(records) == 300
+    assert decoded * 4 < raw
@@ -0,0 +1,144 @@
+import asyncio
+import os, sys
+import sqlite3
+
+import pytest
+from notion_client import APIResponseError
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+
+from fake_notion_server import Dataset, FakeNotionServer
+from utils.backend import LeaseTimeout, MemoryBackend
+from utils.notion import create_notion_client
+from utils.relation_writer import RelationWriter
+
+
+def test_lease_timeout_fails_pending_changes():
+    backend = MemoryBackend()
+    backend.try_acquire("relation:page:출석자", "other-process", ttl=60)
+    writer = RelationWriter(window=0, backend=backend, lease_ttl=0.05)
+
+    async def run():
+        with pytest.raises(LeaseTimeout):
+            await asyncio.wait_for(writer.add(None, "page", "출석자", "member"), 1)
+        return writer._pending, writer._timers
+
+    assert asyncio.run(run()) == ({}, {})
+
+
+def run_with_server(scenario):
+    dataset = Dataset(members=10, events=1, registrants=3)
+    server = FakeNotionServer(dataset)
+    base_url = server.start_in_thread()
+
+    async def run():
+        notion = create_notion_client("secret_test", base_url=base_url)
+        try:
+            return await scenario(notion, dataset, server)
+        finally:
+            await notion.aclose()
+
+    try:
+        return asyncio.run(run())
+    finally:
+        server.stop_thread()
+
+
+def registrants(dataset, event_id):
+    return [relation["id"] for relation in dataset.pages[event_id]["properties"]["등록자"]["relation"]]
+
+
+def outsiders(dataset, event_id):
+    return [page_id for page_id in dataset.member_ids if page_id not in registrants(dataset, event_id)]
+
+
+def test_changes_in_one_window_are_applied_in_order_with_one_update():
+    async def scenario(notion, dataset, server):
+        writer = RelationWriter(window=0.05)
+        event_id = dataset.event_ids[0]
+        first, second, third = outsiders(dataset, event_id)[:3]
+        before = registrants(dataset, event_id)
+        existing = before[0]
+
+        results = await asyncio.gather(
+            writer.add(notion, event_id, "등록자", first),
+            writer.remove(notion, event_id, "등록자", first),   # 같은 창에서 취소
+            writer.add(notion, event_id, "등록자", second),
+            writer.add(notion, event_id, "등록자", second),     # 중복
+            writer.remove(notion, event_id, "등록자", existing),
+            writer.remove(notion, event_id, "등록자", third),   # 원래 없던 페이지
+        )
+        assert results == [True, True, True, False, True, False]
+        assert registrants(dataset, event_id) == [page_id for page_id in before if page_id != existing] + [second]
+        assert server.requests["PATCH /v1/pages/{page_id}"] == 1
+
+        # 다음 창은 메모리 목록을 이어서 사용하고 (읽기 없음) 변경이 없으면 쓰지 않음
+        server.reset_counters()
+        assert await writer.add(notion, event_id, "등록자", second) is False
+        assert server.requests == {}
+
+    run_with_server(scenario)
+
+
+def test_failed_update_fails_callers_and_drops_cached_list():
+    async def scenario(notion, dataset, server):
+        writer = RelationWriter(window=0)
+        event_id = dataset.event_ids[0]
+        first, second = outsiders(dataset, event_id)[:2]
+        await writer.add(notion, event_id, "등록자", first)
+        assert (event_id, "등록자") in writer._relations
+
+        with pytest.raises(KeyError):
+            await writer.add(notion, event_id, "없는 속성", first)
+        # 메모리 목록으로 바로 쓰다가 실패하면 목록을 버림
+        del dataset.pages[event_id]
+        with pytest.raises(APIResponseError):
+            await writer.add(notion, event_id, "등록자", second)
+        assert writer._relations == {} and writer._pending == {}
+
+    run_with_server(scenario)
+
+
+def test_flush_all_applies_pending_changes_without_waiting_for_the_window():
+    async def scenario(notion, dataset, server):
+        writer = RelationWriter(window=60)
+        event_id = dataset.event_ids[0]
+        member_id = outsiders(dataset, event_id)[0]
+        future = writer.update(notion, event_id, "등록자", add=[member_id])
+
+        await asyncio.wait_for(writer.flush_all(notion), 5)
+        assert future.result() is True
+        assert member_id in registrants(dataset, event_id)
+        assert writer._timers == {} and writer._pending == {}
+
+    run_with_server(scenario)
+
+
+class UnwritableBackend(MemoryBackend):
+    """
+    다른 프로세스가 잠그고 있어 값을 쓰지 못하는 공유 저장소.
+    """
+
+    def set(self, key, value, ttl=None):
+        raise sqlite3.OperationalError("database is locked")
+
+
+def test_version_write_failure_does_not_fail_saved_changes():
+    async def scenario(notion, dataset, server):
+        writer = RelationWriter(window=0, backend=UnwritableBackend())
+        event_id = dataset.event_ids[0]
+        first, second = outsiders(dataset, event_id)[:2]
+
+        # Notion에는 반영되었으므로 호출자에게는 성공으로 알림
+        assert await writer.add(notion, event_id, "등록자", first) is True
+        assert first in registrants(dataset, event_id)
+        assert writer._relations == {}
+
+        # 메모리 목록을 신뢰하지 않고 다시 읽은 뒤 씀
+        server.reset_counters()
+        assert await writer.add(notion, event_id, "등록자", second) is True
+        assert server.requests["GET /v1/pages/{page_id}"] == 1
+        assert registrants(dataset, event_id)[-2:] == [first, second]
+
+    run_with_server(scenario)
@@ -0,0 +1,90 @@
+import asyncio
+import os, sys
+import time
+
+import httpx
+import pytest
+from notion_client.errors import APIResponseError, APIErrorCode, HTTPResponseError
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+
+from utils.scheduler import NotionScheduler, Priority
+
+
+class FakeEndpoint:
+    """
+    정해진 오류를 차례로 낸 뒤 성공하는 가짜 Notion 메서드.
+    """
+
+    def __init__(self, *errors: Exception):
+        self.errors = list(errors)
+        self.calls = []
+
+    async def __call__(self, **kwargs):
+        self.calls.append(time.monotonic())
+        if self.errors:
+            raise self.errors.pop(0)
+        return kwargs
+
+
+def gateway_error(status: int) -> HTTPResponseError:
+    # JSON code가 없는 게이트웨이 HTML 응답 (notion-client가 HTTPResponseError로 변환)
+    return HTTPResponseError(httpx.Response(status, text="<html>Bad Gateway</html>"))
+
+
+def rate_limited(retry_after: str) -> APIResponseError:
+    response = httpx.Response(429, headers={"retry-after": retry_after}, json={"code": "rate_limited"})
+    return APIResponseError(response, "rate limited", APIErrorCode.RateLimited)
+
+
+def test_lanes_are_served_in_priority_order():
+    scheduler = NotionScheduler(rate=20, burst=1)
+    order = []
+
+    async def request(priority: Priority):
+        async def endpoint():
+            order.append(priority)
+        await scheduler.request(endpoint, priority=priority)
+
+    async def run():
+        scheduler.bucket.tokens = 0
+        await asyncio.gather(*[request(priority) for priority in reversed(Priority)])
+
+    asyncio.run(run())
+    assert order == [Priority.INTERACTIVE, Priority.REACTION, Priority.BACKGROUND]
+
+
+def test_gateway_errors_are_retried_with_backoff():
+    scheduler = NotionScheduler(rate=1000, burst=1000, base_backoff=0.02)
+    endpoint = FakeEndpoint(gateway_error(502), gateway_error(504))
+
+    assert asyncio.run(scheduler.request(endpoint, page_id="a")) == {"page_id": "a"}
+    assert len(endpoint.calls) == 3
+    # 재시도마다 기다리는 시간이 두 배로 늘어남
+    assert endpoint.calls[1] - endpoint.calls[0] >= 0.02
+    assert endpoint.calls[2] - endpoint.calls[1] >= 0.04
+
+    failing = FakeEndpoint(gateway_error(400))
+    with pytest.raises(HTTPResponseError):
+        asyncio.run(scheduler.request(failing))
+    assert len(failing.calls) == 1
+
+
+def test_retry_after_pauses_every_lane():
+    scheduler = NotionScheduler(rate=1000, burst=1000)
+    limited = FakeEndpoint(rate_limited("0.2"))
+    other = FakeEndpoint()
+
+    async def run():
+        started = time.monotonic()
+        first = asyncio.create_task(scheduler.request(limited, priority=Priority.BACKGROUND))
+        while not limited.calls:
+            await asyncio.sleep(0)
+        await asyncio.sleep(0.01)
+        await scheduler.request(other, priority=Priority.INTERACTIVE)
+        await first
+        return started
+
+    started = asyncio.run(run())
+    assert other.calls[0] - started >= 0.2
+    assert limited.calls[1] - limited.calls[0] >= 0.2
@@ -0,0 +1,57 @@
+import os, sys
+import json
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+
+from utils.search_index import NameIndex, decompose, choseong
+from utils.mirror import DatabaseMirror
+
+FIXTURE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "notion_filter_fixtures.json")
+
+
+def make_index() -> NameIndex:
+    index = NameIndex()
+    for item_id, name in [("1", "전성후"), ("2", "김지민"), ("3", "박지민"), ("4", "지민"), ("5", "Kim Minsu"), ("6", "정승훈")]:
+        index.add(item_id, name)
+    return index
+
+
+def test_decompose_and_choseong():
+    assert decompose("전성후") == "ㅈㅓㄴㅅㅓㅇㅎㅜ"
+    assert decompose("닭") == "ㄷㅏㄹㄱ"
+    assert decompose("ㅘ") == "ㅗㅏ"
+    assert choseong("전성후 A") == "ㅈㅅㅎ A"
+
+
+def test_ranked_search():
+    index = make_index()
+    # 완전 일치 > 부분 문자열 (같은 종류끼리는 위치, 길이 순)
+    assert [item_id for item_id, _ in index.search("지민")] == ["4", "2", "3"]
+    # 음절 일부, 초성, 대소문자/공백 무시
+    assert [item_id for item_id, _ in index.search("성ㅎ")] == ["1"]
+    assert [item_id for item_id, _ in index.search("전서")] == ["1"]
+    assert [item_id for item_id, _ in index.search("ㅈㅅㅎ")] == ["1", "6"]
+    assert [item_id for item_id, _ in index.search("kim min")] == ["5"]
+    assert index.search("지민", k=1) == [("4", (0, 0, 2))]
+    assert index.search("없는 이름") == []
+
+
+def test_incremental_update():
+    index = make_index()
+    index.add("4", "이지은")
+    assert "4" not in [item_id for item_id, _ in index.search("지민")]
+    assert [item_id for item_id, _ in index.search("ㅇㅈㅇ")] == ["4"]
+    index.remove("4")
+    assert index.search("이지은") == [] and len(index) == 5
+
+
+def test_mirror_search_with_filters_and_sorts():
+    with open(FIXTURE_PATH, encoding="utf-8") as f:
+        fixtures = json.load(f)
+    mirror = DatabaseMirror("schedules")
+    mirror.apply(fixtures["databases"]["schedules"]["pages"])
+
+    names = lambda pages: [page.name for page in pages]
+    assert names(mirror.search("ㅅㅁ")) == ["Fetch 세미나"]
+    assert names(mirror.search("세", sorts=[{"property": "날짜", "direction": "descending"}])) == ["정기 세션", "Fetch 세미나"]
+    assert names(mirror.search("fetch", {"property": "태그", "multi_select": {"contains": "스터디"}})) == ["fetch 스터디"]
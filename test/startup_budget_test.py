@@ -0,0 +1,65 @@
+import os, sys
+import json
+import subprocess
+import tempfile
+
+ROOT = os.path.dirname(os.path.abspath(os.path.dirname(__file__)))
+
+# import 시간 예산 (밀리초). 느린 CI에서는 환경 변수로 조정
+UTILS_BUDGET_MS = float(os.getenv("STARTUP_UTILS_BUDGET_MS", "300"))
+BOT_BUDGET_MS = float(os.getenv("STARTUP_BOT_BUDGET_MS", "1500"))
+
+# 시작 시점에 불러오면 안 되는 무거운 의존성 (첫 사용 시점에 불러옴)
+LAZY_MODULES = ["dateparser", "notion_client", "httpx"]
+
+
+def _import_in_subprocess(statement: str) -> dict:
+    """
+    새 인터프리터에서 statement를 실행하여 import 시간과 불러온 무거운 모듈 목록을 반환합니다.
+    """
+    code = (
+        "import sys, time, json\n"
+        "start = time.perf_counter()\n"
+        f"{statement}\n"
+        "elapsed = (time.perf_counter() - start) * 1000\n"
+        f"print(json.dumps({{'ms': elapsed, 'loaded': [m for m in {LAZY_MODULES!r} if m in sys.modules]}}))\n"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        # bot.py는 import 시점에 저장소 파일을 열므로 임시 디렉터리를 사용 (STATE_DB_PATH는 기본값이 비어 있음)
+        env = dict(os.environ, ATTENDANCE_DB_PATH=os.path.join(tmp, "attendance.db"),
+                   MIRROR_DB_PATH=os.path.join(tmp, "mirror.db"))
+        output = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env,
+                                capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def test_utils_import_is_lazy_and_within_budget():
+    result = _import_in_subprocess(
+        "import utils.notion, utils.condition, utils.mirror, utils.attendance, utils.store, utils.relation_writer"
+    )
+    assert result["loaded"] == []
+    assert result["ms"] < UTILS_BUDGET_MS, f"utils import took {result['ms']:.1f} ms"
+
+
+def test_bot_import_is_lazy_and_within_budget():
+    result = _import_in_subprocess("import bot")
+    assert result["loaded"] == []
+    assert result["ms"] < BOT_BUDGET_MS, f"bot import took {result['ms']:.1f} ms"
+
+
+def test_startup_profiler_records_imports():
+    sys.path.insert(0, ROOT)
+    from utils.profiling import StartupProfiler
+
+    profiler = StartupProfiler(enabled=True)
+    profiler.install()
+    try:
+        import xml.dom.minidom  # 테스트 환경에서 아직 불러오지 않은 표준 라이브러리 모듈
+    finally:
+        profiler.uninstall()
+    profiler.mark("imports")
+
+    assert "xml.dom.minidom" in profiler.imports
+    total, self_time = profiler.imports["xml.dom.minidom"]
+    assert 0 <= self_time <= total
+    assert "imports" in profiler.report()
@@ -0,0 +1,69 @@
+import asyncio
+import os, sys
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+
+from utils.store import AttendanceStore
+
+
+def rows(store: AttendanceStore) -> int:
+    return store.conn.execute("SELECT COUNT(*) FROM notices").fetchone()[0]
+
+
+def test_expired_notices_are_dropped(monkeypatch, tmp_path):
+    store = AttendanceStore(str(tmp_path / "attendance.db"))
+    now = time.time()
+    store.add(1, "seminar", "출석", "✅", ttl=60, duration=30)
+    store.add(2, "camp", "등록", "✅", ttl=120)
+    store.add(3, "study", "등록", "✅", ttl=600)
+
+    # 마감이 지난 출석 공지는 반응을 받지 않지만, 만료 전까지는 마감 처리용으로 남음
+    monkeypatch.setattr(time, "time", lambda: now + 45)
+    assert store.active(1) is None and store.get(1)["closes_at"] <= time.time()
+    assert [entry["message_id"] for entry in store.open_windows()] == [1]
+
+    # 조회 시 만료된 항목은 지워짐
+    monkeypatch.setattr(time, "time", lambda: now + 90)
+    assert 1 not in store and len(store) == 2
+
+    # 다시 조회되지 않는 항목은 expire로 메모리와 SQLite에서 함께 지워짐
+    monkeypatch.setattr(time, "time", lambda: now + 300)
+    assert store.expire() == 1
+    assert len(store) == 1 and rows(store) == 1
+    assert store.by_page("camp") == [] and store.by_page("study")[0]["message_id"] == 3
+    store.close()
+
+
+def test_load_restores_open_windows_after_restart(tmp_path):
+    path = str(tmp_path / "attendance.db")
+    store = AttendanceStore(path)
+    store.add(1, "seminar", "출석", "✅", ttl=3600, channel_id=10, author_id=20, duration=600)
+    store.add(2, "camp", "등록", "✅", ttl=3600)
+    store.add(3, "old", "등록", "✅", ttl=-1)
+    store.close()
+
+    restarted = AttendanceStore(path)
+    # 만료된 항목을 지우고 남은 항목만 불러옴
+    assert restarted.load() == 2 and rows(restarted) == 2
+    windows = restarted.open_windows()
+    assert [(entry["message_id"], entry["channel_id"], entry["author_id"]) for entry in windows] == [(1, 10, 20)]
+    assert windows[0]["closes_at"] > time.time()
+    assert restarted.active(2)["notion_page_id"] == "camp"
+    restarted.close()
+
+
+def test_expired_notices_are_removed_periodically(tmp_path):
+    store = AttendanceStore(str(tmp_path / "attendance.db"))
+
+    async def run():
+        store.add(1, "seminar", "등록", "✅", ttl=0.02)
+        store.add(2, "camp", "등록", "✅", ttl=60)
+        store.start(0.01)
+        await asyncio.sleep(0.1)
+        store.stop()
+
+    asyncio.run(run())
+    # 조회하지 않아도 만료된 공지가 지워짐
+    assert len(store) == 1 and rows(store) == 1 and 2 in store
+    store.close()
@@ -0,0 +1,66 @@
+import asyncio
+import os, sys
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+
+from utils.tracing import Tracer
+
+
+def test_spans_follow_gather_and_slow_traces_are_logged(tmp_path):
+    log_path = tmp_path / "slow.log"
+    tracer = Tracer(threshold=0.05, log_path=str(log_path))
+
+    @tracer.traced()
+    async def fetch(page_id: str):
+        with tracer.span("notion pages.retrieve", page_id=page_id):
+            await asyncio.sleep(0.03)
+
+    async def command():
+        with tracer.trace("!공지생성") as root:
+            await asyncio.gather(fetch("a"), fetch("b"))
+            with tracer.span("attendance_window", idle=True):
+                await asyncio.sleep(0.1)
+        return root
+
+    root = asyncio.run(command())
+    assert [child.name for child in root.children] == ["fetch", "fetch", "attendance_window"]
+    assert root.children[0].children[0].attributes == {"page_id": "a"}
+    # 대기 구간을 빼면 기준 시간보다 빠르므로 기록되지 않음
+    assert not log_path.exists() or log_path.read_text(encoding="utf-8") == ""
+
+    tracer.configure(threshold=0.01)
+    asyncio.run(command())
+    text = log_path.read_text(encoding="utf-8")
+    assert "slow !공지생성" in text
+    assert "notion pages.retrieve page_id=b" in text
+
+
+def test_span_outside_trace_is_not_recorded():
+    tracer = Tracer()
+
+    async def work():
+        with tracer.span("orphan") as span:
+            return span
+
+    assert asyncio.run(work()) is None
+    assert Tracer.current() is None
+
+
+def test_long_lived_tasks_do_not_grow_finished_spans():
+    tracer = Tracer(threshold=0)
+
+    async def poll(detach: bool):
+        if detach:
+            tracer.detach()
+        for _ in range(5):
+            with tracer.span("notion databases.query"):
+                await asyncio.sleep(0)
+
+    async def on_ready():
+        with tracer.trace("on_ready") as root:
+            tasks = [asyncio.create_task(poll(detach)) for detach in (True, False)]
+        await asyncio.gather(*tasks)
+        return root
+
+    # 떼어낸 태스크는 아무 것도 붙이지 않고, 떼어내지 않은 태스크도 닫힌 구간에는 붙이지 않음
+    assert asyncio.run(on_ready()).children == []
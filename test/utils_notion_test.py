@@ -9,16 +9,16 @@ from typing import List, Dict, Any, Union, Optional
 sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
 
 from utils.condition import Condition
-from utils.notion import search_schedules_in_database, page_ids_to_titles, extract_property_from_page_id, extract_relation_ids
+from utils.notion import search_schedules_in_database, page_ids_to_titles, extract_properties_from_page_id, extract_relation_ids
 
 
 async def main():
     notion = AsyncClient(auth=NOTION_API_KEY)
 
     res = await page_ids_to_titles(notion, page_ids="14be0c6a-78da-4a46-a839-9902a4170c22")
-    prop = await extract_property_from_page_id(notion, page_id="14be0c6a-78da-4a46-a839-9902a4170c22", property_id="NNKg")
+    prop = await extract_properties_from_page_id(notion, page_id="14be0c6a-78da-4a46-a839-9902a4170c22", property_ids="NNKg")
     pprint(res)
-    ids =  extract_relation_ids(prop)
+    ids =  extract_relation_ids(prop["NNKg"])
     titles = await page_ids_to_titles(notion, ids)
     print(titles)
     
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, List, Dict, NamedTuple
+
+if TYPE_CHECKING:
+    from notion_client import AsyncClient  # 타입 표기용 (실제 import는 클라이언트 생성 시점)
+
+from utils.notion import retrieve_page, extract_properties_from_page_id, extract_relation_ids, page_ids_to_titles
+from utils.relation_writer import relation_writer
+from utils.tracing import tracer
+
+REGISTRANT_PROPERTY = "등록자"
+ATTENDEE_PROPERTY = "출석자 (인정 결석 포함)"
+ABSENTEE_PROPERTY = "결석자"
+
+
+class AttendanceResult(NamedTuple):
+    """
+    출석 확인 결과. 각 목록은 페이지 ID 리스트이며, 이름은 `names`에서 찾습니다.
+    """
+    registrants: List[str]
+    attendees: List[str]
+    absentees: List[str]       # 등록했지만 출석하지 않은 사람
+    new_absentees: List[str]   # 이번에 결석자 목록에 새로 추가된 사람
+    names: Dict[str, str]      # 페이지 ID -> 이름
+
+    def names_of(self, page_ids: List[str]) -> List[str]:
+        return [self.names.get(page_id, '') for page_id in page_ids]
+
+
+def _unique(ids: List[str]) -> List[str]:
+    # 순서를 유지하면서 중복 제거
+    return list(dict.fromkeys(ids))
+
+
+@tracer.traced()
+async def reconcile_absentees(notion: AsyncClient, page_id: str, write: bool = True) -> AttendanceResult:
+    """
+    등록자와 출석자 목록을 비교하여 결석자를 계산하고, 새로운 결석자만 결석자 목록에 추가하는 함수.
+    세 relation을 한 번에 가져오고, 차집합은 set으로 선형 시간에 계산하며, 이름은 전체 id의 합집합으로 한 번만 조회합니다.
+
+    :param notion: Notion 비동기 API 클라이언트
+    :param page_id: 노션 페이지 ID (행사 정보가 포함된 페이지)
+    :param write: False이면 결석자 목록을 업데이트하지 않고 결과만 계산
+    :return: AttendanceResult
+    """
+    page_data = await retrieve_page(notion, page_id)
+    properties = page_data['properties']
+    property_ids = [properties.get(name, {}).get('id', "")
+                    for name in (REGISTRANT_PROPERTY, ATTENDEE_PROPERTY, ABSENTEE_PROPERTY)]
+
+    # relation은 pages.retrieve에서 25개까지만 포함되므로 속성 API로 모두 가져옴
+    res = await extract_properties_from_page_id(notion, page_id=page_id, property_ids=[p for p in property_ids if p])
+    registrants, attendees, existing = [
+        _unique(extract_relation_ids(res[p])) if p else [] for p in property_ids
+    ]
+
+    attendee_set = set(attendees)
+    existing_set = set(existing)
+    absentees = [r_id for r_id in registrants if r_id not in attendee_set]
+    new_absentees = [a_id for a_id in absentees if a_id not in existing_set]
+
+    union = _unique(registrants + attendees + absentees)
+    names = dict(zip(union, await page_ids_to_titles(notion, union)))
+
+    if write and new_absentees:
+        await relation_writer.update(notion, page_id, ABSENTEE_PROPERTY, add=new_absentees)
+
+    return AttendanceResult(registrants, attendees, absentees, new_absentees, names)
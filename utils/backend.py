@@ -0,0 +1,282 @@
+import asyncio
+import json
+import os
+import socket
+import sqlite3
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+from utils.metrics import metrics
+
+# 이 프로세스를 구분하는 이름 (lease 소유자)
+PROCESS_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+
+class LeaseTimeout(Exception):
+    """
+    기다리는 시간 안에 lease를 얻지 못했을 때 발생하는 예외.
+    """
+
+
+class StateBackend:
+    """
+    여러 봇 프로세스(샤드, 복제본)가 함께 쓰는 상태 저장소의 기본 클래스.
+    만료 시간이 있는 키-값 저장과, 한 번에 한 프로세스만 가질 수 있는 이름 있는 lease를 제공합니다.
+    값은 JSON으로 직렬화할 수 있어야 합니다.
+    """
+
+    def get(self, key: str, default: Any = None) -> Any:
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        """
+        값을 저장하는 함수. 공유 저장소는 최선 노력(best-effort)으로 쓰므로 실패해도 예외 대신 False를 반환합니다.
+
+        :return: 저장했는지 여부
+        """
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def try_acquire(self, name: str, owner: str, ttl: float) -> bool:
+        """
+        lease를 얻거나(비어 있거나 만료된 경우) 이미 가진 lease를 연장하는 함수.
+
+        :param name: lease 이름 (예: 'relation:<페이지 ID>:<속성>')
+        :param owner: 소유자 이름
+        :param ttl: lease가 유지되는 시간 (초, 이 시간 안에 연장하거나 놓아야 함)
+        :return: lease를 가졌는지 여부
+        """
+        raise NotImplementedError
+
+    def release(self, name: str, owner: str) -> None:
+        raise NotImplementedError
+
+    def holder(self, name: str) -> Optional[str]:
+        """
+        lease를 가진 소유자를 반환하는 함수. 없거나 만료되었으면 None입니다.
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+    @asynccontextmanager
+    async def lease(self, name: str, ttl: float = 30.0, wait: Optional[float] = None,
+                    owner: str = PROCESS_ID, poll: float = 0.1) -> AsyncIterator[bool]:
+        """
+        lease를 가진 동안만 실행되는 구간을 만드는 컨텍스트 매니저. 구간이 길어지면 ttl의 1/3마다 lease를 연장합니다.
+        lease는 프로세스 단위이므로, 같은 프로세스 안의 동시 실행은 호출하는 쪽에서 asyncio.Lock 등으로 막아야 합니다.
+
+        :param name: lease 이름
+        :param ttl: lease가 유지되는 시간 (초, 프로세스가 죽으면 이 시간 뒤에 다른 프로세스가 가져감)
+        :param wait: 다른 프로세스가 가진 경우 기다릴 최대 시간 (초, None이면 무한히, 0이면 기다리지 않음)
+        :param owner: 소유자 이름
+        :param poll: 기다리는 동안 다시 시도하는 간격 (초)
+        :return: lease를 얻었는지 여부 (wait=0에서만 False가 될 수 있음)
+        """
+        started = time.monotonic()
+        while not self.try_acquire(name, owner, ttl):
+            if wait is not None and time.monotonic() - started >= wait:
+                metrics.inc("backend_leases_total", outcome="busy" if wait == 0 else "timeout")
+                if wait == 0:
+                    yield False
+                    return
+                raise LeaseTimeout(name)
+            await asyncio.sleep(poll)
+        metrics.inc("backend_leases_total", outcome="acquired")
+        metrics.observe("backend_lease_wait_seconds", time.monotonic() - started)
+
+        async def renew() -> None:
+            while True:
+                await asyncio.sleep(ttl / 3)
+                if not self.try_acquire(name, owner, ttl):
+                    print(f"Error in StateBackend.lease: '{name}' lease를 연장하지 못했습니다.")
+                    return
+
+        renewer = asyncio.create_task(renew())
+        try:
+            yield True
+        finally:
+            renewer.cancel()
+            self.release(name, owner)
+
+
+class MemoryBackend(StateBackend):
+    """
+    한 프로세스 안에서만 공유되는 상태 저장소. (샤딩하지 않는 기본 실행과 테스트용)
+    """
+
+    def __init__(self):
+        self._values: Dict[str, Tuple[Any, Optional[float]]] = {}
+        self._leases: Dict[str, Tuple[str, float]] = {}
+
+    def get(self, key: str, default: Any = None) -> Any:
+        item = self._values.get(key)
+        if item is None:
+            return default
+        if item[1] is not None and item[1] <= time.time():
+            del self._values[key]
+            return default
+        return item[0]
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        self._values[key] = (value, time.time() + ttl if ttl is not None else None)
+        return True
+
+    def delete(self, key: str) -> None:
+        self._values.pop(key, None)
+
+    def try_acquire(self, name: str, owner: str, ttl: float) -> bool:
+        now = time.time()
+        current = self._leases.get(name)
+        if current is not None and current[0] != owner and current[1] > now:
+            return False
+        self._leases[name] = (owner, now + ttl)
+        return True
+
+    def release(self, name: str, owner: str) -> None:
+        if self._leases.get(name, (None,))[0] == owner:
+            del self._leases[name]
+
+    def holder(self, name: str) -> Optional[str]:
+        current = self._leases.get(name)
+        return current[0] if current is not None and current[1] > time.time() else None
+
+
+class SQLiteBackend(StateBackend):
+    """
+    SQLite 파일을 통해 같은 머신의 여러 프로세스가 공유하는 상태 저장소.
+    WAL 모드로 열어 읽기가 쓰기를 기다리지 않게 하고, lease는 `BEGIN IMMEDIATE` 트랜잭션으로 원자적으로 얻습니다.
+    호출은 이벤트 루프에서 바로 실행되므로 잠금 대기는 아주 짧게 두고, 다른 프로세스가 쓰는 중이면 기다리지 않고
+    실패로 처리합니다. (lease는 비동기로 다시 시도하고, 키-값은 저장/조회하지 못해도 호출자가 메모리 값으로 동작)
+    """
+
+    def __init__(self, path: str = "data/state.db", busy_timeout: float = 0.05):
+        """
+        :param path: SQLite 파일 경로 (모든 프로세스가 같은 경로를 써야 함)
+        :param busy_timeout: 다른 프로세스가 쓰는 중일 때 이벤트 루프를 막고 기다릴 최대 시간 (초)
+        """
+        self.path = path
+        self.conn = connect(path, busy_timeout=busy_timeout)
+        # 트랜잭션은 직접 관리 (lease의 BEGIN IMMEDIATE를 위해 자동 BEGIN을 끔)
+        self.conn.isolation_level = None
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS kv (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                expires_at REAL
+            );
+            CREATE TABLE IF NOT EXISTS leases (
+                name TEXT PRIMARY KEY,
+                owner TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            );
+        """)
+        self.conn.commit()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            row = self.conn.execute("SELECT value, expires_at FROM kv WHERE key = ?", (key,)).fetchone()
+        except sqlite3.OperationalError as e:
+            print(f"Error in SQLiteBackend.get: '{key}' {str(e)}")
+            return default
+        if row is None or (row["expires_at"] is not None and row["expires_at"] <= time.time()):
+            return default
+        return json.loads(row["value"])
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        try:
+            with self.conn:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO kv (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(value, ensure_ascii=False), time.time() + ttl if ttl is not None else None),
+                )
+        except sqlite3.OperationalError as e:
+            # 다른 프로세스가 쓰는 중 (busy_timeout 초과)
+            print(f"Error in SQLiteBackend.set: '{key}' {str(e)}")
+            return False
+        return True
+
+    def delete(self, key: str) -> None:
+        try:
+            with self.conn:
+                self.conn.execute("DELETE FROM kv WHERE key = ?", (key,))
+        except sqlite3.OperationalError as e:
+            print(f"Error in SQLiteBackend.delete: '{key}' {str(e)}")
+
+    def try_acquire(self, name: str, owner: str, ttl: float) -> bool:
+        now = time.time()
+        try:
+            self.conn.execute("BEGIN IMMEDIATE")
+        except sqlite3.OperationalError:
+            # 다른 프로세스가 쓰는 중 (busy_timeout 초과)
+            return False
+        try:
+            row = self.conn.execute("SELECT owner, expires_at FROM leases WHERE name = ?", (name,)).fetchone()
+            if row is not None and row["owner"] != owner and row["expires_at"] > now:
+                self.conn.execute("ROLLBACK")
+                return False
+            self.conn.execute("INSERT OR REPLACE INTO leases (name, owner, expires_at) VALUES (?, ?, ?)",
+                              (name, owner, now + ttl))
+            self.conn.execute("COMMIT")
+            return True
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    def release(self, name: str, owner: str) -> None:
+        try:
+            with self.conn:
+                self.conn.execute("DELETE FROM leases WHERE name = ? AND owner = ?", (name, owner))
+        except sqlite3.OperationalError as e:
+            # 놓지 못한 lease는 ttl이 지나면 다른 프로세스가 가져감
+            print(f"Error in SQLiteBackend.release: '{name}' {str(e)}")
+
+    def holder(self, name: str) -> Optional[str]:
+        row = self.conn.execute("SELECT owner FROM leases WHERE name = ? AND expires_at > ?",
+                                (name, time.time())).fetchone()
+        return row["owner"] if row is not None else None
+
+    def expire(self) -> None:
+        """
+        만료된 키와 lease를 지우는 함수.
+        """
+        now = time.time()
+        with self.conn:
+            self.conn.execute("DELETE FROM kv WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,))
+            self.conn.execute("DELETE FROM leases WHERE expires_at <= ?", (now,))
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+def connect(path: str, busy_timeout: float = 5.0) -> sqlite3.Connection:
+    """
+    여러 프로세스가 함께 쓸 수 있도록 SQLite 파일을 여는 함수. (WAL 모드, 잠금 대기 시간 설정)
+
+    :param path: SQLite 파일 경로 (":memory:"이면 메모리에만 저장)
+    :param busy_timeout: 다른 프로세스가 쓰는 중일 때 기다릴 최대 시간 (초)
+    :return: sqlite3 연결 (row_factory는 sqlite3.Row)
+    """
+    if path != ":memory:" and os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    conn = sqlite3.connect(path, timeout=busy_timeout)
+    conn.row_factory = sqlite3.Row
+    if path != ":memory:":
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+def create_backend(path: Optional[str] = None) -> StateBackend:
+    """
+    경로가 있으면 SQLite 공유 저장소를, 없으면 프로세스 내부 저장소를 만드는 함수.
+    """
+    return SQLiteBackend(path) if path else MemoryBackend()
+
+
+metrics.describe("backend_leases_total", "counter", "lease 요청 결과 수 (acquired, busy, timeout)")
+metrics.describe("backend_lease_wait_seconds", "histogram", "lease를 얻기까지 기다린 시간")
@@ -0,0 +1,99 @@
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, Hashable, Optional, Tuple
+
+if TYPE_CHECKING:
+    from utils.backend import StateBackend
+
+
+class TTLCache:
+    """
+    최대 크기(LRU)와 만료 시간(TTL)이 있는 메모리 캐시.
+    가장 오래 사용되지 않은 항목부터 제거하며, 만료된 항목은 조회 시 제거합니다.
+    공유 저장소(`backend`)가 설정되면 저장한 값을 함께 기록하고, 메모리에 없는 값은 저장소에서 찾습니다. (여러 프로세스 간 공유)
+    공유 저장소는 최선 노력으로만 쓰므로, 다른 프로세스가 잠그고 있어 읽거나 쓰지 못해도 메모리 캐시로 동작합니다.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 600, backend: Optional["StateBackend"] = None,
+                 namespace: str = "cache"):
+        """
+        :param maxsize: 최대 항목 수
+        :param ttl: 항목이 유효한 시간 (초)
+        :param backend: Optional 여러 프로세스가 공유하는 상태 저장소 (값은 JSON으로 직렬화 가능해야 함)
+        :param namespace: 공유 저장소에서 이 캐시의 키 앞에 붙일 이름
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.backend = backend
+        self.namespace = namespace
+        self._data: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        item = self._data.get(key)
+        return item is not None and item[1] > time.monotonic()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        캐시에서 값을 가져오는 함수. 없거나 만료되었으면 default를 반환합니다.
+
+        :param key: 캐시 키
+        :param default: 값이 없을 때 반환할 기본값
+        :return: 캐시된 값 또는 default
+        """
+        item = self._data.get(key)
+        if item is not None and item[1] <= time.monotonic():
+            del self._data[key]
+            item = None
+        if item is None:
+            value = self.backend.get(f"{self.namespace}:{key}") if self.backend is not None else None
+            if value is None:
+                self.misses += 1
+                return default
+            self._put(key, value, self.ttl)
+            self.hits += 1
+            return value
+        self._data.move_to_end(key)
+        self.hits += 1
+        return item[0]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        캐시에 값을 저장하는 함수. 최대 크기를 넘으면 가장 오래 사용되지 않은 항목을 제거합니다.
+
+        :param key: 캐시 키
+        :param value: 저장할 값
+        :param ttl: Optional 이 항목에만 적용할 만료 시간 (초)
+        """
+        ttl = self.ttl if ttl is None else ttl
+        self._put(key, value, ttl)
+        if self.backend is not None:
+            self.backend.set(f"{self.namespace}:{key}", value, ttl)
+
+    def _put(self, key: Hashable, value: Any, ttl: float) -> None:
+        self._data[key] = (value, time.monotonic() + ttl)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        item = self._data.pop(key, None)
+        if self.backend is not None:
+            self.backend.delete(f"{self.namespace}:{key}")
+        return default if item is None else item[0]
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / total if total else 0.0,
+        }
@@ -0,0 +1,68 @@
+import asyncio
+import json
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+from utils.metrics import metrics
+from utils.scheduler import current_priority, scheduler
+
+
+class SingleFlight:
+    """
+    같은 키로 동시에 들어온 요청들이 하나의 실행 결과를 공유하도록 하는 single-flight 그룹.
+    먼저 들어온 요청만 실제로 실행되고, 실행 중에 들어온 요청들은 그 결과를 함께 기다립니다.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.hits = 0    # 진행 중인 요청에 합류한 횟수
+        self.misses = 0  # 새로 실행한 횟수
+
+    @property
+    def inflight(self) -> int:
+        return len(self._inflight)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        키에 해당하는 요청이 진행 중이면 그 결과를 기다리고, 없으면 새로 실행하는 함수.
+
+        :param key: 요청을 구분하는 키
+        :param fn: 실제로 실행할 코루틴 함수
+        :return: 실행 결과 (같은 키의 동시 요청끼리 같은 객체를 공유)
+        """
+        future = self._inflight.get(key)
+        if future is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+            future = asyncio.ensure_future(fn())
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # 한 호출자가 취소되어도 다른 호출자가 기다리는 요청은 취소되지 않도록 보호
+        return await asyncio.shield(future)
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "inflight": self.inflight}
+
+
+# Notion 읽기 요청용 single-flight 그룹
+read_flight = SingleFlight()
+metrics.register_cache("read_coalescing", read_flight.stats)
+
+
+async def coalesced_request(endpoint: Callable[..., Awaitable[Any]], **kwargs: Any) -> Any:
+    """
+    읽기 전용 Notion 요청을 스케줄러로 보내되, 같은 엔드포인트와 인자의 동시 요청은 하나로 합치는 함수.
+    같은 Notion 클라이언트의 요청끼리만 합치며, 공유되는 요청은 처음 호출한 쪽의 우선순위 레인에서 실행되므로
+    레인이 다른 요청끼리도 합치지 않습니다.
+    (명령어가 진행 중인 미러 갱신에 합류해 BACKGROUND 레인에서 기다리지 않도록)
+    결과 객체는 호출자끼리 공유되므로 수정하지 않아야 합니다.
+
+    :param endpoint: 호출할 Notion 클라이언트 메서드 (예: notion.pages.retrieve)
+    :return: Notion API 응답
+    """
+    # 인증이나 base_url이 다른 클라이언트끼리 결과를 공유하지 않도록, 메서드가 속한 클라이언트도 키에 포함
+    owner = getattr(endpoint, "__self__", None)
+    client = getattr(owner, "parent", owner)
+    key = (current_priority.get(), id(client), getattr(endpoint, "__qualname__", repr(endpoint)),
+           json.dumps(kwargs, sort_keys=True, default=str))
+    return await read_flight.do(key, lambda: scheduler.request(endpoint, **kwargs))
@@ -1,8 +1,13 @@
+import asyncio
+import re
 from enum import Enum
-from typing import List, Dict, Any
-from datetime import datetime, timedelta
-import dateparser
-from pprint import pprint
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple, NamedTuple
+from datetime import date, datetime, timedelta
+
+from utils.cache import TTLCache
+from utils.metrics import metrics
+from utils.tracing import tracer
 
 
 # Enum for Filter Types based on Notion data types
@@ -48,142 +53,286 @@ operator_map = {
     "not empty": Operator.IS_NOT_EMPTY
 }
 
-# Supported Date operators map
-date_operator_map = {
-    ">": DateOperator.AFTER,
-    "<": DateOperator.BEFORE,
-    "=": DateOperator.EQUALS,
-    "is empty": DateOperator.IS_EMPTY,
-    "is not empty": DateOperator.IS_NOT_EMPTY,
-    "!=": DateOperator.NOT_EQUALS,
-    "<=": DateOperator.ON_OR_BEFORE,
-    ">=": DateOperator.ON_OR_AFTER,
+# 연산자는 가장 긴 것부터 검사 ('<='가 '<'로, 'not empty'가 'empty'로 잘못 인식되지 않도록)
+_OPERATOR_TOKENS = tuple(sorted(operator_map, key=len, reverse=True))
+
+# 부등호를 제외한 날짜 표현만 남기기 위한 접두어 (긴 것부터 검사)
+_DATE_OPERATOR_PREFIXES = (">=", "<=", "!=", ">", "<", "=")
+
+# 일 단위 상대 표현 -> 오늘로부터의 일 수
+_RELATIVE_DAYS = {
+    "today": 0, "오늘": 0,
+    "yesterday": -1, "어제": -1,
+    "tomorrow": 1, "내일": 1,
 }
 
-# Mapping natural language time expressions to specific date ranges
-def resolve_natural_language_time(expression: str):
-    now = datetime.now()
-
-    if expression == "today":
-        return now.date().isoformat(), now.date().isoformat()
-
-    if expression == "yesterday":
-        yesterday = now - timedelta(days=1)
-        return yesterday.date().isoformat(), yesterday.date().isoformat()
-
-    if expression == "this week":
-        start_of_week = now - timedelta(days=now.weekday())  # Monday of this week
-        end_of_week = start_of_week + timedelta(days=6)  # Sunday of this week
-        return start_of_week.date().isoformat(), end_of_week.date().isoformat()
-
-    if expression == "next week":
-        start_of_next_week = now + timedelta(days=(7 - now.weekday()))
-        end_of_next_week = start_of_next_week + timedelta(days=6)
-        return start_of_next_week.date().isoformat(), end_of_next_week.date().isoformat()
-
-    if expression == "last week":
-        start_of_last_week = now - timedelta(days=(7 + now.weekday()))
-        end_of_last_week = start_of_last_week + timedelta(days=6)
-        return start_of_last_week.date().isoformat(), end_of_last_week.date().isoformat()
-
-    if expression == "this month":
-        start_of_month = now.replace(day=1)
-        next_month = now.replace(day=28) + timedelta(days=4)
-        end_of_month = next_month - timedelta(days=next_month.day)
-        return start_of_month.date().isoformat(), end_of_month.date().isoformat()
-
-    if expression == "last month":
-        start_of_last_month = (now.replace(day=1) - timedelta(days=1)).replace(day=1)
-        end_of_last_month = now.replace(day=1) - timedelta(days=1)
-        return start_of_last_month.date().isoformat(), end_of_last_month.date().isoformat()
-
-    if expression == "next month":
-        next_month = (now.replace(day=28) + timedelta(days=4)).replace(day=1)
-        end_of_next_month = (next_month.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
-        return next_month.date().isoformat(), end_of_next_month.date().isoformat()
+# 주 단위 상대 표현 -> 이번 주로부터의 주 수
+_RELATIVE_WEEKS = {
+    "this week": 0, "이번 주": 0, "이번주": 0, "금주": 0,
+    "next week": 1, "다음 주": 1, "다음주": 1, "차주": 1,
+    "last week": -1, "지난 주": -1, "지난주": -1, "저번 주": -1, "저번주": -1,
+}
+
+# 월 단위 상대 표현 -> 이번 달로부터의 달 수
+_RELATIVE_MONTHS = {
+    "this month": 0, "이번 달": 0, "이번달": 0,
+    "next month": 1, "다음 달": 1, "다음달": 1,
+    "last month": -1, "지난 달": -1, "지난달": -1, "저번 달": -1, "저번달": -1,
+}
+
+# 날짜 형식: YYYY-MM-DD, YYYY.MM.DD, YYYY/MM/DD, YY-MM-DD, YY.MM.DD, YY/MM/DD
+_DATE_PATTERN = re.compile(r"^(\d{4}|\d{2})[-./](\d{1,2})[-./](\d{1,2})\.?$")
+# 시간이 포함된 ISO 형식 (예: 2021-05-10T12:00:00)
+_DATETIME_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}T[\d:.]+(Z|[+-]\d{2}:?\d{2})?$", re.IGNORECASE)
+
+
+def _strip_date_operator(expression: str) -> str:
+    expression = expression.strip()
+    for op in _DATE_OPERATOR_PREFIXES:
+        if expression.startswith(op):
+            return expression[len(op):].strip()
+    return expression
+
+
+def _add_months(day: date, months: int) -> date:
+    month_index = day.year * 12 + (day.month - 1) + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+@lru_cache(maxsize=1024)
+def _resolve_fast(expression: str, today: date) -> Optional[Tuple[str, str]]:
+    """
+    표 기반으로 날짜 표현을 (시작일, 종료일)로 변환하는 함수. 처리할 수 없으면 None을 반환합니다.
+    결과는 (표현, 오늘 날짜)별로 캐시되므로 날짜가 바뀌면 자연스럽게 다시 계산됩니다.
+    """
+    value = " ".join(_strip_date_operator(expression).split()).lower()
+
+    if value in _RELATIVE_DAYS:
+        day = (today + timedelta(days=_RELATIVE_DAYS[value])).isoformat()
+        return day, day
+
+    if value in _RELATIVE_WEEKS:
+        start_of_week = today - timedelta(days=today.weekday()) + timedelta(weeks=_RELATIVE_WEEKS[value])
+        return start_of_week.isoformat(), (start_of_week + timedelta(days=6)).isoformat()
+
+    if value in _RELATIVE_MONTHS:
+        start_of_month = _add_months(today, _RELATIVE_MONTHS[value])
+        end_of_month = _add_months(start_of_month, 1) - timedelta(days=1)
+        return start_of_month.isoformat(), end_of_month.isoformat()
+
+    match = _DATE_PATTERN.match(value)
+    if match:
+        year, month, day = match.groups()
+        year = int(year) + 2000 if len(year) == 2 else int(year)
+        try:
+            parsed = date(year, int(month), int(day)).isoformat()
+        except ValueError:
+            return None
+        return parsed, parsed
+
+    if _DATETIME_PATTERN.match(value):
+        try:
+            parsed = datetime.fromisoformat(value.upper().replace("Z", "+00:00"))
+        except ValueError:
+            return None
+        return parsed.date().isoformat(), parsed.isoformat()
+
+    return None
+
+
+def _is_calendar_date(expression: str) -> bool:
+    """
+    오늘 날짜와 무관한 절대 날짜 표현(2024-09-12, 24.09.08, ISO 시각 등)인지 확인하는 함수.
+    """
+    value = _strip_date_operator(expression).lower()
+    return bool(_DATE_PATTERN.match(value) or _DATETIME_PATTERN.match(value))
+
+
+@lru_cache(maxsize=256)
+def _resolve_fallback(expression: str, today: date) -> Optional[Tuple[str, str]]:
+    """
+    표 기반으로 처리할 수 없는 표현을 dateparser로 변환하는 함수. (느리므로 결과를 날짜별로 캐시)
+    """
+    import dateparser  # 첫 호출 시에만 불러옴 (import 및 첫 파싱 비용이 큼)
 
     # Parse specific dates or datetime formats (e.g., "2024-02-02" or "2021-05-10T12:00:00")
-    parsed_date = dateparser.parse(expression,settings={'DATE_ORDER': 'YMD'})
+    with metrics.timer("dateparser_duration_seconds", component="dateparser"), tracer.span("dateparser", expression=expression):
+        parsed_date = dateparser.parse(expression, settings={'DATE_ORDER': 'YMD'})
     if parsed_date:
         return parsed_date.date().isoformat(), parsed_date.isoformat()
+    return None
+
+
+def _lru_stats(fn) -> Dict[str, int]:
+    info = fn.cache_info()
+    return {"hits": info.hits, "misses": info.misses, "size": info.currsize}
+
+
+metrics.register_cache("date_table", lambda: _lru_stats(_resolve_fast))
+metrics.register_cache("dateparser", lambda: _lru_stats(_resolve_fallback))
+
+
+# Mapping natural language time expressions to specific date ranges
+def resolve_natural_language_time(expression: str):
+    """
+    날짜 표현을 (시작일, 종료일) ISO 문자열 쌍으로 변환하는 함수.
+    앞의 부등호는 무시하며, ISO/YY.MM.DD 날짜와 영어/한국어 상대 표현(오늘, 이번 주, 다음 달 등)은
+    표 기반으로 바로 처리하고, 그 외의 표현만 dateparser로 처리합니다.
+    """
+    today = date.today()
+    resolved = _resolve_fast(expression, today) or _resolve_fallback(expression, today)
+    if resolved:
+        return resolved
+
+    raise ValueError(f"Invalid date or time expression: {expression}")
+
+
+async def resolve_natural_language_time_async(expression: str):
+    """
+    `resolve_natural_language_time`의 비동기 버전.
+    표 기반으로 처리되지 않는 표현만 워커 스레드에서 dateparser로 처리하여 이벤트 루프를 막지 않습니다.
+    """
+    today = date.today()
+    resolved = _resolve_fast(expression, today)
+    if resolved is None:
+        resolved = await asyncio.to_thread(_resolve_fallback, expression, today)
+    if resolved:
+        return resolved
 
     raise ValueError(f"Invalid date or time expression: {expression}")
 
 
+class FilterPlan(NamedTuple):
+    """
+    컴파일된 필터 계획. 필터 모양(속성, 타입, 연산자)은 값 자리(slot)만 비워 둔 템플릿으로 공유하고,
+    조건 문자열에서 얻은 값은 params에 담습니다.
+    """
+    templates: Tuple[Tuple[str, str, str, int], ...]  # (속성 이름, 필터 타입, 연산자, params 인덱스)
+    params: Tuple[Any, ...]
+    day: Optional[date]  # 오늘 기준 상대 표현(today, 이번 주 등)이면 컴파일한 날짜, 아니면 None
+
+    def build(self) -> List[Dict[str, Any]]:
+        return [{"property": name, key: {op: self.params[slot]}} for name, key, op, slot in self.templates]
+
+
 class Condition:
-    def __init__(self, db_metadata: Dict[str, Any]):
+    def __init__(self, db_metadata: Dict[str, Any], plan_cache_size: int = 1024):
+        """
+        :param db_metadata: 데이터베이스 속성 메타데이터 (`databases.retrieve`의 properties)
+        :param plan_cache_size: 캐시할 필터 계획 수
+        """
         self.db_metadata = db_metadata
         self.filters: List[Dict[str, Any]] = []
+        # (속성 이름, 조건 문자열) -> FilterPlan. 스키마가 바뀌면 새 Condition이 만들어지므로 스키마 버전별 캐시가 됨
+        self._plans = TTLCache(plan_cache_size, ttl=86400)
+        # (속성 이름, 필터 타입, 연산자들) -> 템플릿. 값만 다른 조건(사용자별 Discord ID 등)끼리 공유
+        self._shapes: Dict[Tuple[str, str, Tuple[str, ...]], Tuple[Tuple[str, str, str, int], ...]] = {}
 
     def __call__(self, conditions: Dict[str, Any]) -> 'Condition':
         new_condition = Condition(self.db_metadata)
         new_condition.filters = self.parse_conditions(conditions)
+        # 결과 객체도 같은 계획 캐시를 공유
+        new_condition._plans = self._plans
+        new_condition._shapes = self._shapes
         return new_condition
 
-    def parse_conditions(self, conditions: Dict[str, Any]) -> List[Dict[str, Any]]:
-        filters = []
-        for property_name, condition in conditions.items():
-            if property_name not in self.db_metadata:
-                raise ValueError(f"Property '{property_name}' not found in database metadata.")
-
-            property_meta = self.db_metadata[property_name]
-            filter_type = self.get_filter_type(property_meta['type'])
-
-            filters.extend(self.parse_condition(property_name, filter_type, condition))
-
-        return filters
+    def plan(self, property_name: str, condition: Any) -> FilterPlan:
+        """
+        (속성, 조건)에 대한 필터 계획을 반환하는 함수. 캐시에 있으면 다시 파싱하지 않으며,
+        상대 날짜 표현의 계획은 날짜가 바뀌면 다시 컴파일합니다.
 
-    def get_filter_type(self, property_type: str) -> FilterType:
+        :param property_name: 속성 이름
+        :param condition: 조건 문자열 (예: '> yesterday', 'contains 디자인')
+        :return: FilterPlan
+        """
         try:
-            return FilterType(property_type)
-        except ValueError:
-            raise ValueError(f"Unsupported property type '{property_type}'")
+            key = (property_name, condition)
+            compiled = self._plans.get(key)
+        except TypeError:
+            # 해시할 수 없는 조건 값은 캐시하지 않음
+            return self.compile(property_name, condition)
+
+        if compiled is None or (compiled.day is not None and compiled.day != date.today()):
+            compiled = self.compile(property_name, condition)
+            self._plans.set(key, compiled)
+        return compiled
+
+    def compile(self, property_name: str, condition: Any) -> FilterPlan:
+        """
+        조건 하나를 파싱하여 필터 계획을 만드는 함수. (캐시하지 않음, `plan` 사용 권장)
+        """
+        if property_name not in self.db_metadata:
+            raise ValueError(f"Property '{property_name}' not found in database metadata.")
 
-    def parse_condition(self, property_name: str, filter_type: FilterType, condition: str) -> List[Dict[str, Any]]:
+        filter_type = self.get_filter_type(self.db_metadata[property_name]['type'])
         if filter_type == FilterType.DATE:
-            return self.parse_date_conditions(property_name, condition)
-        
+            return self.compile_date_condition(property_name, condition)
+
         operator, value = self.extract_operator_and_value(condition, filter_type)
-        return [self.create_filter(property_name, filter_type, operator, value)]
+        if operator in {Operator.IS_EMPTY, Operator.IS_NOT_EMPTY}:
+            value = True
+        return FilterPlan(self._shape(property_name, filter_type.value, (operator.value,)), (value,), None)
 
-    def parse_date_conditions(self, property_name: str, condition: str) -> List[Dict[str, Any]]:
+    def compile_date_condition(self, property_name: str, condition: str) -> FilterPlan:
         """
-        Parse date conditions into separate filters for start and end dates if necessary.
-        Supports operators like >, <, =, !=, is empty, and is not empty.
+        날짜 조건을 필터 계획으로 만드는 함수.
+        '>'로 시작하면 시작일 이후, '<'로 시작하면 종료일 이전, 그 외에는 시작일~종료일 범위로 변환합니다.
         """
+        today = date.today()
         try:
-            # Try resolving natural language time (e.g., 'this year', 'next week', etc.)
             start_date, end_date = resolve_natural_language_time(condition)
-            filters = []
-
-            # Handling natural language expressions like "this year"
-            if start_date and end_date:
-                if condition.startswith(">"):
-                    filters.append(self.create_date_filter(property_name, DateOperator.ON_OR_AFTER, start_date))
-                elif condition.startswith("<"):
-                    filters.append(self.create_date_filter(property_name, DateOperator.ON_OR_BEFORE, end_date))
-                else:
-                    filters.append(self.create_date_filter(property_name, DateOperator.ON_OR_AFTER, start_date))
-                    filters.append(self.create_date_filter(property_name, DateOperator.ON_OR_BEFORE, end_date))
-
-            else:
-                # Handling specific date operators (e.g., !=, =, is empty, is not empty, >, <)
-                operator, value = self.extract_date_operator_and_value(condition)
-                if operator in {DateOperator.IS_EMPTY, DateOperator.IS_NOT_EMPTY}:
-                    # Handle 'is empty' and 'is not empty' cases
-                    filters.append(self.create_date_filter(property_name, operator, value))
-                else:
-                    # Handle regular comparison operators (e.g., =, !=, >, <)
-                    filters.append(self.create_date_filter(property_name, operator, value))
-
-            return filters
-
         except ValueError as e:
             raise ValueError(f"Date parsing error for '{property_name}': {str(e)}")
 
+        if condition.startswith(">"):
+            operators, params = (DateOperator.ON_OR_AFTER.value,), (start_date,)
+        elif condition.startswith("<"):
+            operators, params = (DateOperator.ON_OR_BEFORE.value,), (end_date,)
+        else:
+            operators = (DateOperator.ON_OR_AFTER.value, DateOperator.ON_OR_BEFORE.value)
+            params = (start_date, end_date)
+
+        day = None if _is_calendar_date(condition) else today
+        return FilterPlan(self._shape(property_name, FilterType.DATE.value, operators), params, day)
+
+    def _shape(self, property_name: str, filter_type: str, operators: Tuple[str, ...]) -> Tuple[Tuple[str, str, str, int], ...]:
+        key = (property_name, filter_type, operators)
+        templates = self._shapes.get(key)
+        if templates is None:
+            templates = tuple((property_name, filter_type, op, slot) for slot, op in enumerate(operators))
+            self._shapes[key] = templates
+        return templates
+
+    async def prepare(self, conditions: Dict[str, Any]) -> None:
+        """
+        날짜 조건을 미리 변환해 두는 함수.
+        dateparser가 필요한 표현은 워커 스레드에서 처리되고 결과가 캐시되므로, 이후 `__call__`은 이벤트 루프를 막지 않습니다.
+        """
+        for property_name, condition in conditions.items():
+            property_meta = self.db_metadata.get(property_name, {})
+            if property_meta.get('type') == FilterType.DATE.value and isinstance(condition, str):
+                compiled = self._plans.get((property_name, condition))
+                if compiled is not None and compiled.day in (None, date.today()):
+                    continue
+                try:
+                    await resolve_natural_language_time_async(condition)
+                except ValueError:
+                    pass  # 오류는 __call__에서 기존과 같이 처리
+
+    def parse_conditions(self, conditions: Dict[str, Any]) -> List[Dict[str, Any]]:
+        filters = []
+        for property_name, condition in conditions.items():
+            filters.extend(self.plan(property_name, condition).build())
+        return filters
+
+    def get_filter_type(self, property_type: str) -> FilterType:
+        try:
+            return FilterType(property_type)
+        except ValueError:
+            raise ValueError(f"Unsupported property type '{property_type}'")
 
     def extract_operator_and_value(self, condition: str, filter_type: FilterType) -> (Operator, Any):
-        for op in operator_map.keys():
+        for op in _OPERATOR_TOKENS:
             if condition.startswith(op):
                 operator = operator_map[op]
                 value = condition[len(op):].strip()
@@ -193,49 +342,6 @@ class Condition:
         value = condition.strip()
         return operator, value
 
-    def extract_date_operator_and_value(self, condition: str) -> (DateOperator, Any):
-        """
-        Extract date operator and value from the condition string.
-        Supports operators like >, <, =, !=, is empty, and is not empty.
-        """
-        # Handle natural language expressions first
-        start_date, end_date = resolve_natural_language_time(condition)
-        if start_date and end_date:
-            return DateOperator.ON_OR_AFTER, start_date
-
-        # Loop through possible operators and extract the corresponding value
-        for op in date_operator_map.keys():
-            if condition.startswith(op):
-                operator = date_operator_map[op]
-                if operator in {DateOperator.IS_EMPTY, DateOperator.IS_NOT_EMPTY}:
-                    # No date value needed for 'is empty' and 'is not empty'
-                    return operator, True
-                else:
-                    # Extract the actual date value
-                    date_str = condition[len(op):].strip()
-                    date_val = dateparser.parse(date_str)
-                    if date_val:
-                        return operator, date_val.date().isoformat() if "T" not in date_str else date_val.isoformat()
-        
-        # If no operator is found, default to '=' for exact match
-        return DateOperator.EQUALS, condition.strip()
-    def create_filter(self, property_name: str, filter_type: FilterType, operator: Operator, value: Any) -> Dict[str, Any]:
-        if operator in {Operator.IS_EMPTY, Operator.IS_NOT_EMPTY}:
-            return {"property": property_name, filter_type.value: {operator.value: True}}
-        return {"property": property_name, filter_type.value: {operator.value: value}}
-
-    def create_date_filter(self, property_name: str, operator: DateOperator, value: Any) -> Dict[str, Any]:
-        """
-        Create a date filter for Notion queries.
-        Handles both date comparisons and empty/not empty conditions.
-        """
-        if operator in {DateOperator.IS_EMPTY, DateOperator.IS_NOT_EMPTY}:
-            # For 'is empty' and 'is not empty', we only need a boolean value
-            return {"property": property_name, "date": {operator.value: True}}
-        
-        # For other operators, return the appropriate filter with the date value
-        return {"property": property_name, "date": {operator.value: value}}
-
     def __and__(self, other: 'Condition') -> 'Condition':
         return self.combine_conditions(other, "and")
 
@@ -259,6 +365,8 @@ class Condition:
 
 # Example usage
 if __name__ == "__main__":
+    from pprint import pprint
+
     notion_db_metadata = {
         '날짜': {'id': 'Bmou', 'type': 'date'},
         '날짜2': {'id': 'Bmou1', 'type': 'date'},
@@ -0,0 +1,143 @@
+from bisect import bisect_left, bisect_right, insort
+from datetime import date, timedelta
+from typing import List, Dict, Any, Optional, Tuple
+
+# 날짜만 비교하는 필터 연산자 -> (하한/상한, 경계 포함 여부)
+_LOWER_BOUND_OPERATORS = {"on_or_after": True, "after": False}
+_UPPER_BOUND_OPERATORS = {"on_or_before": True, "before": False}
+
+_MAX_KEY = "\uffff"  # 같은 날짜의 모든 시작 값(시각 포함)보다 큰 접미사
+
+
+def _shift(day: str, days: int) -> str:
+    return (date.fromisoformat(day) + timedelta(days=days)).isoformat()
+
+
+class DateIndex:
+    """
+    일정 시작 값 기준으로 정렬된 색인.
+    (시작 값, 항목 ID) 키를 정렬된 배열로 유지하여 이분 탐색으로 기간/다가오는 일정/겹치는 일정을 O(log n + k)에 찾습니다.
+    키는 시각을 포함한 시작 값 그대로이므로 같은 날의 일정도 `날짜` 오름차순 정렬과 같은 순서가 됩니다.
+    검색 범위는 'YYYY-MM-DD' 단위로 비교합니다.
+    """
+
+    def __init__(self):
+        self._keys: List[Tuple[str, str]] = []           # (시작 값, 항목 ID) 정렬 배열
+        self._spans: Dict[str, Tuple[str, str]] = {}     # 항목 ID -> (시작 값, 종료일)
+        self._max_days = 0                               # 가장 긴 일정의 기간 (일), 겹침 검색 범위에 사용
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._spans
+
+    def add(self, item_id: str, start: Optional[str], end: Optional[str] = None) -> None:
+        """
+        항목을 색인에 추가하는 함수. 이미 있으면 새 날짜로 갱신합니다.
+
+        :param item_id: 항목 ID (페이지 ID 등)
+        :param start: 시작 날짜 (ISO 문자열, None이면 색인하지 않음)
+        :param end: Optional 종료 날짜 (ISO 문자열)
+        """
+        self.remove(item_id)
+        if not start:
+            return
+        day, end = start[:10], (end or start)[:10]
+        if end < day:
+            end = day
+        insort(self._keys, (start, item_id))
+        self._spans[item_id] = (start, end)
+        self._max_days = max(self._max_days, (date.fromisoformat(end) - date.fromisoformat(day)).days)
+
+    def remove(self, item_id: str) -> None:
+        """
+        항목을 색인에서 제거하는 함수. 없으면 아무 것도 하지 않습니다.
+        """
+        span = self._spans.pop(item_id, None)
+        if span is None:
+            return
+        position = bisect_left(self._keys, (span[0], item_id))
+        del self._keys[position]
+
+    def clear(self) -> None:
+        self._keys.clear()
+        self._spans.clear()
+        self._max_days = 0
+
+    def between(self, start: Optional[str] = None, end: Optional[str] = None) -> List[str]:
+        """
+        시작일이 [start, end] 범위에 있는 항목을 시작 순으로 반환하는 함수.
+
+        :param start: Optional 하한 날짜 (포함, None이면 제한 없음)
+        :param end: Optional 상한 날짜 (포함, None이면 제한 없음)
+        :return: 항목 ID 리스트
+        """
+        low = bisect_left(self._keys, (start[:10], "")) if start else 0
+        high = bisect_right(self._keys, (end[:10] + _MAX_KEY,)) if end else len(self._keys)
+        return [item_id for _, item_id in self._keys[low:high]]
+
+    def upcoming(self, after: str, k: int = 5) -> List[str]:
+        """
+        after 이후(당일 포함)에 시작하는 항목을 가까운 순으로 k개 반환하는 함수. 같은 날의 항목은 시작 시각 순입니다.
+
+        :param after: 기준 날짜
+        :param k: 반환할 최대 항목 수
+        :return: 항목 ID 리스트
+        """
+        low = bisect_left(self._keys, (after[:10], ""))
+        return [item_id for _, item_id in self._keys[low:low + k]]
+
+    def overlapping(self, start: str, end: str) -> List[str]:
+        """
+        일정 기간이 [start, end]와 겹치는 항목을 시작 순으로 반환하는 함수.
+        가장 긴 일정의 기간만큼 앞에서부터 살펴보므로, 시작일 이전에 시작해 아직 진행 중인 일정도 포함됩니다.
+
+        :param start: 하한 날짜 (포함)
+        :param end: 상한 날짜 (포함)
+        :return: 항목 ID 리스트
+        """
+        start = start[:10]
+        candidates = self.between(_shift(start, -self._max_days), end)
+        return [item_id for item_id in candidates if self._spans[item_id][1] >= start]
+
+
+def date_bounds(filter: Optional[Dict[str, Any]], property_name: str) -> Optional[Tuple[Optional[str], Optional[str], List[Dict[str, Any]]]]:
+    """
+    `Condition.get_filters()` 결과에서 날짜 속성의 범위 조건을 분리하는 함수.
+    최상위 'and'에 있는 날짜 전용(시각 없음) 비교만 범위로 바꾸고, 나머지 조건은 그대로 돌려줍니다.
+
+    :param filter: Notion 필터 딕셔너리
+    :param property_name: 날짜 속성 이름
+    :return: (하한, 상한, 나머지 필터 리스트). 범위로 바꿀 날짜 조건이 없으면 None
+    """
+    if not filter:
+        return None
+    clauses = filter["and"] if list(filter) == ["and"] else [filter]
+
+    lower, upper, rest, found = None, None, [], False
+    for clause in clauses:
+        condition = clause.get("date") if clause.get("property") == property_name else None
+        if not isinstance(condition, dict) or len(condition) != 1:
+            rest.append(clause)
+            continue
+        (operator, value), = condition.items()
+        if not isinstance(value, str) or len(value) != 10:
+            rest.append(clause)
+            continue
+
+        if operator in _LOWER_BOUND_OPERATORS:
+            bound = value if _LOWER_BOUND_OPERATORS[operator] else _shift(value, 1)
+            lower = bound if lower is None else max(lower, bound)
+        elif operator in _UPPER_BOUND_OPERATORS:
+            bound = value if _UPPER_BOUND_OPERATORS[operator] else _shift(value, -1)
+            upper = bound if upper is None else min(upper, bound)
+        elif operator == "equals":
+            lower = value if lower is None else max(lower, value)
+            upper = value if upper is None else min(upper, value)
+        else:
+            rest.append(clause)
+            continue
+        found = True
+
+    return (lower, upper, rest) if found else None
@@ -0,0 +1,152 @@
+import asyncio
+import time
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from utils.metrics import metrics
+from utils.scheduler import TokenBucket
+from utils.tracing import tracer
+
+
+class DirectMessenger:
+    """
+    Discord DM 발송 파이프라인.
+    호출자는 `send`로 메시지를 넘기고 바로 돌아가며(fire-and-forget), 같은 사용자에게 같은 키로 짧은 시간 안에
+    여러 메시지가 들어오면 마지막 메시지 하나만 보냅니다. (예: ✅를 여러 번 눌렀다 뗀 경우 최종 상태만 안내)
+    실제 발송은 전역 토큰 버킷과 제한된 수의 발송 워커로 처리하여 Discord DM 한도에 걸리지 않도록 합니다.
+    """
+
+    def __init__(self, debounce: float = 3.0, max_delay: float = 15.0, rate: float = 2.0, burst: float = 5.0,
+                 concurrency: int = 2, max_retries: int = 2):
+        """
+        :param debounce: 같은 키의 메시지를 모으는 시간 (초, 마지막 메시지 이후 이만큼 조용하면 발송)
+        :param max_delay: 메시지가 계속 들어와도 첫 메시지 이후 이 시간이 지나면 발송 (초)
+        :param rate: 초당 최대 DM 발송 수
+        :param burst: 순간적으로 허용할 최대 발송 수
+        :param concurrency: 동시에 진행할 최대 발송 수
+        :param max_retries: 발송 실패(Discord 5xx/429 등) 시 재시도 횟수
+        """
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.bucket = TokenBucket(rate, burst)
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        # (사용자 ID, 키) -> [사용자, 메시지 인자, 마지막 갱신 시각, 첫 메시지 시각]
+        self._pending: Dict[Tuple[int, Hashable], List[Any]] = {}
+        self._timers: Dict[Tuple[int, Hashable], asyncio.Task] = {}
+        self._outbox: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _ensure_workers(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._outbox = asyncio.Queue()
+            self._workers = []
+            self._timers.clear()
+            self._pending.clear()
+        self._workers = [task for task in self._workers if not task.done()]
+        while len(self._workers) < self.concurrency:
+            self._workers.append(loop.create_task(self._deliver()))
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending) + (self._outbox.qsize() if self._outbox is not None else 0)
+
+    def send(self, user: Any, key: Optional[Hashable] = None, **kwargs: Any) -> None:
+        """
+        DM 발송을 예약하는 함수. 발송을 기다리지 않고 바로 반환합니다.
+
+        :param user: 메시지를 받을 Discord 사용자 (`send` 메서드가 있는 객체)
+        :param key: Optional 묶음 키. 같은 사용자에게 같은 키로 들어온 메시지는 마지막 것만 보냄 (None이면 묶지 않음)
+        :param kwargs: `user.send`에 넘길 인자 (content, embed 등)
+        """
+        self._ensure_workers()
+        if key is None:
+            self._outbox.put_nowait((user, kwargs))
+            return
+
+        now = time.monotonic()
+        slot = (user.id, key)
+        entry = self._pending.get(slot)
+        if entry is not None:
+            entry[0], entry[1], entry[2] = user, kwargs, now
+            metrics.inc("dm_messages_total", outcome="collapsed")
+            return
+        self._pending[slot] = [user, kwargs, now, now]
+        self._timers[slot] = asyncio.get_running_loop().create_task(self._flush_later(slot))
+
+    async def _flush_later(self, slot: Tuple[int, Hashable]) -> None:
+        tracer.detach()
+        try:
+            while True:
+                entry = self._pending[slot]
+                due = min(entry[2] + self.debounce, entry[3] + self.max_delay)
+                remaining = due - time.monotonic()
+                if remaining <= 0:
+                    break
+                await asyncio.sleep(remaining)
+            user, kwargs, _, _ = self._pending.pop(slot)
+            self._outbox.put_nowait((user, kwargs))
+        finally:
+            self._timers.pop(slot, None)
+
+    async def _deliver(self) -> None:
+        # 발송 워커는 계속 실행되므로, 처음 만든 이벤트의 구간에 붙지 않음
+        tracer.detach()
+        while True:
+            user, kwargs = await self._outbox.get()
+            try:
+                await self._send(user, kwargs)
+            finally:
+                self._outbox.task_done()
+
+    async def _send(self, user: Any, kwargs: Dict[str, Any]) -> None:
+        for attempt in range(self.max_retries + 1):
+            wait = self.bucket.try_acquire()
+            while wait > 0:
+                await asyncio.sleep(wait)
+                wait = self.bucket.try_acquire()
+            try:
+                with metrics.timer("dm_delivery_seconds"):
+                    await user.send(**kwargs)
+                metrics.inc("dm_messages_total", outcome="sent")
+                break
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # 403(DM 차단)처럼 재시도해도 소용없는 오류는 바로 포기
+                status = getattr(e, "status", None)
+                if attempt >= self.max_retries or status in (400, 401, 403, 404):
+                    metrics.inc("dm_messages_total", outcome="failed")
+                    print(f"Error in DirectMessenger._send: {str(e)}")
+                    break
+                await asyncio.sleep(0.5 * (2 ** attempt))
+
+    async def flush(self) -> None:
+        """
+        묶여 있는 메시지를 바로 보내고, 예약된 발송이 모두 끝날 때까지 기다리는 함수. (종료 시 사용)
+        """
+        if self._outbox is None:
+            return
+        for slot in list(self._pending):
+            timer = self._timers.pop(slot, None)
+            if timer is not None:
+                timer.cancel()
+            user, kwargs, _, _ = self._pending.pop(slot)
+            self._outbox.put_nowait((user, kwargs))
+        await self._outbox.join()
+
+    def stop(self) -> None:
+        for task in list(self._timers.values()) + self._workers:
+            task.cancel()
+        self._timers.clear()
+        self._workers = []
+
+
+# 모듈 전역 DM 발송기
+dm_sender = DirectMessenger()
+
+metrics.describe("dm_messages_total", "counter", "DM 발송 결과 수 (sent, collapsed, failed)")
+metrics.describe("dm_delivery_seconds", "histogram", "DM 한 건을 보내는 데 걸린 시간")
+metrics.register_gauge("dm_pending", lambda: dm_sender.pending)
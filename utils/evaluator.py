@@ -0,0 +1,271 @@
+from datetime import datetime
+from typing import Callable, List, Dict, Any, Iterable, Optional, Tuple
+
+
+class UnsupportedFilter(ValueError):
+    """
+    로컬 평가기가 처리할 수 없는 필터. 이 경우 호출자는 Notion API로 질의해야 합니다.
+    """
+
+
+# 속성 타입별로 필터에서 사용할 수 있는 키 (title/rich_text 등은 텍스트 필터를 공유)
+_TEXT_TYPES = {"title", "rich_text", "url", "email", "phone_number"}
+
+
+def property_value(prop: Dict[str, Any]) -> Any:
+    """
+    Notion 페이지 속성에서 필터 비교에 사용할 값을 꺼내는 함수.
+
+    :param prop: 페이지의 속성 딕셔너리 (예: page['properties']['이름'])
+    :return: 텍스트는 plain text 문자열, multi_select는 이름 리스트, date는 시작 값, 그 외는 원래 값
+    """
+    prop_type = prop.get("type")
+    if prop_type in ("title", "rich_text"):
+        parts = prop.get(prop_type) or []
+        if len(parts) == 1:
+            return parts[0].get("plain_text", "")
+        return "".join(part.get("plain_text", "") for part in parts)
+    if prop_type == "multi_select":
+        return [option.get("name", "") for option in prop.get("multi_select") or []]
+    if prop_type in ("select", "status"):
+        option = prop.get(prop_type)
+        return option.get("name") if option else None
+    if prop_type == "date":
+        value = prop.get("date")
+        return value.get("start") if value else None
+    if prop_type == "relation":
+        return [relation.get("id") for relation in prop.get("relation") or []]
+    if prop_type in _TEXT_TYPES or prop_type in ("number", "checkbox"):
+        return prop.get(prop_type)
+    raise UnsupportedFilter(f"Unsupported property type '{prop_type}'")
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or value == "" or value == [] or value == ()
+
+
+def _lookup(page: Any, property_name: Optional[str]) -> Tuple[str, Any]:
+    # 페이지 딕셔너리는 속성을 매번 해석하고, 레코드(`utils.records`)는 해석해 둔 값을 그대로 사용
+    if isinstance(page, dict):
+        prop = page.get("properties", {}).get(property_name)
+        if prop is None:
+            raise UnsupportedFilter(f"Property '{property_name}' not found in page")
+        return prop.get("type"), property_value(prop)
+    return page.get_property(property_name)
+
+
+def _timestamp(page: Any, timestamp: str) -> Any:
+    if isinstance(page, dict):
+        return page.get(timestamp)
+    try:
+        return getattr(page, timestamp)
+    except AttributeError:
+        raise UnsupportedFilter(f"Timestamp '{timestamp}' not found in {type(page).__name__}")
+
+
+def _to_number(value: Any) -> float:
+    # Condition은 조건 문자열에서 꺼낸 값을 그대로 넘기므로 '3' 같은 문자열도 숫자로 비교
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise UnsupportedFilter(f"Invalid number '{value}'")
+
+
+def _date_key(value: str, date_only: bool) -> Any:
+    if date_only:
+        return value[:10]
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return parsed if parsed.tzinfo else parsed.astimezone()
+
+
+def _match_text(value: Optional[str], operator: str, operand: Any) -> bool:
+    value = value or ""
+    if operator == "equals":
+        return value == operand
+    if operator in ("does_not_equal", "not_equals"):
+        return value != operand
+    # Notion의 텍스트 포함 검색은 대소문자를 구분하지 않는다고 가정 (equals는 구분, 실제 API로 확인되지 않음)
+    if operator == "contains":
+        return str(operand).lower() in value.lower()
+    if operator == "does_not_contain":
+        return str(operand).lower() not in value.lower()
+    if operator == "starts_with":
+        return value.lower().startswith(str(operand).lower())
+    if operator == "ends_with":
+        return value.lower().endswith(str(operand).lower())
+    raise UnsupportedFilter(f"Unsupported text operator '{operator}'")
+
+
+def _match_number(value: Optional[float], operator: str, operand: Any) -> bool:
+    if value is None:
+        return False
+    operand = _to_number(operand)
+    if operator == "equals":
+        return value == operand
+    if operator in ("does_not_equal", "not_equals"):
+        return value != operand
+    if operator == "greater_than":
+        return value > operand
+    if operator == "less_than":
+        return value < operand
+    if operator == "greater_than_or_equal_to":
+        return value >= operand
+    if operator == "less_than_or_equal_to":
+        return value <= operand
+    raise UnsupportedFilter(f"Unsupported number operator '{operator}'")
+
+
+def _match_options(value: List[str], operator: str, operand: Any) -> bool:
+    # multi_select/relation의 contains는 옵션 이름(또는 ID)이 정확히 일치해야 함
+    if operator == "contains":
+        return operand in value
+    if operator == "does_not_contain":
+        return operand not in value
+    raise UnsupportedFilter(f"Unsupported multi_select operator '{operator}'")
+
+
+def _match_date(value: Optional[str], operator: str, operand: Any) -> bool:
+    if value is None:
+        return False
+    if not isinstance(operand, str):
+        raise UnsupportedFilter(f"Unsupported date operator '{operator}'")
+    # 날짜만 주어진 필터는 날짜 단위로, 시각이 포함된 필터는 시각 단위로 비교 (실제 API로 확인되지 않은 가정)
+    date_only = len(operand) == 10
+    left, right = _date_key(value, date_only), _date_key(operand, date_only)
+    if operator == "equals":
+        return left == right
+    if operator in ("does_not_equal", "not_equals"):
+        return left != right
+    if operator == "before":
+        return left < right
+    if operator == "after":
+        return left > right
+    if operator == "on_or_before":
+        return left <= right
+    if operator == "on_or_after":
+        return left >= right
+    raise UnsupportedFilter(f"Unsupported date operator '{operator}'")
+
+
+def _match(prop_type: str, value: Any, operator: str, operand: Any) -> bool:
+    if operator == "is_empty":
+        return _is_empty(value)
+    if operator == "is_not_empty":
+        return not _is_empty(value)
+
+    if prop_type in _TEXT_TYPES:
+        return _match_text(value, operator, operand)
+    if prop_type == "number":
+        return _match_number(value, operator, operand)
+    if prop_type in ("multi_select", "relation"):
+        return _match_options(value, operator, operand)
+    if prop_type in ("select", "status"):
+        if operator == "equals":
+            return value == operand
+        if operator in ("does_not_equal", "not_equals"):
+            return value != operand
+    if prop_type == "checkbox":
+        if operator == "equals":
+            return bool(value) == bool(operand)
+        if operator in ("does_not_equal", "not_equals"):
+            return bool(value) != bool(operand)
+    if prop_type in ("date", "created_time", "last_edited_time"):
+        return _match_date(value, operator, operand)
+    raise UnsupportedFilter(f"Unsupported operator '{operator}' for '{prop_type}'")
+
+
+def _single_condition(condition: Dict[str, Any]) -> Tuple[str, Any]:
+    if not isinstance(condition, dict) or len(condition) != 1:
+        raise UnsupportedFilter(f"Filter condition must have exactly one operator: {condition}")
+    (operator, operand), = condition.items()
+    return operator, operand
+
+
+def compile_filter(filter: Optional[Dict[str, Any]]) -> Callable[[Dict[str, Any]], bool]:
+    """
+    Notion 필터 JSON을 페이지를 받아 참/거짓을 반환하는 함수로 변환하는 함수.
+    필터 구조는 한 번만 해석하므로, 많은 페이지에 같은 필터를 적용할 때 사용합니다.
+
+    :param filter: Notion 필터 딕셔너리 (None이면 항상 참)
+    :return: page -> bool 함수
+    :raises UnsupportedFilter: 필터 구조를 해석할 수 없는 경우
+    """
+    if not filter:
+        return lambda page: True
+    if "and" in filter or "or" in filter:
+        predicates = [compile_filter(sub) for sub in filter.get("and", filter.get("or"))]
+        if len(predicates) == 1:
+            return predicates[0]
+        expected = "or" in filter  # and는 하나라도 거짓이면, or는 하나라도 참이면 바로 결정
+
+        def compound(page: Dict[str, Any]) -> bool:
+            for predicate in predicates:
+                if predicate(page) == expected:
+                    return expected
+            return not expected
+        return compound
+
+    if "timestamp" in filter:
+        timestamp = filter["timestamp"]
+        operator, operand = _single_condition(filter.get(timestamp))
+        return lambda page: _match(timestamp, _timestamp(page, timestamp), operator, operand)
+
+    # 필터 키는 Condition이 스키마 타입으로 만들지만, 비교는 페이지의 실제 속성 타입을 따름
+    property_name = filter.get("property")
+    conditions = [value for key, value in filter.items() if key != "property"]
+    if property_name is None or len(conditions) != 1:
+        raise UnsupportedFilter(f"Invalid property filter: {filter}")
+    operator, operand = _single_condition(conditions[0])
+
+    def predicate(page: Dict[str, Any]) -> bool:
+        prop_type, value = _lookup(page, property_name)
+        return _match(prop_type, value, operator, operand)
+    return predicate
+
+
+def evaluate_filter(filter: Optional[Dict[str, Any]], page: Dict[str, Any]) -> bool:
+    """
+    `databases.query`의 필터 JSON을 페이지 하나에 대해 평가하는 함수.
+    `Condition.get_filters()`가 만드는 and/or 복합 필터와 속성/타임스탬프 필터를 지원합니다.
+
+    :param filter: Notion 필터 딕셔너리 (None이면 항상 참)
+    :param page: Notion 페이지 딕셔너리
+    :return: 필터 조건을 만족하면 True
+    :raises UnsupportedFilter: 지원하지 않는 속성 타입이나 연산자가 포함된 경우
+    """
+    return compile_filter(filter)(page)
+
+
+def _sort_key(page: Dict[str, Any], sort: Dict[str, Any]) -> Tuple[bool, Any]:
+    if "timestamp" in sort:
+        value = _timestamp(page, sort["timestamp"])
+    else:
+        _, value = _lookup(page, sort.get("property"))
+        if isinstance(value, (list, tuple)):
+            value = ", ".join(value)
+    return _is_empty(value), value
+
+
+def query_pages(pages: Iterable[Dict[str, Any]], filter: Optional[Dict[str, Any]] = None,
+                sorts: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+    """
+    미러에 있는 페이지들을 `databases.query`와 같은 필터/정렬로 조회하는 함수.
+    빈 값은 정렬 방향과 관계없이 맨 뒤에 옵니다.
+
+    :param pages: Notion 페이지 딕셔너리 또는 레코드(`utils.records.Record`)들
+    :param filter: Optional Notion 필터 딕셔너리
+    :param sorts: Optional Notion 정렬 조건 리스트 (예: [{'property': '날짜', 'direction': 'ascending'}])
+    :return: 조건에 맞는 페이지 리스트
+    :raises UnsupportedFilter: 로컬에서 평가할 수 없는 필터/정렬인 경우
+    """
+    predicate = compile_filter(filter)
+    result = [page for page in pages if predicate(page)]
+
+    # 안정 정렬이므로 마지막 정렬 조건부터 적용
+    for sort in reversed(sorts or []):
+        descending = sort.get("direction") == "descending"
+        keyed = [(_sort_key(page, sort), page) for page in result]
+        filled = [(key[1], page) for key, page in keyed if not key[0]]
+        filled.sort(key=lambda item: item[0], reverse=descending)
+        result = [page for _, page in filled] + [page for key, page in keyed if key[0]]
+    return result
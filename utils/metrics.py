@@ -0,0 +1,335 @@
+import functools
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+
+# 지연 시간 히스토그램 경계 (초)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+# 현재 명령어/이벤트 처리 중 구성 요소(notion, dateparser, discord)별로 쓴 시간을 모으는 딕셔너리
+_breakdown: ContextVar[Optional[Dict[str, float]]] = ContextVar("metrics_breakdown", default=None)
+
+
+def _labels(labels: Dict[str, Any]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(labels: Labels, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    pairs = labels + extra
+    if not pairs:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(pairs, escaped)) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+def endpoint_name(endpoint: Callable[..., Any]) -> str:
+    """
+    Notion 클라이언트 메서드의 이름을 지표 라벨로 바꾸는 함수. (예: DatabasesEndpoint.query -> databases.query)
+    """
+    qualname = getattr(endpoint, "__qualname__", None) or repr(endpoint)
+    return qualname.replace("Endpoint", "").lower()
+
+
+class Histogram:
+    """
+    누적 버킷 히스토그램. 관측값을 경계별로 세고, 합계와 개수를 함께 유지합니다.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # 마지막 칸은 +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """
+        q 분위수를 버킷 상한으로 근사하는 함수. (예: q=0.95 -> p95가 속한 버킷의 상한)
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+class MetricsRegistry:
+    """
+    봇 전체가 공유하는 지표 저장소.
+    카운터/게이지/히스토그램을 (이름, 라벨) 단위로 모으고, Prometheus 텍스트 형식으로 내보냅니다.
+    캐시 적중률처럼 다른 객체가 이미 세고 있는 값은 `register_cache`/`register_gauge`로 조회 시점에 읽어 옵니다.
+    """
+
+    def __init__(self):
+        self._meta: Dict[str, Tuple[str, str]] = {}  # 이름 -> (종류, 설명)
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._gauges: Dict[str, Dict[Labels, float]] = {}
+        self._histograms: Dict[str, Dict[Labels, Histogram]] = {}
+        self._collectors: List[Tuple[str, Labels, Callable[[], float]]] = []
+
+    def describe(self, name: str, kind: str, help: str) -> None:
+        """
+        지표의 종류(counter/gauge/histogram)와 설명을 등록하는 함수.
+        """
+        self._meta[name] = (kind, help)
+
+    def inc(self, name: str, value: float = 1, **labels: Any) -> None:
+        series = self._counters.setdefault(name, {})
+        key = _labels(labels)
+        series[key] = series.get(key, 0) + value
+
+    def set(self, name: str, value: float, **labels: Any) -> None:
+        self._gauges.setdefault(name, {})[_labels(labels)] = value
+
+    def add(self, name: str, value: float, **labels: Any) -> None:
+        series = self._gauges.setdefault(name, {})
+        key = _labels(labels)
+        series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        series = self._histograms.setdefault(name, {})
+        key = _labels(labels)
+        histogram = series.get(key)
+        if histogram is None:
+            histogram = series[key] = Histogram()
+        histogram.observe(value)
+
+    def register_gauge(self, name: str, fn: Callable[[], float], **labels: Any) -> None:
+        """
+        조회 시점에 fn()을 호출하여 값을 읽는 게이지를 등록하는 함수.
+        """
+        self._collectors.append((name, _labels(labels), fn))
+
+    def register_cache(self, cache: str, stats: Callable[[], Dict[str, Any]]) -> None:
+        """
+        hits/misses(와 선택적으로 size)를 반환하는 stats 함수를 캐시 지표로 등록하는 함수.
+
+        :param cache: 캐시 이름 (라벨 값)
+        :param stats: 예) `title_cache.stats`, `read_flight.stats`
+        """
+        def ratio() -> float:
+            s = stats()
+            total = s["hits"] + s["misses"]
+            return s["hits"] / total if total else 0.0
+
+        self.register_gauge("cache_hits", lambda: stats()["hits"], cache=cache)
+        self.register_gauge("cache_misses", lambda: stats()["misses"], cache=cache)
+        self.register_gauge("cache_hit_ratio", ratio, cache=cache)
+        if "size" in stats():
+            self.register_gauge("cache_size", lambda: stats()["size"], cache=cache)
+
+    @contextmanager
+    def timer(self, name: str, component: Optional[str] = None, **labels: Any) -> Iterator[None]:
+        """
+        with 블록의 실행 시간을 히스토그램에 기록하는 컨텍스트 매니저.
+
+        :param name: 히스토그램 이름
+        :param component: Optional 구성 요소 이름. 주어지면 현재 명령어의 구성 요소별 시간에도 더함
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.observe(name, elapsed, **labels)
+            if component is not None:
+                self.attribute(component, elapsed)
+
+    def timed(self, name: str, **labels: Any) -> Callable[[Callable[..., Awaitable[Any]]], Callable[..., Awaitable[Any]]]:
+        """
+        코루틴 함수의 실행 시간을 히스토그램에 기록하는 데코레이터. (이벤트 처리기 등에 사용)
+        함수 이름은 그대로 유지되므로 `@bot.event` 아래에 붙일 수 있습니다.
+        """
+        def decorator(fn: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+            @functools.wraps(fn)
+            async def wrapper(*args: Any, **kwargs: Any) -> Any:
+                with self.timer(name, **labels):
+                    return await fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    @staticmethod
+    def begin_breakdown() -> Dict[str, float]:
+        """
+        현재 태스크에서 구성 요소별 시간 집계를 시작하는 함수. 반환된 딕셔너리에 시간이 더해집니다.
+        """
+        breakdown: Dict[str, float] = {}
+        _breakdown.set(breakdown)
+        return breakdown
+
+    @staticmethod
+    def attribute(component: str, elapsed: float) -> None:
+        breakdown = _breakdown.get()
+        if breakdown is not None:
+            breakdown[component] = breakdown.get(component, 0.0) + elapsed
+
+    def counter_values(self, name: str) -> Dict[Labels, float]:
+        return dict(self._counters.get(name, {}))
+
+    def histogram_values(self, name: str) -> Dict[Labels, Histogram]:
+        return dict(self._histograms.get(name, {}))
+
+    def gauge_values(self, name: str) -> Dict[Labels, float]:
+        values = dict(self._gauges.get(name, {}))
+        for collector_name, labels, fn in self._collectors:
+            if collector_name == name:
+                values[labels] = fn()
+        return values
+
+    def reset(self) -> None:
+        """
+        기록된 값을 모두 지우는 함수. (등록된 게이지와 설명은 유지)
+        """
+        self._counters.clear()
+        self._gauges.clear()
+        self._histograms.clear()
+
+    def render(self) -> str:
+        """
+        모든 지표를 Prometheus 텍스트 형식(0.0.4)으로 변환하는 함수.
+        """
+        lines: List[str] = []
+
+        def header(name: str, kind: str) -> None:
+            help = self._meta.get(name, (kind, ""))[1]
+            if help:
+                lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        for name in sorted(self._counters):
+            header(name, "counter")
+            for labels, value in sorted(self._counters[name].items()):
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+        gauge_names = set(self._gauges) | {name for name, _, _ in self._collectors}
+        for name in sorted(gauge_names):
+            header(name, "gauge")
+            for labels, value in sorted(self.gauge_values(name).items()):
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+        for name in sorted(self._histograms):
+            header(name, "histogram")
+            for labels, histogram in sorted(self._histograms[name].items()):
+                cumulative = 0
+                for bound, count in zip(histogram.buckets + (float("inf"),), histogram.counts):
+                    cumulative += count
+                    le = (("le", _format_value(bound)),)
+                    lines.append(f"{name}_bucket{_format_labels(labels, le)} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(histogram.sum)}")
+                lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def report(self) -> str:
+        """
+        `!stats` 명령어용 요약 문자열을 만드는 함수.
+        명령어/이벤트별 지연 시간, 구성 요소별 시간, Notion 요청 수, 캐시 적중률, 진행 중인 요청 수를 보여 줍니다.
+        """
+        sections = []
+
+        def latency_lines(name: str, label: str) -> List[str]:
+            result = []
+            for labels, h in sorted(self.histogram_values(name).items(), key=lambda item: -item[1].count):
+                key = dict(labels).get(label, "?")
+                result.append(f"`{key}` {h.count}회 · 평균 {h.sum / h.count * 1000:.0f}ms · "
+                              f"p50≤{_format_value(h.quantile(0.5) * 1000)}ms · p95≤{_format_value(h.quantile(0.95) * 1000)}ms")
+            return result
+
+        commands = latency_lines("bot_command_duration_seconds", "command")
+        if commands:
+            sections.append("**명령어**\n" + "\n".join(commands))
+
+        components: Dict[str, Dict[str, float]] = {}
+        for labels, h in self.histogram_values("bot_command_component_seconds").items():
+            key = dict(labels)
+            components.setdefault(key.get("command", "?"), {})[key.get("component", "?")] = h.sum / h.count
+        if components:
+            sections.append("**명령어별 평균 구성 시간**\n" + "\n".join(
+                f"`{command}` " + " · ".join(f"{component} {seconds * 1000:.0f}ms" for component, seconds in sorted(parts.items()))
+                for command, parts in sorted(components.items())))
+
+        events = latency_lines("bot_event_duration_seconds", "event")
+        if events:
+            sections.append("**이벤트**\n" + "\n".join(events))
+
+        requests: Dict[str, Dict[str, float]] = {}
+        for labels, value in self.counter_values("notion_requests_total").items():
+            key = dict(labels)
+            requests.setdefault(key.get("endpoint", "?"), {})[key.get("status", "?")] = value
+        retries = {dict(labels).get("endpoint"): value for labels, value in self.counter_values("notion_retries_total").items()}
+        if requests:
+            sections.append("**Notion 요청**\n" + "\n".join(
+                f"`{endpoint}` " + ", ".join(f"{status}: {_format_value(count)}" for status, count in sorted(statuses.items()))
+                + (f" (재시도 {_format_value(retries[endpoint])})" if endpoint in retries else "")
+                for endpoint, statuses in sorted(requests.items())))
+
+        ratios = self.gauge_values("cache_hit_ratio")
+        if ratios:
+            sections.append("**캐시 적중률**\n" + "\n".join(
+                f"`{dict(labels).get('cache')}` {value * 100:.1f}%" for labels, value in sorted(ratios.items())))
+
+        in_flight = self.gauge_values("notion_requests_in_flight").get((), 0)
+        queued = self.gauge_values("notion_requests_queued").get((), 0)
+        reactions = self.gauge_values("reaction_queue_depth").get((), 0)
+        sections.append(f"**진행 중** Notion 요청 {_format_value(in_flight)}개 · 대기 {_format_value(queued)}개 · "
+                        f"반응 큐 {_format_value(reactions)}개")
+        return "\n\n".join(sections)
+
+    async def start_server(self, host: str = "127.0.0.1", port: int = 9100):
+        """
+        `/metrics` 경로로 Prometheus 텍스트를 제공하는 HTTP 서버를 시작하는 함수.
+
+        :param host: 바인딩할 주소 (기본값은 로컬에서만 접근 가능)
+        :param port: 포트 번호
+        :return: 종료 시 `cleanup()`을 호출할 aiohttp AppRunner
+        """
+        from aiohttp import web  # 지표 서버를 켤 때만 불러옴
+
+        async def handle(request: web.Request) -> web.Response:
+            return web.Response(text=self.render(), content_type="text/plain", charset="utf-8",
+                                headers={"X-Content-Type-Options": "nosniff"})
+
+        app = web.Application()
+        app.router.add_get("/metrics", handle)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, host, port).start()
+        return runner
+
+
+# 모듈 전역 지표 저장소
+metrics = MetricsRegistry()
+
+metrics.describe("bot_command_duration_seconds", "histogram", "명령어 처리 시간")
+metrics.describe("bot_command_component_seconds", "histogram", "명령어 처리 중 구성 요소(notion, dateparser, discord)별 시간")
+metrics.describe("bot_commands_total", "counter", "처리한 명령어 수")
+metrics.describe("bot_event_duration_seconds", "histogram", "이벤트 처리기 실행 시간")
+metrics.describe("notion_requests_total", "counter", "Notion API 응답 수 (엔드포인트, 상태 코드별)")
+metrics.describe("notion_retries_total", "counter", "429/5xx 응답으로 재시도한 Notion 요청 수")
+metrics.describe("notion_request_duration_seconds", "histogram", "Notion API 요청 한 번의 응답 시간")
+metrics.describe("notion_queue_wait_seconds", "histogram", "스케줄러에서 요청 토큰을 기다린 시간")
+metrics.describe("notion_requests_in_flight", "gauge", "응답을 기다리는 중인 Notion 요청 수")
+metrics.describe("notion_requests_queued", "gauge", "스케줄러에서 대기 중인 Notion 요청 수")
+metrics.describe("discord_request_duration_seconds", "histogram", "Discord API 요청 시간")
+metrics.describe("dateparser_duration_seconds", "histogram", "dateparser로 날짜 표현을 해석한 시간")
+metrics.describe("cache_hits", "gauge", "캐시 적중 수")
+metrics.describe("cache_misses", "gauge", "캐시 미스 수")
+metrics.describe("cache_hit_ratio", "gauge", "캐시 적중률")
+metrics.describe("cache_size", "gauge", "캐시 항목 수")
@@ -0,0 +1,454 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import TYPE_CHECKING, List, Dict, Any, Iterable, Sequence, Type, Union, Optional
+
+if TYPE_CHECKING:
+    from notion_client import AsyncClient  # 타입 표기용 (실제 import는 클라이언트 생성 시점)
+
+from utils.notion import search_members_in_database, normalize_page_id, remember_titles
+from utils.notion import retrieve_page
+from utils.evaluator import query_pages, UnsupportedFilter
+from utils.records import Record, Page, Member, Schedule
+from utils.search_index import NameIndex
+from utils.date_index import DateIndex, date_bounds
+from utils.scheduler import current_priority, Priority
+from utils.coalesce import coalesced_request
+from utils.metrics import metrics
+from utils.tracing import tracer
+from utils.store import MirrorStore
+
+
+class DatabaseMirror:
+    """
+    Notion 데이터베이스의 모든 페이지를 메모리에 상주시키는 미러.
+    최초 1회 전체를 불러온 뒤, `last_edited_time`을 기준으로 변경된 페이지만 주기적으로 갱신합니다.
+    저장소(`MirrorStore`)가 주어지면 스냅샷과 high-water mark를 저장하여 재시작 후에도 증분 갱신부터 시작하고,
+    증분 갱신으로는 알 수 없는 삭제를 찾기 위해 주기적으로 전체 페이지 ID를 대조합니다.
+    제목 속성은 이름 검색 색인(`NameIndex`)에 함께 반영됩니다.
+    페이지는 원본 JSON 대신 `record_type` 레코드로 한 번만 해석해 저장합니다. (스냅샷 저장소에는 원본 JSON을 저장)
+    """
+
+    # 미러에 저장할 레코드 타입
+    record_type: Type[Record] = Page
+
+    # 전체 대조 시 가져올 속성 ID (제목 속성의 ID는 항상 'title'이므로 응답이 가장 작음)
+    RECONCILE_PROPERTY = "title"
+
+    def __init__(self, database_id: str, refresh_interval: float = 60, title_property: str = "이름",
+                 store: Optional[MirrorStore] = None, reconcile_interval: float = 3600):
+        """
+        :param database_id: 미러링할 Notion 데이터베이스 ID
+        :param refresh_interval: 백그라운드 증분 갱신 주기 (초)
+        :param title_property: 이름 검색 색인에 사용할 제목 속성 이름
+        :param store: Optional 스냅샷 저장소 (없으면 재시작 시 전체를 다시 불러옴)
+        :param reconcile_interval: 삭제된 페이지를 찾기 위한 전체 대조 주기 (초, 0이면 하지 않음)
+        """
+        self.database_id = database_id
+        self.refresh_interval = refresh_interval
+        self.title_property = title_property
+        self.store = store
+        self.reconcile_interval = reconcile_interval
+        self.pages: Dict[str, Record] = {}
+        self.name_index = NameIndex()
+        self.high_water_mark: Optional[str] = None
+        self.reconciled_at: Optional[float] = None  # 마지막 전체 대조(또는 전체 로드) 시각 (time.time())
+        self.loaded = False
+        self._task: Optional[asyncio.Task] = None
+
+    async def _query_all(self, notion: AsyncClient, filter: Optional[Dict[str, Any]] = None,
+                         filter_properties: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        데이터베이스를 페이지네이션하여 조건에 맞는 모든 페이지를 가져오는 함수.
+
+        :param notion: Notion 비동기 API 클라이언트 객체
+        :param filter: Optional Notion 필터
+        :param filter_properties: Optional 응답에 포함할 속성 ID 리스트
+        :return: 페이지 딕셔너리 리스트
+        """
+        result_list = []
+        start_cursor = None
+        has_more = True
+
+        while has_more:
+            kwargs = {'database_id': self.database_id, 'start_cursor': start_cursor}
+            if filter:
+                kwargs['filter'] = filter
+            if filter_properties:
+                kwargs['filter_properties'] = filter_properties
+            result = await coalesced_request(notion.databases.query, **kwargs)
+            result_list.extend(result['results'])
+            has_more = result.get('has_more', False)
+            start_cursor = result.get('next_cursor', None)
+
+        return result_list
+
+    async def load(self, notion: AsyncClient) -> None:
+        """
+        데이터베이스 전체를 불러와 미러를 채우는 함수.
+
+        :param notion: Notion 비동기 API 클라이언트 객체
+        """
+        pages = await self._query_all(notion)
+        self.clear()
+        self.apply(pages)
+        self.loaded = True
+        self.reconciled_at = time.time()
+        self._persist(pages, reconciled_at=self.reconciled_at, replace=True)
+        metrics.inc("mirror_syncs_total", mirror=type(self).__name__, kind="full")
+
+    def restore(self) -> bool:
+        """
+        저장소의 스냅샷으로 미러를 채우는 함수. 이후 `refresh`는 저장된 high-water mark 이후의 변경만 가져옵니다.
+
+        :return: 스냅샷을 불러왔으면 True
+        """
+        if self.store is None:
+            return False
+        pages, high_water_mark, reconciled_at = self.store.load(self.database_id)
+        if high_water_mark is None:
+            return False
+        self.clear()
+        self.apply(pages)
+        self.high_water_mark = high_water_mark
+        self.reconciled_at = reconciled_at
+        self.loaded = True
+        return True
+
+    async def refresh(self, notion: AsyncClient) -> int:
+        """
+        마지막 갱신 이후 수정된 페이지만 가져와 미러에 반영하는 함수.
+        Notion의 `last_edited_time`은 분 단위이므로 `on_or_after`로 겹치게 조회합니다. (재적용은 멱등)
+        아직 불러오지 않았으면 저장된 스냅샷을, 스냅샷도 없으면 전체를 불러옵니다.
+
+        :param notion: Notion 비동기 API 클라이언트 객체
+        :return: 반영된 페이지 수 (이미 반영된 페이지를 다시 받은 경우는 제외)
+        """
+        if not self.loaded:
+            self.restore()
+        if not self.loaded or not self.high_water_mark:
+            await self.load(notion)
+            return len(self.pages)
+
+        pages = await self._query_all(notion, filter={
+            'timestamp': 'last_edited_time',
+            'last_edited_time': {'on_or_after': self.high_water_mark}
+        })
+        # high-water mark와 같은 분에 수정된 페이지는 매번 다시 오므로, 미러와 수정 시각이 같으면 건너뜀
+        pages = [page for page in pages if not self._unchanged(page)]
+        self.apply(pages)
+        if pages:
+            self._persist([page for page in pages if not page.get('archived', False)],
+                          [normalize_page_id(page['id']) for page in pages if page.get('archived', False)])
+        metrics.inc("mirror_syncs_total", mirror=type(self).__name__, kind="delta")
+        metrics.inc("mirror_pages_synced_total", len(pages), mirror=type(self).__name__)
+        return len(pages)
+
+    def _unchanged(self, page: Dict[str, Any]) -> bool:
+        record = self.pages.get(normalize_page_id(page['id']))
+        if page.get('archived', False):
+            return record is None
+        return record is not None and record.last_edited_time == page.get('last_edited_time')
+
+    async def reconcile(self, notion: AsyncClient) -> int:
+        """
+        전체 페이지의 ID와 수정 시각만 가져와 미러와 대조하는 함수.
+        증분 갱신으로는 알 수 없는 삭제(휴지통 이동, 다른 데이터베이스로 이동)를 반영하고,
+        증분 갱신에서 빠진 변경이 있으면 해당 페이지만 다시 가져옵니다. 빠진 페이지가 많으면 전체를 다시 불러옵니다.
+
+        :param notion: Notion 비동기 API 클라이언트 객체
+        :return: 제거되거나 다시 가져온 페이지 수
+        """
+        summaries = await self._query_all(notion, filter_properties=[self.RECONCILE_PROPERTY])
+        remote = {normalize_page_id(page['id']): page.get('last_edited_time') for page in summaries}
+
+        removed = [page_id for page_id in self.pages if page_id not in remote]
+        stale = [page_id for page_id, edited in remote.items()
+                 if page_id not in self.pages or self.pages[page_id].last_edited_time != edited]
+        # 다시 가져올 페이지가 쿼리 몇 번보다 많으면 전체를 불러오는 편이 요청 수가 적음
+        if len(stale) > len(remote) // 100 + 1:
+            await self.load(notion)
+            return len(removed) + len(stale)
+
+        for page_id in removed:
+            self._unindex(self.pages.pop(page_id))
+        pages = await asyncio.gather(*[retrieve_page(notion, page_id) for page_id in stale])
+        self.apply(list(pages))
+        self.reconciled_at = time.time()
+        self._persist(pages, removed, reconciled_at=self.reconciled_at)
+        metrics.inc("mirror_syncs_total", mirror=type(self).__name__, kind="reconcile")
+        return len(removed) + len(stale)
+
+    def _reconcile_due(self) -> bool:
+        return self.reconcile_interval > 0 and (
+            self.reconciled_at is None or time.time() - self.reconciled_at >= self.reconcile_interval)
+
+    def _persist(self, pages: Iterable[Dict[str, Any]] = (), removed: Iterable[str] = (),
+                 reconciled_at: Optional[float] = None, replace: bool = False) -> None:
+        if self.store is None:
+            return
+        try:
+            self.store.save(self.database_id, pages, removed, self.high_water_mark, reconciled_at, replace)
+        except Exception as e:
+            # 저장 실패는 다음 재시작 때 전체 로드로 이어질 뿐이므로 미러 갱신은 계속함
+            print(f"Error in mirror persist ({self.database_id}): {str(e)}")
+
+    def clear(self) -> None:
+        self.pages.clear()
+        self.name_index.clear()
+        self.high_water_mark = None
+
+    def apply(self, pages: Union[Dict[str, Any], List[Dict[str, Any]]]) -> None:
+        """
+        페이지들을 레코드로 변환해 미러에 추가하거나 갱신하는 함수. 보관(archived)된 페이지는 제거합니다.
+
+        :param pages: list of dict or dict (Notion 페이지, 전체 속성을 가진 페이지여야 함)
+        """
+        pages = [pages] if isinstance(pages, dict) else pages
+        for page in pages:
+            if page.get('archived', False):
+                page_id = normalize_page_id(page['id'])
+                if page_id in self.pages:
+                    self._unindex(self.pages.pop(page_id))
+            else:
+                self.put(self.record_type.from_page(page))
+                remember_titles(page)
+
+            edited = page.get('last_edited_time')
+            if edited and (self.high_water_mark is None or edited > self.high_water_mark):
+                self.high_water_mark = edited
+
+    def put(self, record: Record) -> None:
+        """
+        이미 변환된 레코드를 미러에 추가하거나 갱신하는 함수. (high-water mark는 바꾸지 않음)
+
+        :param record: 전체 속성으로 만든 레코드
+        """
+        page_id = normalize_page_id(record.id)
+        if page_id in self.pages:
+            self._unindex(self.pages.pop(page_id))
+        self.pages[page_id] = record
+        self._index(record)
+
+    def get(self, page_id: str) -> Optional[Record]:
+        """
+        페이지 ID로 미러에 저장된 페이지를 반환하는 함수.
+
+        :param page_id: Notion 페이지 ID ('-' 포함 여부 무관)
+        :return: 레코드 또는 None
+        """
+        return self.pages.get(normalize_page_id(page_id))
+
+    def query(self, filter: Optional[Dict[str, Any]] = None,
+              sorts: Optional[List[Dict[str, Any]]] = None) -> List[Record]:
+        """
+        미러에 있는 페이지를 `databases.query`와 같은 필터/정렬로 조회하는 함수. (네트워크 요청 없음)
+
+        :param filter: Optional Notion 필터 (`Condition.get_filters()` 결과)
+        :param sorts: Optional Notion 정렬 조건 리스트
+        :return: 조건에 맞는 레코드 리스트
+        :raises UnsupportedFilter: 로컬에서 평가할 수 없는 필터인 경우
+        """
+        return query_pages(self.pages.values(), filter, sorts)
+
+    def search(self, name: str, filter: Optional[Dict[str, Any]] = None,
+               sorts: Optional[List[Dict[str, Any]]] = None, k: Optional[int] = None) -> List[Record]:
+        """
+        이름 색인으로 페이지를 검색하는 함수. 결과는 이름 일치 순위대로 정렬되며,
+        정렬 조건이 주어지면 그 조건으로 다시 정렬합니다. (같은 값끼리는 순위 유지)
+
+        :param name: 검색어 (음절 일부나 초성도 가능)
+        :param filter: Optional 추가로 적용할 Notion 필터
+        :param sorts: Optional Notion 정렬 조건 리스트
+        :param k: Optional 반환할 최대 페이지 수 (자동 완성 등)
+        :return: 레코드 리스트
+        :raises UnsupportedFilter: 로컬에서 평가할 수 없는 필터인 경우
+        """
+        if filter is None and not sorts:
+            return [self.pages[page_id] for page_id, _ in self.name_index.search(name, k)]
+        pages = [self.pages[page_id] for page_id, _ in self.name_index.search(name)]
+        return query_pages(pages, filter, sorts)[:k]
+
+    def _index(self, record: Record) -> None:
+        try:
+            title = record.get_property(self.title_property)[1]
+        except UnsupportedFilter:
+            title = None
+        self.name_index.add(normalize_page_id(record.id), title)
+
+    def _unindex(self, record: Record) -> None:
+        self.name_index.remove(normalize_page_id(record.id))
+
+    def start(self, notion: AsyncClient) -> None:
+        """
+        백그라운드 갱신 태스크를 시작하는 함수. 이미 실행 중이면 아무 것도 하지 않습니다.
+
+        :param notion: Notion 비동기 API 클라이언트 객체
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(notion))
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self, notion: AsyncClient) -> None:
+        # 백그라운드 갱신은 가장 낮은 우선순위 레인을 사용하고, 시작시킨 이벤트의 구간에 붙지 않음 (이 태스크에만 적용)
+        current_priority.set(Priority.BACKGROUND)
+        tracer.detach()
+        while True:
+            try:
+                await self.refresh(notion)
+                if self._reconcile_due():
+                    await self.reconcile(notion)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Error in mirror refresh ({self.database_id}): {str(e)}")
+            await asyncio.sleep(self.refresh_interval)
+
+
+class ScheduleMirror(DatabaseMirror):
+    """
+    일정 데이터베이스 미러. 날짜 속성을 `DateIndex`로 색인하여 기간 검색을 이분 탐색으로 처리합니다.
+    """
+
+    record_type = Schedule
+
+    def __init__(self, database_id: str, refresh_interval: float = 60, title_property: str = "이름",
+                 date_property: str = "날짜", **kwargs: Any):
+        super().__init__(database_id, refresh_interval, title_property, **kwargs)
+        self.date_property = date_property
+        self.date_index = DateIndex()
+
+    def clear(self) -> None:
+        super().clear()
+        self.date_index.clear()
+
+    def _index(self, record: Schedule) -> None:
+        super()._index(record)
+        self.date_index.add(normalize_page_id(record.id), record.date, record.date_end)
+
+    def _unindex(self, record: Schedule) -> None:
+        super()._unindex(record)
+        self.date_index.remove(normalize_page_id(record.id))
+
+    def query(self, filter: Optional[Dict[str, Any]] = None,
+              sorts: Optional[List[Dict[str, Any]]] = None) -> List[Schedule]:
+        """
+        `DatabaseMirror.query`와 같지만, 필터에 날짜 범위 조건이 있으면 날짜 색인으로 후보를 좁힌 뒤
+        나머지 조건만 평가합니다. 색인은 시각을 포함한 시작 값으로 정렬되어 있어 결과가 이미 날짜 오름차순이므로
+        그 정렬은 다시 하지 않습니다.
+        """
+        bounds = date_bounds(filter, self.date_property)
+        ascending = [{'property': self.date_property, 'direction': 'ascending'}]
+        if bounds is None or (sorts and sorts != ascending):
+            return super().query(filter, sorts)
+
+        lower, upper, rest = bounds
+        pages = [self.pages[page_id] for page_id in self.date_index.between(lower, upper)]
+        return query_pages(pages, {'and': rest} if rest else None)
+
+    def upcoming(self, after: str, k: int = 5) -> List[Schedule]:
+        """
+        after 이후(당일 포함)에 시작하는 일정을 가까운 순으로 k개 반환하는 함수.
+
+        :param after: 기준 날짜 (ISO 문자열)
+        :param k: 반환할 최대 일정 수
+        :return: 일정 레코드 리스트
+        """
+        return [self.pages[page_id] for page_id in self.date_index.upcoming(after, k)]
+
+    def overlapping(self, start: str, end: str) -> List[Schedule]:
+        """
+        기간이 [start, end]와 겹치는 일정을 시작일 순으로 반환하는 함수.
+
+        :param start: 하한 날짜 (ISO 문자열)
+        :param end: 상한 날짜 (ISO 문자열)
+        :return: 일정 레코드 리스트
+        """
+        return [self.pages[page_id] for page_id in self.date_index.overlapping(start, end)]
+
+
+class MemberMirror(DatabaseMirror):
+    """
+    멤버 데이터베이스 미러. 페이지 ID 외에 `Discord ID`와 `이름`으로도 O(1) 조회가 가능합니다.
+    """
+
+    record_type = Member
+
+    def __init__(self, database_id: str, refresh_interval: float = 60, title_property: str = "이름", **kwargs: Any):
+        super().__init__(database_id, refresh_interval, title_property, **kwargs)
+        self.by_discord_id: Dict[str, str] = {}
+        self.by_name: Dict[str, List[str]] = {}
+
+    def clear(self) -> None:
+        super().clear()
+        self.by_discord_id.clear()
+        self.by_name.clear()
+
+    def _index(self, record: Member) -> None:
+        super()._index(record)
+        page_id = normalize_page_id(record.id)
+
+        if record.discord_id:
+            self.by_discord_id[record.discord_id.strip()] = page_id
+        if record.name:
+            self.by_name.setdefault(record.name, []).append(page_id)
+
+    def _unindex(self, record: Member) -> None:
+        super()._unindex(record)
+        page_id = normalize_page_id(record.id)
+
+        if record.discord_id and self.by_discord_id.get(record.discord_id.strip()) == page_id:
+            del self.by_discord_id[record.discord_id.strip()]
+        if record.name and page_id in self.by_name.get(record.name, []):
+            self.by_name[record.name].remove(page_id)
+            if not self.by_name[record.name]:
+                del self.by_name[record.name]
+
+    def find_by_discord_id(self, discord_id: Union[str, int]) -> Optional[Member]:
+        """
+        Discord ID로 멤버 페이지를 찾는 함수. 네트워크 요청 없이 미러에서만 조회합니다.
+
+        :param discord_id: 디스코드 ID (string 또는 int)
+        :return: 멤버 레코드 또는 None
+        """
+        page_id = self.by_discord_id.get(str(discord_id).strip())
+        return self.pages.get(page_id) if page_id else None
+
+    def find_by_name(self, name: str) -> List[Member]:
+        """
+        이름이 정확히 일치하는 멤버 페이지들을 찾는 함수.
+
+        :param name: 멤버 이름
+        :return: 멤버 레코드 리스트
+        """
+        return [self.pages[page_id] for page_id in self.by_name.get(name, [])]
+
+    async def lookup_discord_id(self, notion: AsyncClient, discord_id: Union[str, int],
+                                properties: Optional[Sequence[str]] = None) -> Optional[Member]:
+        """
+        Discord ID로 멤버 페이지를 찾는 함수.
+        미러에 없으면 기존 Notion 쿼리 경로로 조회하고, 찾은 결과를 미러에 반영합니다.
+        이때 high-water mark는 바꾸지 않습니다. (한 페이지의 수정 시각으로 올리면 그보다 먼저 수정된 다른 페이지를 증분 갱신에서 놓침)
+
+        :param notion: Notion 비동기 API 클라이언트 객체
+        :param discord_id: 디스코드 ID (string 또는 int)
+        :param properties: Optional Notion에서 조회할 때 가져올 속성 이름들 (일부만 가져온 결과는 미러에 반영하지 않음)
+        :return: 멤버 레코드 또는 None
+        """
+        member = self.find_by_discord_id(discord_id)
+        if member:
+            return member
+
+        # 한 명만 필요하므로 page_size=1로 한 번만 요청
+        result = await search_members_in_database(notion, self.database_id, [{'discord_id': str(discord_id)}],
+                                                  limit=1, properties=properties)
+        if result and len(result[0]) > 0:
+            if not properties:
+                self.put(result[0][0])
+            return result[0][0]
+        return None
@@ -1,41 +1,208 @@
+from __future__ import annotations
+
 import asyncio
-from notion_client import AsyncClient  # 비동기 클라이언트 사용
-from dotenv import load_dotenv
-from pprint import pprint
-import os
-from enum import Enum
-from typing import List, Dict, Any, Union, Optional
+from typing import TYPE_CHECKING, List, Dict, Any, AsyncIterator, Awaitable, Callable, Sequence, Union, Optional
+
+if TYPE_CHECKING:
+    from notion_client import AsyncClient  # 타입 표기용 (실제 import는 클라이언트 생성 시점)
+    from utils.mirror import DatabaseMirror
 
 from utils.condition import Condition
+from utils.evaluator import UnsupportedFilter
+from utils.records import ROLES, ROLES_DEVREL, TIER, Member, Schedule
+from utils.schema import schema_registry
+from utils.scheduler import scheduler
+from utils.coalesce import coalesced_request
+from utils.cache import TTLCache
+from utils.metrics import metrics
+from utils.tracing import tracer
+
+# 페이지 제목 캐시 (정규화된 페이지 ID -> 제목)
+title_cache = TTLCache(maxsize=4096, ttl=600)
+metrics.register_cache("titles", title_cache.stats)
+
+# Notion 목록 API가 한 번에 돌려주는 최대 결과 수
+MAX_PAGE_SIZE = 100
+
+# 용도별로 필요한 멤버 속성 (NOTION_MEMBER_DB_PROPERTIES 중 일부만 요청하여 응답 크기를 줄임)
+MEMBER_LOOKUP_PROPERTIES = ('Discord ID',)      # 반응 처리: 페이지 ID만 필요
+MEMBER_LIST_PROPERTIES = ('이름', '활동 분야')    # !멤버 목록
+# !일정 목록에 필요한 일정 속성
+SCHEDULE_LIST_PROPERTIES = ('이름', '장소', '날짜')
 
-# Enum 클래스 정의
-class ROLES(str, Enum):
-    DEVREL = "💝 DevRel (Developer Relations)"
-    DESIGNER = "🎨 Designer"
-    SWE = "🖥️ SWE (Software Engineer)"
+NOTION_MEMBER_DB_PROPERTIES = ['Discord ID', '희망 직군 (SWE)', '출석 행사', '입학 년도', '티어 (DevRel)', '티어 (SWE)', '티어 (Designer)', 'GitHub (SWE)', '등록 행사', '활동 분야 (DevRel)', 'branch/junior 이수 여부', 'branch/git 등록', '전화번호', '결석 행사', '전공', '영문 성명', '이중/심화/융합/복수 전공', '이메일', '학번', '이름', '활동 분야']
 
-class ROLES_DEVREL(str, Enum):
-    DE = "✍️ DE (Developer Educator)"
-    CB = "👪 CB (Community Builder)"
+def normalize_page_id(page_id: str) -> str:
+    """
+    Notion 페이지 ID에서 '-'를 제거하여 비교 가능한 형태로 만드는 함수.
 
-class TIER(str, Enum):
-    JUNIOR = "🌱 Junior"
-    MEMBER = "👥 Member"
-    CORE = "🔥 Core Member"
-    DEVREL_LEAD = "⭐ DevRel Lead"
-    LEAD = "⭐ Lead"
+    :param page_id: Notion 페이지 ID ('-' 포함 여부 무관)
+    :return: '-'가 제거된 페이지 ID
+    """
+    return page_id.replace("-", "")
+
+
+def create_notion_client(auth: str, pool_size: int = 10, keepalive_expiry: float = 60,
+                         base_url: Optional[str] = None) -> AsyncClient:
+    """
+    연결 풀을 유지하는 Notion 비동기 클라이언트를 생성하는 함수.
+    봇 전체에서 하나만 만들어 공유하고, 종료 시 `aclose()`로 닫아야 합니다.
+    
+    :param auth: Notion API 키
+    :param pool_size: 최대 동시 연결 수 (keep-alive 연결 수도 동일하게 유지)
+    :param keepalive_expiry: 유휴 연결을 유지할 시간 (초)
+    :param base_url: Optional API 주소 (로컬 테스트 서버 등, None이면 Notion 기본값)
+    :return: Notion 비동기 API 클라이언트 객체
+    """
+    import httpx
+    from notion_client import AsyncClient
+
+    limits = httpx.Limits(
+        max_connections=pool_size,
+        max_keepalive_connections=pool_size,
+        keepalive_expiry=keepalive_expiry,
+    )
+    options = {'base_url': base_url} if base_url else {}
+    return AsyncClient(auth=auth, client=httpx.AsyncClient(limits=limits), **options)
+
+
+@tracer.traced()
+async def retrieve_page(notion: AsyncClient, page_id: str) -> Dict[str, Any]:
+    """
+    단일 페이지 정보를 가져오는 함수.
+    
+    :param notion: Notion 비동기 API 클라이언트 객체
+    :param page_id: Notion 페이지 ID
+    :return: 페이지 딕셔너리
+    """
+    return await coalesced_request(notion.pages.retrieve, page_id=page_id)
+
+
+@tracer.traced()
+async def update_page_properties(notion: AsyncClient, page_id: str, properties: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    페이지의 속성을 업데이트하는 함수.
+    
+    :param notion: Notion 비동기 API 클라이언트 객체
+    :param page_id: Notion 페이지 ID
+    :param properties: 업데이트할 속성 딕셔너리
+    :return: 업데이트된 페이지 딕셔너리
+    """
+    return await scheduler.request(notion.pages.update, page_id=page_id, properties=properties)
+
+
+async def paginate(request: Callable[..., Awaitable[Dict[str, Any]]], limit: Optional[int] = None,
+                   **kwargs: Any) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Notion 목록 API(databases.query, pages.properties.retrieve 등)의 결과를 응답이 도착하는 대로 하나씩 내보내는 비동기 제너레이터.
+    limit이 주어지면 남은 개수만큼만 `page_size`로 요청하고, limit개를 내보냈거나 소비하는 쪽이 중단하면 다음 페이지를 요청하지 않습니다.
+
+    :param request: Notion API 메서드
+    :param limit: Optional 최대 결과 수 (None이면 전부)
+    :param kwargs: API에 넘길 인자
+    :return: 결과 항목을 하나씩 내보내는 비동기 이터레이터
+    """
+    start_cursor = None
+    remaining = limit
+    while remaining is None or remaining > 0:
+        if remaining is not None:
+            kwargs['page_size'] = min(remaining, MAX_PAGE_SIZE)
+        result = await coalesced_request(request, start_cursor=start_cursor, **kwargs)
+        items = result.get('results', [])
+        if remaining is not None:
+            items = items[:remaining]
+            remaining -= len(items)
+        for item in items:
+            yield item
+
+        # 다음 페이지가 있는지 확인
+        if not result.get('has_more', False):
+            return
+        start_cursor = result.get('next_cursor', None)
+
+
+async def _projection(notion: AsyncClient, database_id: str, properties: Optional[Sequence[str]]) -> Dict[str, Any]:
+    # 속성 이름을 스키마의 속성 ID로 바꿔 `filter_properties` 인자로 만듦 (바꿀 수 없으면 전체 속성 요청)
+    if not properties:
+        return {}
+    property_ids = await schema_registry.property_ids(notion, database_id, properties)
+    return {'filter_properties': property_ids} if property_ids else {}
 
-NOTION_MEMBER_DB_PROPERTIES = ['Discord ID', '희망 직군 (SWE)', '출석 행사', '입학 년도', '티어 (DevRel)', '티어 (SWE)', '티어 (Designer)', 'GitHub (SWE)', '등록 행사', '활동 분야 (DevRel)', 'branch/junior 이수 여부', 'branch/git 등록', '전화번호', '결석 행사', '전공', '영문 성명', '이중/심화/융합/복수 전공', '이메일', '학번', '이름', '활동 분야']
 
+def _member_filters(tier: Optional[TIER], name: Optional[str], discord_id: Optional[Union[str, int]],
+                    role: Optional[ROLES]) -> Dict[str, str]:
+    filters = {}
+
+    # 주어진 조건에 따라 필터를 동적으로 추가
+    if tier:
+        filters['티어 (SWE)'] = tier.value
+    if name:
+        filters['이름'] = f"contains {name}"
+    if discord_id:
+        discord_id = str(discord_id) if isinstance(discord_id, int) else discord_id
+        filters['Discord ID'] = discord_id
+    if role:
+        filters['활동 분야'] = role.value
+    return filters
+
+
+async def iter_members_in_notion(notion: AsyncClient, condition: Condition,
+                                 database_id: str,
+                                 tier: Optional[TIER] = None,
+                                 name: Optional[str] = None,
+                                 discord_id: Optional[Union[str, int]] = None,
+                                 role: Optional[ROLES] = None,
+                                 mirror: Optional[DatabaseMirror] = None,
+                                 limit: Optional[int] = None,
+                                 properties: Optional[Sequence[str]] = None) -> AsyncIterator[Member]:
+    """
+    `find_members_in_notion`의 스트리밍 버전. 결과를 Notion 응답이 도착하는 대로 하나씩 내보냅니다.
+    limit이 주어지면 그 수만큼만 요청하므로, 한 명만 필요한 조회는 작은 요청 한 번으로 끝납니다.
+
+    :param limit: Optional 최대 결과 수 (None이면 전부)
+    :param properties: Optional 응답에 포함할 속성 이름들 (None이면 전부, 미러에서 찾은 결과는 항상 전체 속성)
+    :return: 멤버 레코드를 하나씩 내보내는 비동기 이터레이터 (가져오지 않은 속성은 None)
+    """
+    filters = _member_filters(tier, name, discord_id, role)
+    if not filters:
+        raise ValueError("At least one condition must be provided.")
+
+    cond = condition(filters)
+    if mirror is not None and mirror.loaded:
+        try:
+            if name:
+                # 이름은 색인으로 찾아 순위대로 반환 (음절 일부, 초성 검색 가능)
+                rest = {key: value for key, value in filters.items() if key != '이름'}
+                pages = mirror.search(name, condition(rest).get_filters() if rest else None)
+            else:
+                pages = mirror.query(cond.get_filters())
+        except UnsupportedFilter:
+            pages = None  # 로컬에서 평가할 수 없는 필터는 API로 조회
+        if pages is not None:
+            for page in pages[:limit]:
+                yield page
+            return
+
+    projection = await _projection(notion, database_id, properties)
+    async for page in paginate(notion.databases.query, limit, database_id=database_id, filter=cond.get_filters(),
+                               **projection):
+        remember_titles(page)
+        yield Member.from_page(page)
+
+
+@tracer.traced()
 async def find_members_in_notion(notion: AsyncClient, condition: Condition, 
                                  database_id: str,
                                  tier: Optional[TIER] = None, 
                                  name: Optional[str] = None, 
                                  discord_id: Optional[Union[str, int]] = None,
-                                 role: Optional[ROLES] = None) -> List[Dict[str, Any]]:
+                                 role: Optional[ROLES] = None,
+                                 mirror: Optional[DatabaseMirror] = None,
+                                 limit: Optional[int] = None,
+                                 properties: Optional[Sequence[str]] = None) -> List[Member]:
     """
     Notion 데이터베이스에서 티어, 이름, 역할 등 여러 조건을 선택적으로 사용할 수 있는 멤버 검색 함수.
-    페이지네이션을 처리하여 모든 결과를 반환합니다.
+    페이지네이션을 처리하여 모든 결과(또는 limit개)를 반환합니다. 불러온 미러가 주어지면 API 호출 없이 미러에서 필터를 평가합니다.
     
     :param notion: Notion 비동기 API 클라이언트 객체
     :param condition: Condition 객체, Notion 필터 조건 생성에 사용
@@ -44,51 +211,91 @@ async def find_members_in_notion(notion: AsyncClient, condition: Condition,
     :param name: Optional 이름 조건 (string)
     :param discord_id: Optional 디스코드 ID 조건 (string 또는 int)
     :param role: Optional 역할 조건 (ROLES Enum)
-    :return: 검색 결과를 포함한 딕셔너리 리스트
+    :param mirror: Optional 멤버 데이터베이스 미러
+    :param limit: Optional 최대 결과 수 (None이면 전부)
+    :param properties: Optional 응답에 포함할 속성 이름들 (None이면 전부)
+    :return: 검색 결과 멤버 레코드 리스트
     """
+    return [page async for page in iter_members_in_notion(notion, condition, database_id, tier=tier, name=name,
+                                                          discord_id=discord_id, role=role, mirror=mirror, limit=limit,
+                                                          properties=properties)]
+
+
+def _schedule_filters(name: Optional[str], tag: Optional[str], date: Optional[str]) -> Dict[str, str]:
     filters = {}
-    
+
     # 주어진 조건에 따라 필터를 동적으로 추가
-    if tier:
-        filters['티어 (SWE)'] = tier.value
     if name:
         filters['이름'] = f"contains {name}"
-    if discord_id:
-        discord_id = str(discord_id) if isinstance(discord_id, int) else discord_id
-        filters['Discord ID'] = discord_id
-    if role:
-        filters['활동 분야'] = role.value
-    
-    if filters:
-        cond = condition(filters)
-        result_list = []
-        start_cursor = None
-        has_more = True
-        
-        while has_more:
-            result = await notion.databases.query(
-                database_id=database_id, 
-                filter=cond.get_filters(),
-                start_cursor=start_cursor,
-            )
-            result_list.extend(result['results'])
-            has_more = result.get('has_more', False)
-            start_cursor = result.get('next_cursor', None)
-            
-        return result_list
-    
-    else:
-        raise ValueError("At least one condition must be provided.")
+    if tag:
+        filters['태그'] = tag
+    if date:
+        filters['날짜'] = date
+    return filters
+
+
+async def iter_schedules_in_notion(notion: AsyncClient, condition: Condition,
+                                   database_id: str,
+                                   name: Optional[str] = None,
+                                   tag: Optional[str] = None,
+                                   date: Optional[str] = None,
+                                   mirror: Optional[DatabaseMirror] = None,
+                                   limit: Optional[int] = None,
+                                   properties: Optional[Sequence[str]] = None) -> AsyncIterator[Schedule]:
+    """
+    `find_schedule_in_notion`의 스트리밍 버전. 결과를 날짜순으로, Notion 응답이 도착하는 대로 하나씩 내보냅니다.
 
+    :param limit: Optional 최대 결과 수 (None이면 전부)
+    :param properties: Optional 응답에 포함할 속성 이름들 (None이면 전부, 미러에서 찾은 결과는 항상 전체 속성)
+    :return: 일정 레코드를 하나씩 내보내는 비동기 이터레이터 (가져오지 않은 속성은 None)
+    """
+    filters = _schedule_filters(name, tag, date)
+    if not filters:
+        raise ValueError("At least one condition must be provided.")
 
+    # dateparser가 필요한 날짜 표현은 워커 스레드에서 미리 변환
+    await condition.prepare(filters)
+    cond = condition(filters)
+    sorts = [
+        {
+            'property': "날짜",
+            'direction': 'ascending'
+        }
+    ]
+    if mirror is not None and mirror.loaded:
+        try:
+            if name:
+                # 이름은 색인으로 찾고 (음절 일부, 초성 검색 가능) 날짜순으로 정렬
+                rest = {key: value for key, value in filters.items() if key != '이름'}
+                pages = mirror.search(name, condition(rest).get_filters() if rest else None, sorts=sorts)
+            else:
+                pages = mirror.query(cond.get_filters(), sorts=sorts)
+        except UnsupportedFilter:
+            pages = None  # 로컬에서 평가할 수 없는 필터는 API로 조회
+        if pages is not None:
+            for page in pages[:limit]:
+                yield page
+            return
+
+    projection = await _projection(notion, database_id, properties)
+    async for page in paginate(notion.databases.query, limit, database_id=database_id,
+                               filter=cond.get_filters(), sorts=sorts, **projection):
+        remember_titles(page)
+        yield Schedule.from_page(page)
+
+
+@tracer.traced()
 async def find_schedule_in_notion(notion: AsyncClient, condition: Condition, 
                                   database_id: str,
                                   name: Optional[str] = None, 
                                   tag: Optional[str] = None,
-                                  date: Optional[str] = None) -> List[Dict[str, Any]]:
+                                  date: Optional[str] = None,
+                                  mirror: Optional[DatabaseMirror] = None,
+                                  limit: Optional[int] = None,
+                                  properties: Optional[Sequence[str]] = None) -> List[Schedule]:
     """
     Notion 데이터베이스에서 이름, 태그 등 여러 조건을 선택적으로 사용할 수 있는 스케줄 검색 함수.
-    페이지네이션을 처리하여 모든 결과를 반환합니다.
+    페이지네이션을 처리하여 모든 결과(또는 limit개)를 반환합니다. 불러온 미러가 주어지면 API 호출 없이 미러에서 필터를 평가합니다.
     
     :param notion: Notion 비동기 API 클라이언트 객체
     :param condition: Condition 객체, Notion 필터 조건 생성에 사용
@@ -96,47 +303,22 @@ async def find_schedule_in_notion(notion: AsyncClient, condition: Condition,
     :param name: Optional 이름 조건 (string)
     :param tag: Optional 태그 조건 (string)
     :param date: Optional 날짜 조건 (string)
-    :return: 검색 결과를 포함한 딕셔너리 리스트
+    :param mirror: Optional 스케줄 데이터베이스 미러
+    :param limit: Optional 최대 결과 수 (None이면 전부)
+    :param properties: Optional 응답에 포함할 속성 이름들 (None이면 전부)
+    :return: 검색 결과 일정 레코드 리스트
     """
-    filters = {}
-    
-    # 주어진 조건에 따라 필터를 동적으로 추가
-    if name:
-        filters['이름'] = f"contains {name}"
-    if tag:
-        filters['태그'] = tag
-    if date:
-        filters['날짜'] = date
-    
-    if filters:
-        cond = condition(filters)
-        result_list = []
-        start_cursor = None
-        has_more = True
-        
-        while has_more:
-            result = await notion.databases.query(
-                database_id=database_id, 
-                filter=cond.get_filters(),
-                sorts=[
-                    {
-                        'property': "날짜",
-                        'direction': 'ascending'
-                    }
-                ],
-                start_cursor=start_cursor,
-            )
-            result_list.extend(result['results'])
-            has_more = result.get('has_more', False)
-            start_cursor = result.get('next_cursor', None)
-            
-        return result_list
-    else:
-        raise ValueError("At least one condition must be provided.")
+    return [page async for page in iter_schedules_in_notion(notion, condition, database_id, name=name, tag=tag,
+                                                            date=date, mirror=mirror, limit=limit,
+                                                            properties=properties)]
 
 
+@tracer.traced()
 async def search_members_in_database(notion: AsyncClient, database_id: str, 
-                                     conditions_list: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+                                     conditions_list: List[Dict[str, Any]],
+                                     mirror: Optional[DatabaseMirror] = None,
+                                     limit: Optional[int] = None,
+                                     properties: Optional[Sequence[str]] = None) -> List[List[Member]]:
     """
     데이터베이스 ID와 여러 조건 목록을 받아, 각 조건에 맞는 멤버 정보를 비동기적으로 병렬 처리하여 반환하는 함수.
     페이지네이션을 처리하여 모든 결과를 반환합니다.
@@ -144,44 +326,36 @@ async def search_members_in_database(notion: AsyncClient, database_id: str,
     :param notion: Notion 비동기 API 클라이언트 객체
     :param database_id: 검색할 Notion 데이터베이스 ID
     :param conditions_list: 검색할 조건들의 목록 (각 dict는 티어, 이름, role, discord_id 등을 포함)
+    :param mirror: Optional 멤버 데이터베이스 미러 (불러온 상태면 API 대신 미러에서 검색)
+    :param limit: Optional 조건마다 가져올 최대 결과 수 (None이면 전부)
+    :param properties: Optional 응답에 포함할 속성 이름들 (None이면 전부, 예: MEMBER_LIST_PROPERTIES)
     :return: 각 조건에 따른 검색 결과를 리스트 형식으로 반환
     """
     
-    # Notion에서 데이터베이스 목록 가져오기
-    databases = await notion.search(filter={"property": "object", "value": "database"})
-    
-    # 입력된 데이터베이스 ID와 일치하는 데이터베이스를 찾기 (ID에서 '-' 제거)
-    target_db_id = database_id.replace("-", "")
-    target_db = None
-    for db in databases['results']:
-        db_id_cleaned = db['id'].replace("-", "")
-        if db_id_cleaned == target_db_id:
-            target_db = db
-            break
-    
-    if not target_db:
-        raise ValueError(f"Database with ID {database_id} not found.")
-    
-    # 조건 필터 객체 초기화
-    condition = Condition(target_db["properties"])
+    # 스키마 레지스트리에서 조건 필터 객체 가져오기 (데이터베이스별로 캐시됨)
+    condition = await schema_registry.get_condition(notion, database_id)
     
     # 비동기적으로 여러 조건을 처리
-    async def process_single_condition(cond: Dict[str, Any]) -> List[Dict[str, Any]]:
+    async def process_single_condition(cond: Dict[str, Any]) -> List[Member]:
         tier = cond.get('tier')
         name = cond.get('name')
         discord_id = cond.get('discord_id')
         role = cond.get('role')
         
-        # 멤버 검색 수행
-        result = await find_members_in_notion(
-            notion=notion,
-            condition=condition,
-            database_id=database_id,
-            tier=tier,
-            name=name,
-            discord_id=discord_id,
-            role=role
-        )
+        # 멤버 검색 수행 (gather로 나뉜 조건마다 구간을 따로 기록)
+        with tracer.span("condition", **cond):
+            result = await find_members_in_notion(
+                notion=notion,
+                condition=condition,
+                database_id=database_id,
+                tier=tier,
+                name=name,
+                discord_id=discord_id,
+                role=role,
+                mirror=mirror,
+                limit=limit,
+                properties=properties,
+            )
         return result
     
     # 모든 조건을 비동기적으로 실행
@@ -191,8 +365,12 @@ async def search_members_in_database(notion: AsyncClient, database_id: str,
     return results
 
 
+@tracer.traced()
 async def search_schedules_in_database(notion: AsyncClient, database_id: str, 
-                                       conditions_list: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+                                       conditions_list: List[Dict[str, Any]],
+                                       mirror: Optional[DatabaseMirror] = None,
+                                       limit: Optional[int] = None,
+                                       properties: Optional[Sequence[str]] = None) -> List[List[Schedule]]:
     """
     데이터베이스 ID와 여러 조건 목록을 받아, 각 조건에 맞는 스케줄 정보를 비동기적으로 병렬 처리하여 반환하는 함수.
     페이지네이션을 처리하여 모든 결과를 반환합니다.
@@ -200,42 +378,34 @@ async def search_schedules_in_database(notion: AsyncClient, database_id: str,
     :param notion: Notion 비동기 API 클라이언트 객체
     :param database_id: 검색할 Notion 데이터베이스 ID
     :param conditions_list: 검색할 조건들의 목록 (각 dict는 이름, 태그, 날짜 등을 포함)
+    :param mirror: Optional 스케줄 데이터베이스 미러 (불러온 상태면 API 대신 미러에서 검색)
+    :param limit: Optional 조건마다 가져올 최대 결과 수 (None이면 전부)
+    :param properties: Optional 응답에 포함할 속성 이름들 (None이면 전부, 예: SCHEDULE_LIST_PROPERTIES)
     :return: 각 조건에 따른 검색 결과를 리스트 형식으로 반환
     """
     
-    # Notion에서 데이터베이스 목록 가져오기
-    databases = await notion.search(filter={"property": "object", "value": "database"})
-    
-    # 입력된 데이터베이스 ID와 일치하는 데이터베이스를 찾기 (ID에서 '-' 제거)
-    target_db_id = database_id.replace("-", "")
-    target_db = None
-    for db in databases['results']:
-        db_id_cleaned = db['id'].replace("-", "")
-        if db_id_cleaned == target_db_id:
-            target_db = db
-            break
-    
-    if not target_db:
-        raise ValueError(f"Database with ID {database_id} not found.")
-    
-    # 조건 필터 객체 초기화
-    condition = Condition(target_db["properties"])
+    # 스키마 레지스트리에서 조건 필터 객체 가져오기 (데이터베이스별로 캐시됨)
+    condition = await schema_registry.get_condition(notion, database_id)
     
     # 비동기적으로 여러 조건을 처리
-    async def process_single_condition(cond: Dict[str, Any]) -> List[Dict[str, Any]]:
+    async def process_single_condition(cond: Dict[str, Any]) -> List[Schedule]:
         name = cond.get('name')
         tag = cond.get('tag')
         date = cond.get('date')
 
-        # 스케줄 검색 수행
-        result = await find_schedule_in_notion(
-            notion=notion,
-            condition=condition,
-            database_id=database_id,
-            name=name,
-            tag=tag,
-            date=date,
-        )
+        # 스케줄 검색 수행 (gather로 나뉜 조건마다 구간을 따로 기록)
+        with tracer.span("condition", **cond):
+            result = await find_schedule_in_notion(
+                notion=notion,
+                condition=condition,
+                database_id=database_id,
+                name=name,
+                tag=tag,
+                date=date,
+                mirror=mirror,
+                limit=limit,
+                properties=properties,
+            )
         return result
     
     # 모든 조건을 비동기적으로 실행
@@ -270,87 +440,51 @@ def safe_extract(properties: Dict[str, Any], key: str, extract_type: str) -> Opt
     return None
 
 
-def format_notion_member_info(member_data: Dict[str, Any], prefix: str = "-") -> str:
+def format_notion_member_info(member: Member, prefix: str = "-") -> str:
     """
     Notion 멤버 정보를 사용자에게 읽기 쉬운 형식으로 변환하는 함수.
     
-    :param member_data: Notion에서 반환된 멤버 정보 (dict 형식)
+    :param member: 멤버 레코드
     :param prefix: 각 정보 항목 앞에 붙일 접두어 (기본값: '-')
     :return: 예쁘게 포맷된 문자열
     """
-    properties = member_data.get("properties", {})
-    
-    # 멤버 정보 추출
-    name = safe_extract(properties, "이름", "title")
-    discord_id = safe_extract(properties, "Discord ID", "rich_text")
-    email = safe_extract(properties, "이메일", "rich_text")
-    github = safe_extract(properties, "GitHub (SWE)", "rich_text")
-    phone = safe_extract(properties, "전화번호", "rich_text")
-    tier_swe = safe_extract(properties, "티어 (SWE)", "multi_select")
-    tier_devrel = safe_extract(properties, "티어 (DevRel)", "multi_select")
-    tier_designer = safe_extract(properties, "티어 (Designer)", "multi_select")
-    role = safe_extract(properties, "활동 분야", "multi_select")
-    major = safe_extract(properties, "전공", "rich_text")
-    student_id = safe_extract(properties, "학번", "rich_text")
-    notion_id = member_data.get("id")
-
-
     # 포맷할 정보 목록
     info = []
 
     # 값이 있는 경우에만 추가
-    if notion_id: info.append(f"{prefix} **노션 ID**: {notion_id}")
-    if name: info.append(f"{prefix} **이름**: {name}")
-    if major: info.append(f"{prefix} **전공**: {major}")
-    if student_id: info.append(f"{prefix} **학번**: {student_id}")
-    if discord_id: info.append(f"{prefix} **Discord ID**: {discord_id}")
-    if email: info.append(f"{prefix} **이메일**: {email}")
-    if github: info.append(f"{prefix} **GitHub**: {github}")
-    if phone: info.append(f"{prefix} **전화번호**: {phone}")
-    if tier_swe: info.append(f"{prefix} **SWE 티어**: {tier_swe}")
-    if tier_devrel: info.append(f"{prefix} **DevRel 티어**: {tier_devrel}")
-    if tier_designer: info.append(f"{prefix} **Designer 티어**: {tier_designer}")
-    if role: info.append(f"{prefix} **역할**: {role}")
+    if member.id: info.append(f"{prefix} **노션 ID**: {member.id}")
+    if member.name: info.append(f"{prefix} **이름**: {member.name}")
+    if member.major: info.append(f"{prefix} **전공**: {member.major}")
+    if member.student_id: info.append(f"{prefix} **학번**: {member.student_id}")
+    if member.discord_id: info.append(f"{prefix} **Discord ID**: {member.discord_id}")
+    if member.email: info.append(f"{prefix} **이메일**: {member.email}")
+    if member.github: info.append(f"{prefix} **GitHub**: {member.github}")
+    if member.phone: info.append(f"{prefix} **전화번호**: {member.phone}")
+    if member.tier_swe: info.append(f"{prefix} **SWE 티어**: {', '.join(member.tier_swe)}")
+    if member.tier_devrel: info.append(f"{prefix} **DevRel 티어**: {', '.join(member.tier_devrel)}")
+    if member.tier_designer: info.append(f"{prefix} **Designer 티어**: {', '.join(member.tier_designer)}")
+    if member.roles: info.append(f"{prefix} **역할**: {', '.join(member.roles)}")
 
     # 존재하는 정보만을 포함한 포맷팅된 문자열 반환
     return '\n'.join(info) if info else "정보가 없습니다."
 
 
-def format_notion_schedule_info(schedule_data: Dict[str, Any], prefix: str = "-", return_notion_id=True) -> str:
+def format_notion_schedule_info(schedule: Schedule, prefix: str = "-", return_notion_id=True) -> str:
     """
     Notion 일정 정보를 사용자에게 읽기 쉬운 형식으로 변환하는 함수.
     
-    :param schedule_data: Notion에서 반환된 일정 정보 (dict 형식)
+    :param schedule: 일정 레코드
     :param prefix: 각 정보 항목 앞에 붙일 접두어 (기본값: '-')
     :return: 예쁘게 포맷된 문자열
     """
-    properties = schedule_data.get("properties", {})
-    
-    # 일정 정보 추출
-    notion_id = schedule_data.get("id")
-    name = safe_extract(properties, "이름", "title")
-    date = safe_extract(properties, "날짜", "date")
-    location = safe_extract(properties, "장소", "rich_text")
-    # attendees = safe_extract(properties, "출석자 (인정 결석 포함)", "relation")
-    # absentees = safe_extract(properties, "결석자", "relation")
-    # tags = safe_extract(properties, "태그", "multi_select")
-    # parent = safe_extract(properties, "상위 항목", "relation")
-
-
-
     # 포맷할 정보 목록
     info = []
 
     # 값이 있는 경우에만 추가
-    if notion_id and return_notion_id: info.append(f"{prefix} **노션 ID**: {notion_id}")
-    if name: info.append(f"{prefix} **이름**: {name}")
-    if date: info.append(f"{prefix} **날짜**: {date}")
-    if location: info.append(f"{prefix} **장소**: {location}")
-    # if attendees: info.append(f"{prefix} **출석자**: {', '.join(attendees)}")
-    # if absentees: info.append(f"{prefix} **결석자**: {', '.join(absentees)}")
-    # if tags: info.append(f"{prefix} **태그**: {tags}")
-    # if parent: info.append(f"{prefix} **상위 항목**: {', '.join(parent)}")
-
+    if schedule.id and return_notion_id: info.append(f"{prefix} **노션 ID**: {schedule.id}")
+    if schedule.name: info.append(f"{prefix} **이름**: {schedule.name}")
+    if schedule.date: info.append(f"{prefix} **날짜**: {schedule.date}")
+    if schedule.location: info.append(f"{prefix} **장소**: {schedule.location}")
 
     # 존재하는 정보만을 포함한 포맷팅된 문자열 반환
     return '\n'.join(info) if info else "일정 정보가 없습니다."
@@ -358,37 +492,23 @@ def format_notion_schedule_info(schedule_data: Dict[str, Any], prefix: str = "-"
 
 
 
-async def _extract_property_from_page_id(notion: AsyncClient, page_id: str, property_id: str) -> List[Dict[str, Any]]:
+@tracer.traced()
+async def _extract_property_from_page_id(notion: AsyncClient, page_id: str, property_id: str,
+                                         limit: Optional[int] = None) -> List[Dict[str, Any]]:
     """
     단일 page_id에 대해 단일 property_id로 속성을 추출하는 함수.
-    페이지네이션을 지원하여 모든 데이터를 가져옵니다.
+    페이지네이션을 지원하여 모든 데이터(또는 limit개)를 가져옵니다.
     
     :param notion: Notion 비동기 클라이언트
     :param page_id: Notion 페이지 ID
     :param property_id: 추출할 속성 ID
+    :param limit: Optional 최대 항목 수 (None이면 전부)
     :return: 추출된 속성 값 리스트
     """
-    properties = []
-    has_more = True
-    start_cursor = None
-
-    while has_more:
-        result = await notion.pages.properties.retrieve(
-            page_id=page_id, 
-            property_id=property_id, 
-            start_cursor=start_cursor
-        )
-
-        # 결과 값을 저장
-        if 'results' in result:
-            properties.extend(result['results'])
-        
-        # 다음 페이지가 있는지 확인
-        has_more = result.get('has_more', False)
-        start_cursor = result.get('next_cursor', None)
-
-    return properties
+    return [item async for item in paginate(notion.pages.properties.retrieve, limit,
+                                            page_id=page_id, property_id=property_id)]
 
+@tracer.traced()
 async def extract_properties_from_page_id(notion: AsyncClient, page_id: str, property_ids: Union[str, List[str]]) -> Dict[str, List[Any]]:
     """
     단일 page_id에 대해 여러 개의 property를 병렬로 추출하는 함수.
@@ -407,46 +527,89 @@ async def extract_properties_from_page_id(notion: AsyncClient, page_id: str, pro
     # 결과를 property_id와 매핑하여 반환
     return {property_id: result for property_id, result in zip(property_ids, results)}
 
+def _title_of(page: Dict[str, Any], property_name: str = "이름") -> Optional[str]:
+    """
+    페이지 딕셔너리에서 제목을 추출하는 함수. 제목이 여러 조각이면 공백으로 이어 붙입니다.
+    
+    :param page: Notion 페이지 딕셔너리
+    :return: 페이지 제목 (plain_text) 또는 None
+    """
+    properties = page.get('properties', {})
+    if property_name not in properties:
+        return None
+    return ' '.join([item['plain_text'] for item in properties[property_name].get('title', [])])
+
+
+def remember_titles(pages: Union[Dict[str, Any], List[Dict[str, Any]]]) -> None:
+    """
+    이미 가져온 페이지들의 제목을 제목 캐시에 넣는 함수.
+    데이터베이스 쿼리 결과나 미러에 들어온 페이지로 캐시를 미리 채워, 이후 제목 조회 요청을 줄입니다.
+    
+    :param pages: list of dict or dict (Notion 페이지)
+    """
+    pages = [pages] if isinstance(pages, dict) else pages
+    for page in pages:
+        title = _title_of(page)
+        if title is not None and 'id' in page:
+            title_cache.set(normalize_page_id(page['id']), title)
+
+
 async def _page_id_to_title(notion: AsyncClient, page_id: str) -> str:
     """
     주어진 page_id에 대한 제목을 반환하는 함수.
-    페이지네이션을 지원하여 제목이 여러 페이지에 걸쳐 있는 경우 모든 제목을 추출합니다.
+    캐시에 없으면 페이지를 한 번 가져와 제목을 추출하고 캐시에 저장합니다.
     
     :param notion: Notion 비동기 클라이언트
     :param page_id: Notion 페이지 ID
     :return: 페이지 제목 (plain_text)
     """
-    titles = []
-    has_more = True
-    start_cursor = None
-
-    while has_more:
-        result = await notion.pages.retrieve(page_id=page_id, start_cursor=start_cursor)
-        
-        # 제목을 저장
-        if 'properties' in result and '이름' in result['properties']:
-            titles.extend([item['plain_text'] for item in result['properties']['이름']['title']])
-        
-        # 다음 페이지가 있는지 확인
-        has_more = result.get('has_more', False)
-        start_cursor = result.get('next_cursor', None)
-
-    # 모든 제목을 합쳐서 반환
-    return ' '.join(titles)
-
-async def page_ids_to_titles(notion: AsyncClient, page_ids: Union[List[str], str]) -> List[str]:
+    title = title_cache.get(normalize_page_id(page_id))
+    if title is not None:
+        return title
+    return await _fetch_title(notion, page_id)
+
+async def _fetch_title(notion: AsyncClient, page_id: str) -> str:
+    result = await coalesced_request(notion.pages.retrieve, page_id=page_id)
+    title = _title_of(result) or ''
+    title_cache.set(normalize_page_id(page_id), title)
+    return title
+
+@tracer.traced()
+async def page_ids_to_titles(notion: AsyncClient, page_ids: Union[List[str], str], concurrency: int = 8) -> List[str]:
     """
-    여러 개의 page_id에 대해 병렬로 제목을 추출하는 함수.
+    여러 개의 page_id에 대해 제목을 추출하는 함수.
+    캐시에 있는 제목은 바로 사용하고, 없는 id만 중복 없이 제한된 동시성으로 가져옵니다.
     
     :param notion: Notion 비동기 클라이언트
     :param page_ids: 페이지 ID 리스트
-    :return: 제목의 리스트
+    :param concurrency: 캐시에 없는 제목을 가져올 때의 최대 동시 요청 수
+    :return: 제목의 리스트 (page_ids 순서와 동일)
     """
     page_ids = [page_ids] if isinstance(page_ids, str) else page_ids
 
-    tasks = [_page_id_to_title(notion, page_id) for page_id in page_ids]
-    results = await asyncio.gather(*tasks)
-    return results
+    titles: Dict[str, str] = {}
+    misses = []
+    for page_id in page_ids:
+        key = normalize_page_id(page_id)
+        if key in titles:
+            continue
+        title = title_cache.get(key)
+        if title is None:
+            titles[key] = None
+            misses.append(page_id)
+        else:
+            titles[key] = title
+
+    if misses:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(page_id: str) -> None:
+            async with semaphore:
+                titles[normalize_page_id(page_id)] = await _fetch_title(notion, page_id)
+
+        await asyncio.gather(*[fetch(page_id) for page_id in misses])
+
+    return [titles[normalize_page_id(page_id)] for page_id in page_ids]
 
 def extract_relation_ids(data: Union[Dict[str, Any], List[Dict[str, Any]]]) -> List[str]:
     """
@@ -0,0 +1,149 @@
+import os
+import sys
+import time
+from importlib.abc import Loader, MetaPathFinder
+from typing import Dict, List, Optional, Tuple
+
+
+class _TimedLoader(Loader):
+    """
+    원래 로더의 `exec_module` 실행 시간을 기록하는 로더 래퍼.
+    """
+
+    def __init__(self, loader: Loader, name: str, profiler: 'StartupProfiler'):
+        self._loader = loader
+        self._name = name
+        self._profiler = profiler
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        self._profiler._enter(self._name)
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler._exit(self._name)
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+
+class _ImportTimer(MetaPathFinder):
+    """
+    다른 finder가 찾은 모듈의 로더를 `_TimedLoader`로 감싸는 meta path finder.
+    """
+
+    def __init__(self, profiler: 'StartupProfiler'):
+        self._profiler = profiler
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                    spec.loader = _TimedLoader(spec.loader, fullname, self._profiler)
+                return spec
+        return None
+
+
+class StartupProfiler:
+    """
+    봇 시작 과정의 시간을 측정하는 프로파일러.
+    모듈별 import 시간(누적/자체)과 시작 단계별 경과 시간(import 완료, setup_hook, on_ready 등)을 기록합니다.
+    `BOT_PROFILE_STARTUP=1`일 때만 활성화되며, 비활성 상태에서는 아무 비용도 들지 않습니다.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.started = time.perf_counter()
+        self.imports: Dict[str, Tuple[float, float]] = {}  # 모듈 이름 -> (누적 시간, 자체 시간)
+        self.marks: List[Tuple[str, float]] = []
+        self._stack: List[List] = []  # [모듈 이름, 시작 시각, 하위 모듈 누적 시간]
+        self._finder: Optional[_ImportTimer] = None
+
+    @classmethod
+    def from_env(cls) -> 'StartupProfiler':
+        profiler = cls(enabled=os.getenv("BOT_PROFILE_STARTUP", "") not in ("", "0", "false"))
+        if profiler.enabled:
+            profiler.install()
+        return profiler
+
+    @property
+    def installed(self) -> bool:
+        """
+        import 시간을 측정하는 중인지 여부. `uninstall` 이후에는 False입니다.
+        """
+        return self._finder is not None
+
+    def install(self) -> None:
+        """
+        import 시간 측정을 시작하는 함수. 이후에 처음 import되는 모듈만 측정됩니다.
+        """
+        if self._finder is None:
+            self._finder = _ImportTimer(self)
+            sys.meta_path.insert(0, self._finder)
+
+    def uninstall(self) -> None:
+        if self._finder is not None:
+            sys.meta_path.remove(self._finder)
+            self._finder = None
+
+    def _enter(self, name: str) -> None:
+        self._stack.append([name, time.perf_counter(), 0.0])
+
+    def _exit(self, name: str) -> None:
+        _, start, children = self._stack.pop()
+        total = time.perf_counter() - start
+        self.imports[name] = (total, total - children)
+        if self._stack:
+            self._stack[-1][2] += total
+
+    def mark(self, name: str) -> None:
+        """
+        시작 단계를 기록하는 함수. 프로세스 시작 이후 경과 시간이 함께 저장됩니다.
+
+        :param name: 단계 이름 (예: 'imports', 'setup_hook', 'on_ready')
+        """
+        if self.enabled:
+            self.marks.append((name, time.perf_counter() - self.started))
+
+    def top_imports(self, n: int = 15, by: str = "self") -> List[Tuple[str, float, float]]:
+        """
+        import 시간이 긴 모듈을 반환하는 함수.
+
+        :param n: 반환할 모듈 수
+        :param by: 'self'(자체 시간) 또는 'total'(하위 모듈 포함 누적 시간) 기준 정렬
+        :return: (모듈 이름, 누적 시간, 자체 시간) 리스트
+        """
+        index = 1 if by == "self" else 0
+        items = sorted(self.imports.items(), key=lambda item: item[1][index], reverse=True)
+        return [(name, total, self_time) for name, (total, self_time) in items[:n]]
+
+    def report(self, n: int = 15) -> str:
+        """
+        측정 결과를 사람이 읽기 쉬운 문자열로 반환하는 함수.
+
+        :param n: 표시할 모듈 수
+        :return: 보고서 문자열
+        """
+        top_level = {name.split(".")[0] for name in self.imports}
+        packages = sorted(
+            ((name, self.imports[name][0]) for name in top_level if name in self.imports),
+            key=lambda item: item[1], reverse=True,
+        )
+
+        lines = ["[startup] 단계별 경과 시간"]
+        lines += [f"  {name:<24}{elapsed * 1000:>10.1f} ms" for name, elapsed in self.marks]
+        lines.append("[startup] 최상위 패키지 import 시간 (누적)")
+        lines += [f"  {name:<24}{total * 1000:>10.1f} ms" for name, total in packages[:n]]
+        lines.append("[startup] 모듈별 import 시간 (자체 / 누적)")
+        lines += [f"  {name:<40}{self_time * 1000:>8.1f} / {total * 1000:>8.1f} ms"
+                  for name, total, self_time in self.top_imports(n)]
+        return "\n".join(lines)
+
+
+# 봇 시작 프로파일러 (BOT_PROFILE_STARTUP=1일 때 활성화)
+startup_profiler = StartupProfiler.from_env()
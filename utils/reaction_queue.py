@@ -0,0 +1,158 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Hashable, List, Optional, Set, Tuple
+
+from utils.metrics import metrics
+from utils.tracing import tracer
+
+ADD, REMOVE = "REACTION_ADD", "REACTION_REMOVE"
+
+
+class ReactionQueue:
+    """
+    이모지 반응 이벤트를 모아 제한된 수의 워커로 처리하는 작업 큐.
+    이벤트는 (메시지, 사용자)별로 나뉘어 같은 사용자의 이벤트는 도착 순서대로 하나씩 처리되고,
+    아직 처리되지 않은 추가/제거 쌍은 서로 상쇄되며 같은 이벤트의 중복은 버려집니다.
+    큐가 가득 차면 `put`이 빈 자리가 날 때까지 기다리므로, 몰린 이벤트는 실패하지 않고 천천히 처리됩니다.
+    """
+
+    def __init__(self, handler: Callable[[Any], Awaitable[Any]], workers: int = 4, maxsize: int = 1000):
+        """
+        :param handler: 이벤트 하나를 처리할 코루틴 함수 (discord `RawReactionActionEvent`를 받음)
+        :param workers: 동시에 처리할 최대 이벤트 수
+        :param maxsize: 대기할 수 있는 최대 이벤트 수
+        """
+        self.handler = handler
+        self.workers = workers
+        self.maxsize = maxsize
+        self._pending: Dict[Hashable, Deque[Tuple[Any, float]]] = {}  # 파티션 키 -> (이벤트, 넣은 시각)
+        self._active: Set[Hashable] = set()                           # 워커가 처리 중인 파티션
+        self._scheduled: Set[Hashable] = set()                        # 처리 차례를 기다리는 파티션
+        self._ready: Optional[asyncio.Queue] = None                   # 처리할 차례인 파티션 키
+        self._space: Optional[asyncio.Condition] = None
+        self._depth = 0
+        self._tasks: List[asyncio.Task] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @staticmethod
+    def partition(event: Any) -> Tuple[Any, Any]:
+        return event.message_id, event.user_id
+
+    @property
+    def depth(self) -> int:
+        return self._depth
+
+    def _ensure_workers(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._ready = asyncio.Queue()
+            self._space = asyncio.Condition()
+            self._scheduled.clear()
+            self._tasks = []
+        self._tasks = [task for task in self._tasks if not task.done()]
+        while len(self._tasks) < self.workers:
+            self._tasks.append(loop.create_task(self._work()))
+
+    @staticmethod
+    def _cancels(pending: Any, event: Any) -> bool:
+        return str(pending.emoji) == str(event.emoji) and pending.event_type != event.event_type
+
+    @staticmethod
+    def _duplicates(pending: Any, event: Any) -> bool:
+        return str(pending.emoji) == str(event.emoji) and pending.event_type == event.event_type
+
+    async def put(self, event: Any) -> str:
+        """
+        반응 이벤트를 큐에 넣는 함수. 큐가 가득 찼으면 빈 자리가 날 때까지 기다립니다.
+
+        :param event: discord `RawReactionActionEvent` (message_id, user_id, emoji, event_type 사용)
+        :return: 'queued', 'collapsed'(대기 중인 반대 이벤트와 상쇄), 'duplicate'(대기 중인 같은 이벤트와 중복) 중 하나
+        """
+        self._ensure_workers()
+        key = self.partition(event)
+        queue = self._pending.get(key)
+
+        # 아직 처리되지 않은 마지막 이벤트와 비교하여 상쇄/중복 제거 (처리 중인 이벤트는 건드리지 않음)
+        if queue:
+            last = queue[-1][0]
+            if self._cancels(last, event):
+                queue.pop()
+                await self._release(1)
+                metrics.inc("reaction_events_total", event=event.event_type, outcome="collapsed")
+                return "collapsed"
+            if self._duplicates(last, event):
+                metrics.inc("reaction_events_total", event=event.event_type, outcome="duplicate")
+                return "duplicate"
+
+        async with self._space:
+            await self._space.wait_for(lambda: self._depth < self.maxsize)
+            self._depth += 1
+        metrics.set("reaction_queue_depth", self._depth)
+
+        self._pending.setdefault(key, deque()).append((event, time.monotonic()))
+        self._schedule(key)
+        metrics.inc("reaction_events_total", event=event.event_type, outcome="queued")
+        return "queued"
+
+    def _schedule(self, key: Hashable) -> None:
+        # 파티션마다 한 번만 차례를 기다리고, 처리 중인 파티션은 처리가 끝난 뒤 다시 차례를 받음
+        if key not in self._scheduled and key not in self._active:
+            self._scheduled.add(key)
+            self._ready.put_nowait(key)
+
+    async def _release(self, count: int) -> None:
+        async with self._space:
+            self._depth -= count
+            self._space.notify(count)
+        metrics.set("reaction_queue_depth", self._depth)
+
+    async def _work(self) -> None:
+        # 워커는 계속 실행되므로, 처음 만든 이벤트의 구간에 붙지 않음 (이벤트마다 처리기가 루트 구간을 엶)
+        tracer.detach()
+        while True:
+            key = await self._ready.get()
+            self._scheduled.discard(key)
+            queue = self._pending.get(key)
+            if not queue:
+                self._pending.pop(key, None)
+                continue
+
+            event, queued_at = queue.popleft()
+            self._active.add(key)
+            metrics.set("reaction_queue_active", len(self._active))
+            metrics.observe("reaction_queue_wait_seconds", time.monotonic() - queued_at)
+            try:
+                await self.handler(event)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Error in reaction worker: {str(e)}")
+            finally:
+                self._active.discard(key)
+                metrics.set("reaction_queue_active", len(self._active))
+                await self._release(1)
+                # 같은 파티션에 남은 이벤트가 있으면 맨 뒤로 다시 차례를 받음 (다른 사용자와 공평하게)
+                if self._pending.get(key):
+                    self._schedule(key)
+                else:
+                    self._pending.pop(key, None)
+
+    async def join(self) -> None:
+        """
+        대기 중인 이벤트가 모두 처리될 때까지 기다리는 함수.
+        """
+        while self._depth:
+            await asyncio.sleep(0.01)
+
+    def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+
+
+metrics.describe("reaction_events_total", "counter", "반응 이벤트 수 (queued, collapsed, duplicate)")
+metrics.describe("reaction_queue_depth", "gauge", "처리를 기다리거나 처리 중인 반응 이벤트 수")
+metrics.describe("reaction_queue_active", "gauge", "워커가 처리 중인 반응 이벤트 수")
+metrics.describe("reaction_queue_wait_seconds", "histogram", "반응 이벤트가 큐에서 기다린 시간")
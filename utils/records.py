@@ -0,0 +1,202 @@
+import sys
+from enum import Enum
+from typing import Any, ClassVar, Dict, Optional, Tuple
+
+from utils.evaluator import UnsupportedFilter, property_value
+
+
+# Enum 클래스 정의
+class ROLES(str, Enum):
+    DEVREL = "💝 DevRel (Developer Relations)"
+    DESIGNER = "🎨 Designer"
+    SWE = "🖥️ SWE (Software Engineer)"
+
+class ROLES_DEVREL(str, Enum):
+    DE = "✍️ DE (Developer Educator)"
+    CB = "👪 CB (Community Builder)"
+
+class TIER(str, Enum):
+    JUNIOR = "🌱 Junior"
+    MEMBER = "👥 Member"
+    CORE = "🔥 Core Member"
+    DEVREL_LEAD = "⭐ DevRel Lead"
+    LEAD = "⭐ Lead"
+
+
+# 선택지 이름 -> 공유할 값 (알려진 역할/티어는 Enum 멤버 자체를 사용)
+_OPTIONS: Dict[str, str] = {member.value: member for enum in (ROLES, ROLES_DEVREL, TIER) for member in enum}
+
+
+def _option(name: str) -> str:
+    # 수백 개 페이지에 반복되는 선택지 이름을 한 객체로 공유
+    option = _OPTIONS.get(name)
+    return option if option is not None else sys.intern(name)
+
+
+def _decode(prop: Dict[str, Any]) -> Any:
+    # 속성 하나를 레코드에 저장할 값으로 변환 (필터 평가기와 같은 값, 리스트는 튜플)
+    prop_type = prop.get("type")
+    try:
+        value = property_value(prop)
+    except UnsupportedFilter:
+        return prop.get(prop_type)
+    if prop_type == "multi_select":
+        return tuple(_option(option) for option in value)
+    if prop_type in ("select", "status") and value is not None:
+        return _option(value)
+    if prop_type == "relation":
+        return tuple(value)
+    return value
+
+
+class Record:
+    """
+    Notion 페이지를 한 번만 해석해 필요한 값만 담아 두는 가벼운 레코드의 기본 클래스.
+    원본 JSON(속성마다 중첩된 딕셔너리와 rich text 조각)을 들고 있지 않으므로 미러가 차지하는 메모리가 훨씬 작고,
+    값을 읽을 때마다 딕셔너리를 타고 내려갈 필요가 없습니다.
+
+    하위 클래스는 `FIELDS`에 Notion 속성 이름 -> 속성(slot) 이름을 적습니다. 값은 다음과 같이 저장됩니다.
+    - title/rich_text: plain text 문자열
+    - select/multi_select: 선택지 이름 (multi_select는 튜플, 역할/티어는 Enum 멤버, 그 외는 intern된 문자열)
+    - date: 시작 값 (`<slot>_end` 속성이 있으면 끝 값도 저장)
+    - relation: 페이지 ID 튜플
+    응답에 없는 속성(`filter_properties`로 일부만 가져온 페이지 등)은 None입니다.
+    """
+
+    FIELDS: ClassVar[Dict[str, str]] = {"이름": "name"}
+    # 속성 이름 -> Notion 속성 타입 (같은 데이터베이스의 페이지는 스키마를 공유하므로 클래스마다 한 번만 기록)
+    TYPES: ClassVar[Dict[str, str]] = {}
+    # 날짜 시작 값을 담는 속성 이름 -> 끝 값을 담는 속성 이름
+    _DATE_ENDS: ClassVar[Dict[str, str]] = {}
+
+    __slots__ = ("id", "last_edited_time", "name")
+
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        cls.TYPES = {}
+        cls._DATE_ENDS = {slot: f"{slot}_end" for slot in cls.FIELDS.values() if hasattr(cls, f"{slot}_end")}
+
+    @classmethod
+    def from_page(cls, page: Dict[str, Any]) -> "Record":
+        """
+        Notion 페이지 딕셔너리를 레코드로 변환하는 함수.
+
+        :param page: Notion 페이지 딕셔너리 (databases.query / pages.retrieve 결과)
+        :return: 레코드
+        """
+        record = cls.__new__(cls)
+        record.id = page.get("id")
+        record.last_edited_time = page.get("last_edited_time")
+        properties = page.get("properties", {})
+        for end in cls._DATE_ENDS.values():
+            setattr(record, end, None)
+        for name, slot in cls.FIELDS.items():
+            prop = properties.get(name)
+            if prop is None:
+                setattr(record, slot, None)
+                continue
+            cls.TYPES[name] = prop.get("type")
+            setattr(record, slot, _decode(prop))
+            if slot in cls._DATE_ENDS:
+                setattr(record, cls._DATE_ENDS[slot], (prop.get("date") or {}).get("end"))
+        return record
+
+    def get_property(self, name: str) -> Tuple[str, Any]:
+        """
+        필터 평가기(`utils.evaluator`)가 사용하는 (속성 타입, 값)을 반환하는 함수.
+
+        :param name: Notion 속성 이름
+        :return: (속성 타입, 값)
+        :raises UnsupportedFilter: 레코드에 없는 속성인 경우
+        """
+        slot = self.FIELDS.get(name)
+        prop_type = self.TYPES.get(name)
+        if slot is None or prop_type is None:
+            raise UnsupportedFilter(f"Property '{name}' not found in {type(self).__name__}")
+        return prop_type, getattr(self, slot)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(id={self.id!r}, name={self.name!r})"
+
+
+class Page(Record):
+    """
+    속성 구성을 미리 정하지 않은 데이터베이스의 페이지. 모든 속성을 (타입, 값)으로 해석해 둡니다.
+    """
+
+    __slots__ = ("values",)
+
+    @classmethod
+    def from_page(cls, page: Dict[str, Any]) -> "Page":
+        record = super().from_page(page)
+        record.values = {sys.intern(name): (prop.get("type"), _decode(prop))
+                         for name, prop in page.get("properties", {}).items()}
+        return record
+
+    def get_property(self, name: str) -> Tuple[str, Any]:
+        try:
+            return self.values[name]
+        except KeyError:
+            raise UnsupportedFilter(f"Property '{name}' not found in page")
+
+
+class Member(Record):
+    """
+    멤버 데이터베이스의 페이지.
+    """
+
+    FIELDS = {
+        "이름": "name",
+        "Discord ID": "discord_id",
+        "영문 성명": "english_name",
+        "이메일": "email",
+        "전화번호": "phone",
+        "GitHub (SWE)": "github",
+        "전공": "major",
+        "이중/심화/융합/복수 전공": "second_major",
+        "학번": "student_id",
+        "입학 년도": "admission_year",
+        "활동 분야": "roles",
+        "활동 분야 (DevRel)": "roles_devrel",
+        "희망 직군 (SWE)": "desired_role_swe",
+        "티어 (SWE)": "tier_swe",
+        "티어 (DevRel)": "tier_devrel",
+        "티어 (Designer)": "tier_designer",
+        "branch/junior 이수 여부": "branch_junior_completed",
+        "branch/git 등록": "branch_git_registered",
+        "등록 행사": "registered_events",
+        "출석 행사": "attended_events",
+        "결석 행사": "absent_events",
+    }
+
+    __slots__ = tuple(slot for slot in FIELDS.values() if slot not in Record.__slots__)
+
+    id: str
+    name: Optional[str]
+    discord_id: Optional[str]
+    roles: Optional[Tuple[ROLES, ...]]
+
+
+class Schedule(Record):
+    """
+    일정 데이터베이스의 페이지.
+    """
+
+    FIELDS = {
+        "이름": "name",
+        "날짜": "date",
+        "태그": "tags",
+        "장소": "location",
+        "상위 항목": "parent",
+        "등록자": "registrants",
+        "출석자 (인정 결석 포함)": "attendees",
+        "결석자": "absentees",
+    }
+
+    __slots__ = tuple(slot for slot in FIELDS.values() if slot not in Record.__slots__) + ("date_end",)
+
+    id: str
+    name: Optional[str]
+    date: Optional[str]
+    date_end: Optional[str]
+    location: Optional[str]
@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import time
+from contextlib import nullcontext
+from typing import TYPE_CHECKING, List, Dict, Any, Iterable, Optional, Tuple
+
+if TYPE_CHECKING:
+    from notion_client import AsyncClient  # 타입 표기용 (실제 import는 클라이언트 생성 시점)
+    from utils.backend import StateBackend
+
+from utils.backend import PROCESS_ID, LeaseTimeout
+
+from utils.notion import retrieve_page, update_page_properties, extract_properties_from_page_id, extract_relation_ids
+from utils.tracing import tracer
+
+
+class RelationWriter:
+    """
+    페이지의 relation 속성 변경을 짧은 시간 동안 모았다가 한 번에 쓰는 write-behind 집계기.
+    (페이지, 속성)마다 메모리의 relation 목록을 기준으로 추가/제거를 순서대로 적용한 뒤,
+    flush마다 `pages.update`를 한 번만 호출합니다. 동시에 들어온 반응끼리 서로의 변경을 덮어쓰지 않습니다.
+    공유 저장소(`backend`)가 설정되면 (페이지, 속성)마다 lease를 얻은 프로세스만 쓰고, 다른 프로세스가 마지막으로
+    쓴 경우 메모리 목록 대신 Notion에서 다시 읽어 여러 프로세스가 같은 relation을 덮어쓰지 않게 합니다.
+    """
+
+    def __init__(self, window: float = 1.0, ttl: float = 300, backend: Optional[StateBackend] = None,
+                 lease_ttl: float = 30.0):
+        """
+        :param window: 변경을 모으는 시간 (초)
+        :param ttl: 메모리의 relation 목록을 Notion에서 다시 읽기 전까지 신뢰할 시간 (초)
+        :param backend: Optional 여러 프로세스가 공유하는 상태 저장소 (lease와 마지막 쓰기 기록)
+        :param lease_ttl: 쓰기 lease의 유지 시간이자 lease를 기다릴 최대 시간 (초)
+        """
+        self.window = window
+        self.ttl = ttl
+        self.backend = backend
+        self.lease_ttl = lease_ttl
+        self._versions: Dict[Tuple[str, str], str] = {}  # (페이지, 속성) -> 이 프로세스가 마지막으로 쓴 버전
+        self._counter = itertools.count()
+        self._relations: Dict[Tuple[str, str], Tuple[List[str], float]] = {}
+        self._pending: Dict[Tuple[str, str], List[Tuple[str, str, asyncio.Future]]] = {}
+        self._timers: Dict[Tuple[str, str], asyncio.Task] = {}
+        self._locks: Dict[Tuple[str, str], asyncio.Lock] = {}
+
+    async def _load(self, notion: AsyncClient, page_id: str, property_name: str) -> List[str]:
+        """
+        relation 속성의 전체 id 목록을 가져오는 함수.
+        `pages.retrieve`의 relation은 25개까지만 포함되므로, 잘린 경우 속성 API로 모두 가져옵니다.
+        """
+        page_data = await retrieve_page(notion, page_id)
+        prop = page_data['properties'][property_name]
+        if not prop.get('has_more', False):
+            return [relation['id'] for relation in prop.get('relation', [])]
+
+        res = await extract_properties_from_page_id(notion, page_id=page_id, property_ids=prop['id'])
+        return extract_relation_ids(res[prop['id']])
+
+    def update(self, notion: AsyncClient, page_id: str, property_name: str,
+               add: Iterable[str] = (), remove: Iterable[str] = ()) -> 'asyncio.Future[bool]':
+        """
+        relation 추가/제거를 예약하는 함수. 반환된 future는 해당 변경이 Notion에 반영되면 완료됩니다.
+
+        :param notion: Notion 비동기 API 클라이언트
+        :param page_id: 노션 페이지 ID
+        :param property_name: relation 프로퍼티 이름 (출석자, 등록자, 결석자 등)
+        :param add: 추가할 페이지 ID들
+        :param remove: 제거할 페이지 ID들
+        :return: flush 후 실제 변경이 있었는지 여부를 결과로 갖는 future
+        """
+        key = (page_id, property_name)
+        future = asyncio.get_running_loop().create_future()
+        ops = self._pending.setdefault(key, [])
+        ops.extend(("add", related_id, future) for related_id in add)
+        ops.extend(("remove", related_id, future) for related_id in remove)
+        # 빈 변경도 flush 결과를 받을 수 있도록 표시만 남김
+        ops.append(("noop", "", future))
+
+        if key not in self._timers:
+            self._timers[key] = asyncio.create_task(self._flush_later(notion, key))
+        return future
+
+    @tracer.traced("relation_writer.add")
+    async def add(self, notion: AsyncClient, page_id: str, property_name: str, related_page_id: str) -> bool:
+        """
+        relation에 페이지를 추가하고, 반영될 때까지 기다리는 함수.
+
+        :return: relation이 실제로 변경되었는지 여부
+        """
+        return await self.update(notion, page_id, property_name, add=[related_page_id])
+
+    @tracer.traced("relation_writer.remove")
+    async def remove(self, notion: AsyncClient, page_id: str, property_name: str, related_page_id: str) -> bool:
+        """
+        relation에서 페이지를 제거하고, 반영될 때까지 기다리는 함수.
+
+        :return: relation이 실제로 변경되었는지 여부
+        """
+        return await self.update(notion, page_id, property_name, remove=[related_page_id])
+
+    async def _flush_later(self, notion: AsyncClient, key: Tuple[str, str]) -> None:
+        # 여러 반응의 변경을 모아 쓰므로, 타이머를 만든 첫 반응의 구간에 붙이지 않음
+        tracer.detach()
+        await asyncio.sleep(self.window)
+        # 이후에 들어오는 변경은 새 타이머로 모음
+        self._timers.pop(key, None)
+        await self.flush(notion, key)
+
+    @tracer.traced("relation_writer.flush")
+    async def flush(self, notion: AsyncClient, key: Tuple[str, str]) -> None:
+        """
+        (페이지, 속성)에 모인 변경을 한 번의 `pages.update`로 반영하는 함수.
+
+        :param notion: Notion 비동기 API 클라이언트
+        :param key: (페이지 ID, 프로퍼티 이름)
+        """
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            try:
+                async with self._lease(key):
+                    await self._write(notion, key)
+            except LeaseTimeout as e:
+                # 다른 프로세스가 lease를 놓지 않음: 모인 변경을 실패로 알려 호출자가 끝없이 기다리지 않게 함
+                print(f"Error in RelationWriter.flush: '{key[0]}' {key[1]} lease를 얻지 못했습니다.")
+                for _, _, future in self._pending.pop(key, []):
+                    if not future.done():
+                        future.set_exception(e)
+
+    async def _write(self, notion: AsyncClient, key: Tuple[str, str]) -> None:
+        # lock과 lease를 가진 상태에서 호출됨
+        ops = self._pending.pop(key, [])
+        if not ops:
+            return
+        futures = {id(future): future for _, _, future in ops}
+        changed = {fid: False for fid in futures}
+        page_id, property_name = key
+
+        try:
+            cached = self._relations.get(key)
+            if cached and time.monotonic() - cached[1] < self.ttl and self._is_latest(key):
+                current = cached[0]
+            else:
+                current = await self._load(notion, page_id, property_name)
+
+            updated = list(current)
+            members = set(updated)
+            for op, related_id, future in ops:
+                if op == "add" and related_id not in members:
+                    updated.append(related_id)
+                    members.add(related_id)
+                    changed[id(future)] = True
+                elif op == "remove" and related_id in members:
+                    updated.remove(related_id)
+                    members.discard(related_id)
+                    changed[id(future)] = True
+
+            if updated != current:
+                await update_page_properties(notion, page_id, {
+                    property_name: {
+                        "relation": [{"id": related_id} for related_id in updated]
+                    }
+                })
+                trusted = self._record_version(key)
+            else:
+                trusted = True
+
+        except Exception as e:
+            # 실패하면 메모리 목록을 버려 다음 flush에서 다시 읽도록 함
+            self._relations.pop(key, None)
+            for future in futures.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        if trusted:
+            self._relations[key] = (updated, time.monotonic())
+        else:
+            # Notion에는 반영됐지만 다른 프로세스가 알 수 있게 기록하지 못함: 다음 flush에서 다시 읽음
+            self._relations.pop(key, None)
+        for fid, future in futures.items():
+            if not future.done():
+                future.set_result(changed[fid])
+
+    async def flush_all(self, notion: AsyncClient) -> None:
+        """
+        모으는 중인 변경을 타이머를 기다리지 않고 모두 반영하는 함수. (종료 시 Notion 클라이언트를 닫기 전에 사용)
+
+        :param notion: Notion 비동기 API 클라이언트
+        """
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+        await asyncio.gather(*[self.flush(notion, key) for key in list(self._pending)])
+
+    def _lease(self, key: Tuple[str, str]):
+        if self.backend is None:
+            return nullcontext()
+        return self.backend.lease(f"relation:{key[0]}:{key[1]}", ttl=self.lease_ttl, wait=self.lease_ttl)
+
+    def _is_latest(self, key: Tuple[str, str]) -> bool:
+        # 마지막으로 쓴 프로세스가 자신일 때만 메모리 목록을 신뢰
+        if self.backend is None:
+            return True
+        return self.backend.get(f"relation_version:{key[0]}:{key[1]}") == self._versions.get(key)
+
+    def _record_version(self, key: Tuple[str, str]) -> bool:
+        # Notion에 쓴 뒤 호출되므로 실패해도 예외를 내지 않음 (False면 메모리 목록을 신뢰하지 않음)
+        if self.backend is None:
+            return True
+        version = f"{PROCESS_ID}:{next(self._counter)}"
+        try:
+            stored = self.backend.set(f"relation_version:{key[0]}:{key[1]}", version, self.ttl)
+        except Exception as e:
+            print(f"Error in RelationWriter._record_version: '{key[0]}' {key[1]} {str(e)}")
+            stored = False
+        if not stored:
+            self._versions.pop(key, None)
+            return False
+        self._versions[key] = version
+        return True
+
+    def invalidate(self, page_id: Optional[str] = None) -> None:
+        """
+        메모리에 있는 relation 목록을 버리는 함수.
+
+        :param page_id: 버릴 페이지 ID (None이면 전체)
+        """
+        if page_id is None:
+            self._relations.clear()
+        else:
+            for key in [key for key in self._relations if key[0] == page_id]:
+                del self._relations[key]
+
+
+# 모듈 전역 relation 집계기
+relation_writer = RelationWriter()
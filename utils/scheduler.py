@@ -0,0 +1,212 @@
+import asyncio
+import heapq
+import itertools
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+
+from utils.metrics import metrics, endpoint_name
+from utils.tracing import tracer
+
+
+# 우선순위 레인 (값이 작을수록 먼저 처리)
+class Priority(IntEnum):
+    INTERACTIVE = 0  # 사용자 명령어
+    REACTION = 1     # 이모지 반응에 따른 쓰기
+    BACKGROUND = 2   # 미러 갱신 등 백그라운드 동기화
+
+
+# 현재 태스크의 우선순위. 명령어는 기본값(INTERACTIVE)을 사용합니다.
+current_priority: ContextVar[Priority] = ContextVar("notion_priority", default=Priority.INTERACTIVE)
+
+
+@contextmanager
+def use_priority(priority: Priority):
+    """
+    블록 안에서 발생하는 Notion 요청의 우선순위를 지정하는 컨텍스트 매니저.
+
+    :param priority: 사용할 우선순위 레인
+    """
+    token = current_priority.set(priority)
+    try:
+        yield
+    finally:
+        current_priority.reset(token)
+
+
+class TokenBucket:
+    """
+    초당 `rate`개의 토큰이 채워지고 최대 `capacity`개까지 쌓이는 토큰 버킷.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _fill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self) -> float:
+        """
+        토큰 하나를 가져오는 함수.
+
+        :return: 성공하면 0, 실패하면 다음 토큰까지 기다려야 하는 시간 (초)
+        """
+        self._fill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class NotionScheduler:
+    """
+    모든 Notion API 요청이 거쳐가는 중앙 스케줄러.
+    토큰 버킷으로 초당 요청 수를 제한하고, 우선순위 레인 순서대로 요청을 내보내며,
+    429(rate_limited) 응답에는 `Retry-After`만큼 전체 요청을 멈춘 뒤 재시도합니다.
+    502/503/504 응답과 요청 시간 초과는 지수 백오프로 재시도합니다.
+    """
+
+    RETRY_STATUSES = {429, 502, 503, 504}
+    TRACED_ARGUMENTS = ("page_id", "database_id", "property_id", "start_cursor")  # 추적 구간에 남길 요청 인자
+
+    def __init__(self, rate: float = 3, burst: float = 3, max_retries: int = 5, base_backoff: float = 0.5):
+        """
+        :param rate: 초당 허용 요청 수 (Notion 기준 약 3)
+        :param burst: 순간적으로 허용할 최대 요청 수
+        :param max_retries: 429/5xx 응답 시 최대 재시도 횟수
+        :param base_backoff: `Retry-After`가 없을 때 사용할 지수 백오프 기본값 (초)
+        """
+        self.bucket = TokenBucket(rate, burst)
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._paused_until = 0.0
+
+    def configure(self, rate: Optional[float] = None, burst: Optional[float] = None) -> None:
+        """
+        초당 요청 수와 버스트 크기를 변경하는 함수.
+
+        :param rate: 초당 허용 요청 수
+        :param burst: 순간적으로 허용할 최대 요청 수
+        """
+        self.bucket = TokenBucket(rate or self.bucket.rate, burst or self.bucket.capacity)
+
+    @property
+    def pending(self) -> int:
+        return sum(1 for _, _, future in self._waiters if not future.done())
+
+    def _ensure_dispatcher(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._dispatcher is None or self._dispatcher.done():
+            self._loop = loop
+            self._wakeup = asyncio.Event()
+            self._dispatcher = loop.create_task(self._dispatch())
+
+    async def _dispatch(self) -> None:
+        while True:
+            # 취소된 대기자는 건너뜀
+            while self._waiters and self._waiters[0][2].done():
+                heapq.heappop(self._waiters)
+            if not self._waiters:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            pause = self._paused_until - time.monotonic()
+            if pause > 0:
+                await asyncio.sleep(pause)
+                continue
+
+            wait = self.bucket.try_acquire()
+            if wait > 0:
+                await asyncio.sleep(wait)
+                continue
+
+            # 토큰을 얻은 사이 대기자가 취소되었을 수 있으므로 살아있는 대기자를 찾음
+            while self._waiters:
+                _, _, future = heapq.heappop(self._waiters)
+                if not future.done():
+                    future.set_result(None)
+                    break
+            else:
+                self.bucket.tokens += 1  # 사용하지 않은 토큰 반환
+
+    async def _acquire(self, priority: Priority) -> None:
+        self._ensure_dispatcher()
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (int(priority), next(self._seq), future))
+        self._wakeup.set()
+        await future
+
+    def _retry_delay(self, error: Exception, attempt: int) -> float:
+        headers = getattr(error, "headers", None) or {}
+        retry_after = headers.get("retry-after") if hasattr(headers, "get") else None
+        if retry_after:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+        return self.base_backoff * (2 ** attempt) * (1 + random.random() * 0.1)
+
+    async def request(self, endpoint: Callable[..., Awaitable[Any]], *args: Any,
+                      priority: Optional[Priority] = None, **kwargs: Any) -> Any:
+        """
+        Notion API 요청을 스케줄링하여 실행하는 함수.
+
+        :param endpoint: 호출할 Notion 클라이언트 메서드 (예: notion.pages.retrieve)
+        :param priority: Optional 우선순위 (없으면 현재 컨텍스트의 우선순위 사용)
+        :return: Notion API 응답
+        """
+        from notion_client.errors import HTTPResponseError, RequestTimeoutError
+
+        priority = current_priority.get() if priority is None else priority
+        name = endpoint_name(endpoint)
+        attempt = 0
+        while True:
+            with metrics.timer("notion_queue_wait_seconds", component="notion"), tracer.span("queue", priority=priority.name):
+                await self._acquire(priority)
+            status = "200"
+            metrics.add("notion_requests_in_flight", 1)
+            span = None
+            try:
+                traced_args = {key: kwargs[key] for key in self.TRACED_ARGUMENTS if kwargs.get(key)}
+                with metrics.timer("notion_request_duration_seconds", component="notion", endpoint=name), \
+                        tracer.span(f"notion {name}", attempt=attempt, **traced_args) as span:
+                    return await endpoint(*args, **kwargs)
+            except (HTTPResponseError, RequestTimeoutError) as e:
+                # 게이트웨이가 돌려준 HTML 502/504처럼 JSON code가 없는 응답은 APIResponseError가 아닌
+                # HTTPResponseError로 오므로 상태 코드로 판단 (클라이언트 시간 초과도 재시도)
+                status = str(e.status) if isinstance(e, HTTPResponseError) else "timeout"
+                if span is not None:
+                    span.set(status=status)
+                retryable = isinstance(e, RequestTimeoutError) or e.status in self.RETRY_STATUSES
+                if not retryable or attempt >= self.max_retries:
+                    raise
+                metrics.inc("notion_retries_total", endpoint=name, status=status)
+                delay = self._retry_delay(e, attempt)
+                # rate limit은 통합(integration) 단위이므로 모든 레인을 함께 멈춤
+                self._paused_until = max(self._paused_until, time.monotonic() + delay)
+                attempt += 1
+            except BaseException:
+                status = "error"  # 시간 초과, 연결 오류, 취소 등
+                raise
+            finally:
+                metrics.add("notion_requests_in_flight", -1)
+                metrics.inc("notion_requests_total", endpoint=name, status=status)
+
+
+# 모듈 전역 스케줄러
+scheduler = NotionScheduler()
+metrics.register_gauge("notion_requests_queued", lambda: scheduler.pending)
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import TYPE_CHECKING, Dict, Any, Iterable, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from notion_client import AsyncClient  # 타입 표기용 (실제 import는 클라이언트 생성 시점)
+
+from utils.condition import Condition
+from utils.scheduler import current_priority, Priority
+from utils.coalesce import coalesced_request
+
+
+class SchemaRegistry:
+    """
+    데이터베이스별 메타데이터와 `Condition` 객체를 보관하는 레지스트리.
+    `databases.retrieve`로 한 번만 가져오고, TTL이 지나면 기존 값을 계속 사용하면서 백그라운드에서 갱신합니다.
+    `Condition`은 스키마가 바뀔 때만 새로 만들어지므로, 컴파일된 필터 계획은 스키마 버전별로 유지됩니다.
+    """
+
+    def __init__(self, ttl: float = 600):
+        """
+        :param ttl: 스키마를 다시 가져오기 전까지 유지할 시간 (초)
+        """
+        self.ttl = ttl
+        self._entries: Dict[str, Tuple[Dict[str, Any], Condition, float]] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._refreshing: Dict[str, asyncio.Task] = {}
+
+    @staticmethod
+    def _key(database_id: str) -> str:
+        return database_id.replace("-", "")
+
+    async def _fetch(self, notion: AsyncClient, database_id: str) -> Tuple[Dict[str, Any], Condition, float]:
+        db_metadata = await coalesced_request(notion.databases.retrieve, database_id=database_id)
+        previous = self._entries.get(self._key(database_id))
+        if previous is not None and previous[1].db_metadata == db_metadata["properties"]:
+            # 스키마가 그대로면 기존 Condition(과 컴파일된 필터 계획)을 계속 사용
+            condition = previous[1]
+        else:
+            condition = Condition(db_metadata["properties"])
+        entry = (db_metadata, condition, time.monotonic())
+        self._entries[self._key(database_id)] = entry
+        return entry
+
+    async def _refresh(self, notion: AsyncClient, database_id: str) -> None:
+        current_priority.set(Priority.BACKGROUND)
+        try:
+            await self._fetch(notion, database_id)
+        except Exception as e:
+            print(f"Error in schema refresh ({database_id}): {str(e)}")
+        finally:
+            self._refreshing.pop(self._key(database_id), None)
+
+    async def get(self, notion: AsyncClient, database_id: str) -> Dict[str, Any]:
+        """
+        데이터베이스 메타데이터를 반환하는 함수.
+        캐시가 없으면 직접 가져오고, TTL이 지났으면 캐시를 반환하면서 백그라운드에서 갱신합니다.
+
+        :param notion: Notion 비동기 API 클라이언트 객체
+        :param database_id: Notion 데이터베이스 ID
+        :return: `databases.retrieve` 응답 딕셔너리
+        """
+        return (await self._get_entry(notion, database_id))[0]
+
+    async def get_condition(self, notion: AsyncClient, database_id: str) -> Condition:
+        """
+        데이터베이스 스키마로 만든 `Condition` 객체를 반환하는 함수.
+
+        :param notion: Notion 비동기 API 클라이언트 객체
+        :param database_id: Notion 데이터베이스 ID
+        :return: Condition 객체
+        """
+        return (await self._get_entry(notion, database_id))[1]
+
+    async def _get_entry(self, notion: AsyncClient, database_id: str) -> Tuple[Dict[str, Any], Condition, float]:
+        key = self._key(database_id)
+        entry = self._entries.get(key)
+
+        if entry is None:
+            # 같은 데이터베이스에 대한 동시 최초 요청은 한 번만 가져오도록 잠금
+            lock = self._locks.setdefault(key, asyncio.Lock())
+            async with lock:
+                entry = self._entries.get(key)
+                if entry is None:
+                    entry = await self._fetch(notion, database_id)
+            return entry
+
+        if time.monotonic() - entry[2] > self.ttl and key not in self._refreshing:
+            self._refreshing[key] = asyncio.create_task(self._refresh(notion, database_id))
+        return entry
+
+    async def property_ids(self, notion: AsyncClient, database_id: str, names: Iterable[str]) -> Optional[List[str]]:
+        """
+        속성 이름을 속성 ID로 바꾸는 함수. (`filter_properties`로 필요한 속성만 요청할 때 사용)
+        스키마에 없는 이름이 있으면 이름이 바뀌었을 수 있으므로 None을 반환하여 전체 속성을 요청하게 합니다.
+
+        :param notion: Notion 비동기 API 클라이언트 객체
+        :param database_id: Notion 데이터베이스 ID
+        :param names: 속성 이름들
+        :return: 속성 ID 리스트 또는 None
+        """
+        properties = (await self.get(notion, database_id))["properties"]
+        names = list(names)
+        if any(name not in properties for name in names):
+            return None
+        return [properties[name]["id"] for name in names]
+
+    def invalidate(self, database_id: Optional[str] = None) -> None:
+        """
+        캐시된 스키마를 제거하는 함수.
+
+        :param database_id: 제거할 데이터베이스 ID (None이면 전체 제거)
+        """
+        if database_id is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(self._key(database_id), None)
+
+
+# 모듈 전역 레지스트리
+schema_registry = SchemaRegistry()
@@ -0,0 +1,194 @@
+import heapq
+from typing import List, Dict, Set, Optional, Tuple
+
+# 한글 음절(가~힣) 분해용 자모 표 (호환 자모)
+_HANGUL_BASE, _HANGUL_LAST = 0xAC00, 0xD7A3
+_CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_JUNGSEONG = ["ㅏ", "ㅐ", "ㅑ", "ㅒ", "ㅓ", "ㅔ", "ㅕ", "ㅖ", "ㅗ", "ㅗㅏ", "ㅗㅐ", "ㅗㅣ", "ㅛ", "ㅜ",
+              "ㅜㅓ", "ㅜㅔ", "ㅜㅣ", "ㅠ", "ㅡ", "ㅡㅣ", "ㅣ"]
+_JONGSEONG = ["", "ㄱ", "ㄲ", "ㄱㅅ", "ㄴ", "ㄴㅈ", "ㄴㅎ", "ㄷ", "ㄹ", "ㄹㄱ", "ㄹㅁ", "ㄹㅂ", "ㄹㅅ", "ㄹㅌ",
+              "ㄹㅍ", "ㄹㅎ", "ㅁ", "ㅂ", "ㅂㅅ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ"]
+# 사용자가 직접 입력한 겹자모도 같은 방식으로 나눔 (예: 'ㅘ' -> 'ㅗㅏ', 'ㄳ' -> 'ㄱㅅ')
+_COMPOUND_JAMO = {
+    "ㅘ": "ㅗㅏ", "ㅙ": "ㅗㅐ", "ㅚ": "ㅗㅣ", "ㅝ": "ㅜㅓ", "ㅞ": "ㅜㅔ", "ㅟ": "ㅜㅣ", "ㅢ": "ㅡㅣ",
+    "ㄳ": "ㄱㅅ", "ㄵ": "ㄴㅈ", "ㄶ": "ㄴㅎ", "ㄺ": "ㄹㄱ", "ㄻ": "ㄹㅁ", "ㄼ": "ㄹㅂ", "ㄽ": "ㄹㅅ",
+    "ㄾ": "ㄹㅌ", "ㄿ": "ㄹㅍ", "ㅀ": "ㄹㅎ", "ㅄ": "ㅂㅅ",
+}
+
+
+def normalize(text: str) -> str:
+    """
+    검색용으로 문자열을 정규화하는 함수. (소문자, 공백 제거)
+    """
+    return "".join(text.lower().split())
+
+
+def decompose(text: str) -> str:
+    """
+    한글 음절을 자모로 분해하는 함수. 한글이 아닌 문자는 그대로 둡니다.
+    (예: '전성후' -> 'ㅈㅓㄴㅅㅓㅇㅎㅜ')
+    """
+    result = []
+    for char in text:
+        code = ord(char)
+        if _HANGUL_BASE <= code <= _HANGUL_LAST:
+            index = code - _HANGUL_BASE
+            result.append(_CHOSEONG[index // 588] + _JUNGSEONG[index % 588 // 28] + _JONGSEONG[index % 28])
+        else:
+            result.append(_COMPOUND_JAMO.get(char, char))
+    return "".join(result)
+
+
+def choseong(text: str) -> str:
+    """
+    한글 음절을 초성으로 바꾸는 함수. 한글이 아닌 문자는 그대로 둡니다. (예: '전성후' -> 'ㅈㅅㅎ')
+    """
+    result = []
+    for char in text:
+        code = ord(char)
+        if _HANGUL_BASE <= code <= _HANGUL_LAST:
+            result.append(_CHOSEONG[(code - _HANGUL_BASE) // 588])
+        else:
+            result.append(char)
+    return "".join(result)
+
+
+def _is_choseong_query(text: str) -> bool:
+    return bool(text) and all(char in _CHOSEONG for char in text)
+
+
+def _grams(text: str, n: int = 2) -> Set[str]:
+    if len(text) < n:
+        return {text} if text else set()
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+class NameIndex:
+    """
+    이름 검색용 역색인.
+    이름을 자모로 분해한 문자열과 초성 문자열의 n-gram을 색인하여, 음절 일부('성ㅎ')나 초성('ㅈㅅㅎ')으로도
+    검색할 수 있고, 일치 정도(완전 일치 > 접두어 > 부분 문자열 > 자모 > 초성)로 순위를 매깁니다.
+    페이지가 바뀔 때마다 `add`/`remove`로 해당 항목만 갱신합니다.
+    """
+
+    def __init__(self):
+        self.names: Dict[str, str] = {}                  # 항목 ID -> 원래 이름
+        self._forms: Dict[str, Tuple[str, str, str]] = {}  # 항목 ID -> (정규화, 자모, 초성)
+        self._jamo_postings: Dict[str, Set[str]] = {}
+        self._choseong_postings: Dict[str, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self.names
+
+    def add(self, item_id: str, name: Optional[str]) -> None:
+        """
+        항목을 색인에 추가하는 함수. 이미 있으면 새 이름으로 갱신합니다.
+
+        :param item_id: 항목 ID (페이지 ID 등)
+        :param name: 색인할 이름 (None이나 빈 문자열이면 색인하지 않음)
+        """
+        self.remove(item_id)
+        if not name:
+            return
+        normalized = normalize(name)
+        forms = (normalized, decompose(normalized), choseong(normalized))
+        self.names[item_id] = name
+        self._forms[item_id] = forms
+
+        for gram in _grams(forms[1]) | _grams(forms[1], 1):
+            self._jamo_postings.setdefault(gram, set()).add(item_id)
+        for gram in _grams(forms[2]) | _grams(forms[2], 1):
+            self._choseong_postings.setdefault(gram, set()).add(item_id)
+
+    def remove(self, item_id: str) -> None:
+        """
+        항목을 색인에서 제거하는 함수. 없으면 아무 것도 하지 않습니다.
+
+        :param item_id: 항목 ID
+        """
+        forms = self._forms.pop(item_id, None)
+        if forms is None:
+            return
+        del self.names[item_id]
+        for postings, text in ((self._jamo_postings, forms[1]), (self._choseong_postings, forms[2])):
+            for gram in _grams(text) | _grams(text, 1):
+                ids = postings.get(gram)
+                if ids is not None:
+                    ids.discard(item_id)
+                    if not ids:
+                        del postings[gram]
+
+    def clear(self) -> None:
+        self.names.clear()
+        self._forms.clear()
+        self._jamo_postings.clear()
+        self._choseong_postings.clear()
+
+    @staticmethod
+    def _candidates(postings: Dict[str, Set[str]], text: str) -> Set[str]:
+        # 질의의 모든 n-gram을 포함하는 항목만 후보로 (작은 목록부터 교집합)
+        gram_sets = sorted((postings.get(gram, set()) for gram in _grams(text, 2 if len(text) > 1 else 1)), key=len)
+        if not gram_sets:
+            return set()
+        candidates = set(gram_sets[0])
+        for ids in gram_sets[1:]:
+            candidates &= ids
+            if not candidates:
+                break
+        return candidates
+
+    def _score(self, item_id: str, query: str, query_jamo: str, choseong_only: bool) -> Optional[Tuple[int, int, int]]:
+        normalized, jamo, initials = self._forms[item_id]
+        if choseong_only:
+            position = initials.find(query)
+            if position < 0:
+                return None
+            rank = 5 if position == 0 else 6
+        elif normalized == query:
+            rank, position = 0, 0
+        elif query in normalized:
+            position = normalized.find(query)
+            rank = 1 if position == 0 else 2
+        else:
+            position = jamo.find(query_jamo)
+            if position < 0:
+                return None
+            rank = 3 if position == 0 else 4
+        return rank, position, len(normalized)
+
+    def search(self, query: str, k: Optional[int] = None) -> List[Tuple[str, Tuple[int, int, int]]]:
+        """
+        이름으로 항목을 검색하여 순위대로 반환하는 함수.
+        순위는 (일치 종류, 일치 위치, 이름 길이) 순으로 작을수록 높으며, 일치 종류는
+        0: 완전 일치, 1: 접두어, 2: 부분 문자열, 3: 자모 접두어, 4: 자모 부분 문자열, 5: 초성 접두어, 6: 초성 부분 문자열 입니다.
+
+        :param query: 검색어 (음절 일부나 초성만 입력해도 됨. 예: '성ㅎ', 'ㅈㅅㅎ')
+        :param k: Optional 반환할 최대 항목 수 (None이면 전체, 자동 완성에는 작은 값 사용)
+        :return: (항목 ID, 순위) 리스트
+        """
+        query = normalize(query)
+        if not query:
+            return []
+
+        choseong_only = _is_choseong_query(query)
+        query_jamo = decompose(query)
+        if choseong_only:
+            candidates = self._candidates(self._choseong_postings, query)
+            # 'ㅈ'처럼 자모 자체가 이름에 들어 있는 경우도 함께 찾음
+            candidates |= self._candidates(self._jamo_postings, query_jamo)
+        else:
+            candidates = self._candidates(self._jamo_postings, query_jamo)
+
+        scored = []
+        for item_id in candidates:
+            score = self._score(item_id, query, query_jamo, False)
+            if score is None and choseong_only:
+                score = self._score(item_id, query, query_jamo, True)
+            if score is not None:
+                scored.append((score, self.names[item_id], item_id))
+
+        ranked = heapq.nsmallest(k, scored) if k is not None else sorted(scored)
+        return [(item_id, score) for score, _, item_id in ranked]
@@ -0,0 +1,297 @@
+import asyncio
+import json
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from utils.backend import connect
+
+
+class AttendanceStore:
+    """
+    출석/등록 공지 메시지 정보를 SQLite에 저장하는 저장소.
+    메시지 ID와 노션 페이지 ID로 인덱싱되며, 조회는 메모리 캐시에서 O(1)로 처리합니다.
+    각 항목에는 만료 시간이 있어 오래된 공지는 자동으로 제거되고(조회 시, `start`로 띄운 태스크가 주기적으로),
+    재시작 시 남은 항목을 다시 불러옵니다.
+    여러 프로세스가 같은 파일을 쓰는 경우(shared=True), 메모리 캐시에 없는 공지는 SQLite에서 다시 읽어
+    다른 프로세스가 만든 공지도 보이게 합니다.
+    """
+
+    COLUMNS = ("message_id", "notion_page_id", "notice_type", "emoji", "channel_id", "author_id", "created_at", "closes_at", "expires_at")
+
+    def __init__(self, path: str = "data/attendance.db", shared: bool = False):
+        """
+        :param path: SQLite 파일 경로 (":memory:"이면 메모리에만 저장)
+        :param shared: 다른 프로세스와 파일을 함께 쓰는지 여부
+        """
+        self.path = path
+        self.shared = shared
+        self.conn = connect(path)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS notices (
+                message_id INTEGER PRIMARY KEY,
+                notion_page_id TEXT NOT NULL,
+                notice_type TEXT NOT NULL,
+                emoji TEXT NOT NULL,
+                channel_id INTEGER,
+                author_id INTEGER,
+                created_at REAL NOT NULL,
+                closes_at REAL,
+                expires_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_notices_page ON notices (notion_page_id);
+            CREATE INDEX IF NOT EXISTS idx_notices_expires ON notices (expires_at);
+        """)
+        self.conn.commit()
+        self._cache: Dict[int, Dict[str, Any]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def load(self) -> int:
+        """
+        만료된 항목을 지우고 남은 항목을 메모리 캐시로 불러오는 함수. 시작 시 한 번 호출합니다.
+
+        :return: 불러온 항목 수
+        """
+        self.expire()
+        rows = self.conn.execute("SELECT * FROM notices").fetchall()
+        self._cache = {row["message_id"]: dict(row) for row in rows}
+        return len(self._cache)
+
+    def add(self, message_id: int, notion_page_id: str, notice_type: str, emoji: str, ttl: float,
+            channel_id: Optional[int] = None, author_id: Optional[int] = None,
+            duration: Optional[float] = None) -> Dict[str, Any]:
+        """
+        공지 메시지를 저장하는 함수.
+
+        :param message_id: 공지 Discord 메시지 ID
+        :param notion_page_id: 노션 페이지 ID (행사 정보가 포함된 페이지)
+        :param notice_type: '출석' 또는 '등록'
+        :param emoji: 반응으로 사용할 이모지
+        :param ttl: 공지가 유효한 시간 (초)
+        :param channel_id: 공지가 올라간 채널 ID
+        :param author_id: 공지 생성자 ID
+        :param duration: Optional 마감이 있는 공지(출석)의 마감까지 남은 시간 (초)
+        :return: 저장된 항목
+        """
+        now = time.time()
+        entry = {
+            "message_id": message_id,
+            "notion_page_id": notion_page_id,
+            "notice_type": notice_type,
+            "emoji": emoji,
+            "channel_id": channel_id,
+            "author_id": author_id,
+            "created_at": now,
+            "closes_at": now + duration if duration is not None else None,
+            "expires_at": now + ttl,
+        }
+        self.conn.execute(
+            f"INSERT OR REPLACE INTO notices ({', '.join(self.COLUMNS)}) VALUES ({', '.join('?' * len(self.COLUMNS))})",
+            [entry[column] for column in self.COLUMNS],
+        )
+        self.conn.commit()
+        self._cache[message_id] = entry
+        return entry
+
+    def get(self, message_id: int) -> Optional[Dict[str, Any]]:
+        """
+        메시지 ID로 공지 정보를 가져오는 함수. 만료된 항목은 제거하고 None을 반환합니다.
+
+        :param message_id: 공지 Discord 메시지 ID
+        :return: 공지 정보 딕셔너리 또는 None
+        """
+        entry = self._cache.get(message_id)
+        if entry is None and self.shared:
+            entry = self.reload(message_id)
+        if entry is not None and entry["expires_at"] <= time.time():
+            self.remove(message_id)
+            return None
+        return entry
+
+    def reload(self, message_id: int) -> Optional[Dict[str, Any]]:
+        """
+        메모리 캐시를 거치지 않고 SQLite에서 공지 정보를 다시 읽는 함수. (다른 프로세스가 지웠는지 확인할 때 사용)
+
+        :param message_id: 공지 Discord 메시지 ID
+        :return: 공지 정보 딕셔너리 또는 None
+        """
+        row = self.conn.execute("SELECT * FROM notices WHERE message_id = ?", (message_id,)).fetchone()
+        if row is None:
+            self._cache.pop(message_id, None)
+            return None
+        self._cache[message_id] = dict(row)
+        return self._cache[message_id]
+
+    def active(self, message_id: int) -> Optional[Dict[str, Any]]:
+        """
+        반응을 받을 수 있는 공지인지 확인하여 공지 정보를 반환하는 함수. 마감 시간이 지난 출석 공지는 None입니다.
+
+        :param message_id: 공지 Discord 메시지 ID
+        :return: 공지 정보 딕셔너리 또는 None
+        """
+        entry = self.get(message_id)
+        if entry is not None and entry["closes_at"] is not None and entry["closes_at"] <= time.time():
+            return None
+        return entry
+
+    def __contains__(self, message_id: int) -> bool:
+        return self.get(message_id) is not None
+
+    def __getitem__(self, message_id: int) -> Dict[str, Any]:
+        entry = self.get(message_id)
+        if entry is None:
+            raise KeyError(message_id)
+        return entry
+
+    def __delitem__(self, message_id: int) -> None:
+        self.remove(message_id)
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def remove(self, message_id: int) -> None:
+        self._cache.pop(message_id, None)
+        self.conn.execute("DELETE FROM notices WHERE message_id = ?", (message_id,))
+        self.conn.commit()
+
+    def by_page(self, notion_page_id: str) -> List[Dict[str, Any]]:
+        """
+        노션 페이지 ID에 해당하는 공지들을 가져오는 함수.
+
+        :param notion_page_id: 노션 페이지 ID
+        :return: 공지 정보 딕셔너리 리스트
+        """
+        rows = self.conn.execute(
+            "SELECT message_id FROM notices WHERE notion_page_id = ? AND expires_at > ?",
+            (notion_page_id, time.time()),
+        ).fetchall()
+        if self.shared:
+            return [entry for entry in (self.reload(row["message_id"]) for row in rows) if entry is not None]
+        return [self._cache[row["message_id"]] for row in rows if row["message_id"] in self._cache]
+
+    def open_windows(self) -> List[Dict[str, Any]]:
+        """
+        마감 처리가 남아 있는 공지(출석)들을 가져오는 함수. 재시작 후 마감 타이머를 복구할 때 사용합니다.
+        마감 시간이 이미 지났더라도, 마감 처리 후 제거되기 전까지는 포함됩니다.
+
+        :return: 공지 정보 딕셔너리 리스트
+        """
+        if self.shared:
+            rows = self.conn.execute("SELECT * FROM notices WHERE closes_at IS NOT NULL").fetchall()
+            self._cache.update((row["message_id"], dict(row)) for row in rows)
+            return [self._cache[row["message_id"]] for row in rows]
+        return [entry for entry in self._cache.values() if entry["closes_at"] is not None]
+
+    def expire(self) -> int:
+        """
+        만료된 항목을 모두 제거하는 함수.
+
+        :return: 제거된 항목 수
+        """
+        now = time.time()
+        cursor = self.conn.execute("DELETE FROM notices WHERE expires_at <= ?", (now,))
+        self.conn.commit()
+        for message_id in [m for m, entry in self._cache.items() if entry["expires_at"] <= now]:
+            del self._cache[message_id]
+        return cursor.rowcount
+
+    def start(self, interval: float) -> None:
+        """
+        만료된 항목을 주기적으로 제거하는 태스크를 시작하는 함수. 이미 실행 중이면 아무 것도 하지 않습니다.
+        다시 조회되지 않는 공지도 재시작을 기다리지 않고 메모리와 SQLite에서 지워집니다.
+
+        :param interval: 제거 주기 (초)
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(interval))
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                self.expire()
+            except Exception as e:
+                print(f"Error in AttendanceStore.expire: {str(e)}")
+
+    def close(self) -> None:
+        self.stop()
+        self.conn.close()
+
+
+class MirrorStore:
+    """
+    데이터베이스 미러의 스냅샷(페이지와 high-water mark)을 SQLite에 저장하는 저장소.
+    재시작 후에도 전체를 다시 불러오지 않고, 저장된 high-water mark 이후의 변경만 가져올 수 있게 합니다.
+    """
+
+    def __init__(self, path: str = "data/mirror.db"):
+        """
+        :param path: SQLite 파일 경로 (":memory:"이면 메모리에만 저장)
+        """
+        self.path = path
+        self.conn = connect(path)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS mirror_pages (
+                database_id TEXT NOT NULL,
+                page_id TEXT NOT NULL,
+                data TEXT NOT NULL,
+                PRIMARY KEY (database_id, page_id)
+            );
+            CREATE TABLE IF NOT EXISTS mirror_state (
+                database_id TEXT PRIMARY KEY,
+                high_water_mark TEXT,
+                reconciled_at REAL
+            );
+        """)
+        self.conn.commit()
+
+    def load(self, database_id: str) -> Tuple[List[Dict[str, Any]], Optional[str], Optional[float]]:
+        """
+        저장된 스냅샷을 불러오는 함수.
+
+        :param database_id: 데이터베이스 ID
+        :return: (페이지 리스트, high-water mark, 마지막 전체 대조 시각). 저장된 적이 없으면 ([], None, None)
+        """
+        state = self.conn.execute(
+            "SELECT high_water_mark, reconciled_at FROM mirror_state WHERE database_id = ?", (database_id,)).fetchone()
+        if state is None:
+            return [], None, None
+        rows = self.conn.execute("SELECT data FROM mirror_pages WHERE database_id = ?", (database_id,)).fetchall()
+        return [json.loads(row["data"]) for row in rows], state["high_water_mark"], state["reconciled_at"]
+
+    def save(self, database_id: str, pages: Iterable[Dict[str, Any]] = (), removed: Iterable[str] = (),
+             high_water_mark: Optional[str] = None, reconciled_at: Optional[float] = None, replace: bool = False) -> None:
+        """
+        변경된 페이지와 high-water mark를 한 트랜잭션으로 저장하는 함수.
+
+        :param database_id: 데이터베이스 ID
+        :param pages: 추가/갱신할 페이지들 (키는 정규화된 페이지 ID)
+        :param removed: 삭제할 페이지 ID들
+        :param high_water_mark: 새 high-water mark
+        :param reconciled_at: Optional 전체 대조 시각 (None이면 기존 값 유지)
+        :param replace: True이면 이 데이터베이스의 기존 페이지를 모두 지우고 pages로 교체
+        """
+        with self.conn:
+            if replace:
+                self.conn.execute("DELETE FROM mirror_pages WHERE database_id = ?", (database_id,))
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO mirror_pages (database_id, page_id, data) VALUES (?, ?, ?)",
+                [(database_id, page["id"].replace("-", ""), json.dumps(page, ensure_ascii=False)) for page in pages],
+            )
+            self.conn.executemany(
+                "DELETE FROM mirror_pages WHERE database_id = ? AND page_id = ?",
+                [(database_id, page_id) for page_id in removed],
+            )
+            self.conn.execute(
+                """INSERT INTO mirror_state (database_id, high_water_mark, reconciled_at) VALUES (?, ?, ?)
+                   ON CONFLICT(database_id) DO UPDATE SET high_water_mark = excluded.high_water_mark,
+                   reconciled_at = COALESCE(excluded.reconciled_at, mirror_state.reconciled_at)""",
+                (database_id, high_water_mark, reconciled_at),
+            )
+
+    def close(self) -> None:
+        self.conn.close()
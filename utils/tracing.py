@@ -0,0 +1,218 @@
+import functools
+import logging
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from logging.handlers import RotatingFileHandler
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional
+
+
+class Span:
+    """
+    추적 구간 하나. 시작/종료 시각과 속성, 하위 구간을 가집니다.
+    `asyncio.gather`로 만든 태스크는 시작 시점의 컨텍스트를 복사하므로, 그 안에서 연 구간도 부모 구간의 하위로 붙습니다.
+    """
+
+    __slots__ = ("name", "attributes", "start", "end", "children", "error")
+
+    def __init__(self, name: str, attributes: Dict[str, Any]):
+        self.name = name
+        self.attributes = attributes
+        self.start = time.perf_counter()
+        self.end: Optional[float] = None
+        self.children: List["Span"] = []
+        self.error: Optional[str] = None
+
+    @property
+    def duration(self) -> float:
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def idle_time(self) -> float:
+        """
+        대기 구간(idle=True, 예: 출석 마감까지의 sleep)에 쓴 시간. 느린 명령어 판정에서 제외합니다.
+        """
+        if self.attributes.get("idle"):
+            return self.duration
+        return sum(child.idle_time() for child in self.children)
+
+    def format(self, origin: Optional[float] = None, depth: int = 0) -> List[str]:
+        """
+        구간 트리를 '+시작 오프셋  소요 시간  이름 속성' 형식의 줄 목록으로 바꾸는 함수.
+        """
+        origin = self.start if origin is None else origin
+        attributes = " ".join(f"{key}={value}" for key, value in self.attributes.items())
+        error = f" error={self.error}" if self.error else ""
+        lines = [f"+{self.start - origin:8.3f}s {self.duration:8.3f}s  {'  ' * depth}{self.name} {attributes}{error}".rstrip()]
+        for child in sorted(self.children, key=lambda span: span.start):
+            lines.extend(child.format(origin, depth + 1))
+        return lines
+
+
+# 현재 태스크에서 열려 있는 구간
+_current_span: ContextVar[Optional[Span]] = ContextVar("trace_span", default=None)
+
+
+class Tracer:
+    """
+    명령어/이벤트 처리 단위의 가벼운 비동기 추적기.
+    루트 구간(`trace`)이 열려 있을 때만 하위 구간(`span`)을 기록하며, 루트 구간의 소요 시간(대기 구간 제외)이
+    기준을 넘으면 전체 구간 트리를 회전 로그 파일에 남깁니다.
+    """
+
+    def __init__(self, threshold: float = 5.0, log_path: str = "logs/slow_commands.log",
+                 max_bytes: int = 1024 * 1024, backup_count: int = 5):
+        """
+        :param threshold: 느린 처리로 기록할 기준 시간 (초, 0 이하이면 기록하지 않음)
+        :param log_path: 로그 파일 경로
+        :param max_bytes: 로그 파일 하나의 최대 크기 (넘으면 회전)
+        :param backup_count: 보관할 이전 로그 파일 수
+        """
+        self.threshold = threshold
+        self.log_path = log_path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._logger: Optional[logging.Logger] = None
+
+    def configure(self, threshold: Optional[float] = None, log_path: Optional[str] = None) -> None:
+        if threshold is not None:
+            self.threshold = threshold
+        if log_path is not None and log_path != self.log_path:
+            self.log_path = log_path
+            self._close_logger()
+
+    @staticmethod
+    def current() -> Optional[Span]:
+        return _current_span.get()
+
+    @staticmethod
+    def detach() -> None:
+        """
+        현재 태스크를 열려 있는 구간에서 떼어내는 함수. 오래 실행되는 백그라운드 태스크의 시작에서 호출하여,
+        태스크를 만든 명령어/이벤트의 구간에 하위 구간이 끝없이 쌓이지 않게 합니다. (태스크의 컨텍스트에만 적용)
+        """
+        _current_span.set(None)
+
+    def start(self, name: str, /, **attributes: Any) -> Span:
+        """
+        루트 구간을 여는 함수. 같은 태스크에서 `finish`로 닫아야 합니다. (명령어 before/after 훅용)
+        """
+        span = Span(name, attributes)
+        _current_span.set(span)
+        return span
+
+    def finish(self, span: Span, error: Optional[BaseException] = None) -> None:
+        """
+        루트 구간을 닫고, 느린 경우 구간 트리를 로그 파일에 기록하는 함수.
+        """
+        span.end = time.perf_counter()
+        if error is not None:
+            span.error = type(error).__name__
+        if _current_span.get() is span:
+            _current_span.set(None)
+        if 0 < self.threshold <= span.duration - span.idle_time():
+            self._write(span)
+
+    @contextmanager
+    def trace(self, name: str, /, **attributes: Any) -> Iterator[Span]:
+        """
+        루트 구간을 여는 컨텍스트 매니저. (이벤트 처리기, 백그라운드 작업용)
+        """
+        token = _current_span.set(None)
+        span = self.start(name, **attributes)
+        try:
+            yield span
+        except BaseException as e:
+            self.finish(span, e)
+            raise
+        else:
+            self.finish(span)
+        finally:
+            _current_span.reset(token)
+
+    @contextmanager
+    def span(self, name: str, /, **attributes: Any) -> Iterator[Optional[Span]]:
+        """
+        현재 구간의 하위 구간을 여는 컨텍스트 매니저. 열려 있는 루트 구간이 없거나
+        부모 구간이 이미 닫혔으면(부모보다 오래 사는 태스크) 아무 것도 기록하지 않습니다.
+        """
+        parent = _current_span.get()
+        if parent is None or parent.end is not None:
+            yield None
+            return
+        span = Span(name, attributes)
+        parent.children.append(span)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = type(e).__name__
+            raise
+        finally:
+            span.end = time.perf_counter()
+            _current_span.reset(token)
+
+    def traced(self, name: Optional[str] = None) -> Callable[[Callable[..., Awaitable[Any]]], Callable[..., Awaitable[Any]]]:
+        """
+        코루틴 함수 호출을 하위 구간으로 기록하는 데코레이터. (이름을 주지 않으면 함수 이름 사용)
+        """
+        def decorator(fn: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+            span_name = name or fn.__name__
+
+            @functools.wraps(fn)
+            async def wrapper(*args: Any, **kwargs: Any) -> Any:
+                with self.span(span_name):
+                    return await fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def traced_root(self, name: Optional[str] = None) -> Callable[[Callable[..., Awaitable[Any]]], Callable[..., Awaitable[Any]]]:
+        """
+        코루틴 함수 호출을 루트 구간으로 기록하는 데코레이터. 함수 이름은 유지되므로 `@bot.event` 아래에 붙일 수 있습니다.
+        """
+        def decorator(fn: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+            span_name = name or fn.__name__
+
+            @functools.wraps(fn)
+            async def wrapper(*args: Any, **kwargs: Any) -> Any:
+                with self.trace(span_name):
+                    return await fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def _get_logger(self) -> logging.Logger:
+        if self._logger is None:
+            directory = os.path.dirname(self.log_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            handler = RotatingFileHandler(self.log_path, maxBytes=self.max_bytes,
+                                          backupCount=self.backup_count, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            logger = logging.getLogger(f"{__name__}.{id(self)}")
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+            logger.addHandler(handler)
+            self._logger = logger
+        return self._logger
+
+    def _close_logger(self) -> None:
+        if self._logger is not None:
+            for handler in list(self._logger.handlers):
+                self._logger.removeHandler(handler)
+                handler.close()
+            self._logger = None
+
+    def _write(self, span: Span) -> None:
+        try:
+            busy = span.duration - span.idle_time()
+            header = f"slow {span.name} {span.duration:.3f}s (대기 제외 {busy:.3f}s, 기준 {self.threshold:g}s)"
+            self._get_logger().info("\n".join([header] + span.format()) + "\n")
+        except Exception as e:
+            print(f"Error in Tracer._write: {str(e)}")
+
+
+# 모듈 전역 추적기
+tracer = Tracer()